@@ -3,9 +3,19 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import importlib.util
 import json
+import os
+import selectors
+import signal
+import socket
+import struct
+import subprocess
 import sys
+import time
 from collections import Counter
+from itertools import repeat
 from pathlib import Path
 from typing import Iterable
 
@@ -78,10 +88,10 @@ def _sorted_modules(counter: Counter[str], top: int) -> list[tuple[str, int]]:
     return sorted(counter.items(), key=lambda item: (-item[1], item[0]))[:top]
 
 
-def _format_route(route) -> str:
-    heads = sorted(route.heads)
-    tails = sorted(route.tails)
-    middle = list(route.middle)
+def _format_route(route: dict) -> str:
+    heads = sorted(route["heads"])
+    tails = sorted(route["tails"])
+    middle = list(route["middle"])
     head = heads[0] if heads else ""
     tail = tails[0] if tails else ""
     chain = [node for node in [head, *middle, tail] if node]
@@ -106,17 +116,13 @@ def _serialize_dependency(dep) -> dict:
     }
 
 
-def _load_baseline(path: str) -> set[tuple[str, str]]:
-    try:
-        with open(path, "r", encoding="utf-8") as handle:
-            data = json.load(handle)
-    except FileNotFoundError:
-        print(f"Baseline file not found: {path}", file=sys.stderr)
-        sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"Invalid JSON in baseline: {e}", file=sys.stderr)
-        sys.exit(1)
+def _read_baseline(path: str) -> set[tuple[str, str]]:
+    """(importer, imported) pairs of a 'layers --json' report (or a bare list of dependencies)."""
+    with open(path, "r", encoding="utf-8") as handle:
+        return _baseline_pairs(json.load(handle))
 
+
+def _baseline_pairs(data) -> set[tuple[str, str]]:
     if isinstance(data, dict):
         data = data.get("illegal_dependencies", [])
 
@@ -131,6 +137,701 @@ def _load_baseline(path: str) -> set[tuple[str, str]]:
     return pairs
 
 
+def _load_baseline(path: str) -> set[tuple[str, str]]:
+    try:
+        return _read_baseline(path)
+    except FileNotFoundError:
+        print(f"Baseline file not found: {path}", file=sys.stderr)
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Invalid JSON in baseline: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# -----------------------------------------------------------------------------
+# Graph cache
+# -----------------------------------------------------------------------------
+
+# Bumped whenever the cache file layout changes.
+GRAPH_CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = ".grimp_cache"
+
+
+def _cache_file(cache_dir: str, packages: list[str], include_external: bool, grimp_version: str) -> Path:
+    key = json.dumps([sorted(packages), include_external, grimp_version, GRAPH_CACHE_VERSION])
+    return Path(cache_dir) / f"cli-graph-{hashlib.sha1(key.encode()).hexdigest()[:16]}.json"
+
+
+def _read_graph_cache(path: Path) -> dict[str, list]:
+    """Cached modules as {module: [mtime, content hash, [directly imported module, ...]]}."""
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != GRAPH_CACHE_VERSION:
+        return {}
+    modules = data.get("modules")
+    return modules if isinstance(modules, dict) else {}
+
+
+def _make_cache_dir(cache_dir: Path) -> None:
+    """Create ``cache_dir`` with a ``.gitignore`` so it never shows up as untracked in the user's repo."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    gitignore = cache_dir / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text("# Automatically created by grimp_cli.py.\n*\n", encoding="utf-8")
+
+
+def _write_graph_cache(path: Path, modules: dict[str, list]) -> None:
+    """Write the cache atomically; an unwritable cache directory only costs the next run a rescan."""
+    try:
+        _make_cache_dir(path.parent)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump({"version": GRAPH_CACHE_VERSION, "modules": modules}, handle, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: could not write graph cache {path}: {e}", file=sys.stderr)
+
+
+def _module_paths(found_package, module: str) -> list[str]:
+    """Files that may hold ``module``, in the order Python prefers them."""
+    parts = module[len(found_package.name) :].split(".")[1:]
+    base = os.path.join(found_package.directory, *parts)
+    init = os.path.join(base, "__init__.py")
+    return [base + ".py", init] if parts else [init]
+
+
+def _module_path(found_package, module: str) -> str:
+    *candidates, last = _module_paths(found_package, module)
+    return next((path for path in candidates if os.path.isfile(path)), last)
+
+
+def _module_source(found_package, module: str) -> bytes:
+    with open(_module_path(found_package, module), "rb") as handle:
+        return handle.read()
+
+
+def _add_graph_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--cache-dir", default=DEFAULT_CACHE_DIR, help=f"Import graph cache directory (default: {DEFAULT_CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--no-cache", dest="cache_dir", action="store_const", const=None, help="Build the graph from scratch"
+    )
+    parser.add_argument("--no-daemon", action="store_true", help="Build the graph here even if 'serve' is running")
+
+
+def _stale_importers(cached: dict[str, list], added: set[str], removed: set[str]) -> set[str]:
+    """Modules whose cached imports may resolve differently now that modules were added or removed.
+
+    An import resolves to the nearest existing module (``import a.b.c`` is
+    ``a.b`` while ``a/b/c.py`` is missing), so adding or removing a module
+    affects importers of it or of any of its ancestors.
+    """
+    targets: set[str] = set()
+    for module in added | removed:
+        parts = module.split(".")
+        targets.update(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+    return {
+        module
+        for module, (_, _, imports) in cached.items()
+        if not targets.isdisjoint(imports)
+    }
+
+
+def _grimp_internals():
+    """grimp's package discovery and import scanner, or None if this grimp lays them out differently."""
+    try:
+        from grimp.application.config import settings
+        from grimp.application.scanning import scan_imports
+        from grimp.application.usecases import _find_packages
+    except ImportError:
+        return None
+    return settings, scan_imports, _find_packages
+
+
+def _find_module_files(found_packages) -> dict:
+    """{module: (found package, ModuleFile)} for every module in ``found_packages``."""
+    module_files = {}
+    for found_package in found_packages:
+        for module_file in found_package.module_files:
+            module_files[module_file.module.name] = (found_package, module_file)
+    return module_files
+
+
+def _update_modules(
+    found_packages, cached: dict[str, list], include_external: bool, scan_imports
+) -> tuple[dict[str, list], bool]:
+    """Bring ``cached`` up to date with ``found_packages``; returns the modules and whether anything changed."""
+    module_files = _find_module_files(found_packages)
+    added = module_files.keys() - cached.keys()
+    removed = cached.keys() - module_files.keys()
+    stale = _stale_importers(cached, added, removed) if added or removed else set()
+
+    modules: dict[str, list] = {}
+    to_scan = []
+    changed = bool(removed)
+    for name, (found_package, module_file) in module_files.items():
+        entry = cached.get(name)
+        if entry is not None and name not in stale:
+            if entry[0] == module_file.mtime:
+                modules[name] = entry
+                continue
+            digest = hashlib.sha1(_module_source(found_package, name)).hexdigest()
+            if entry[1] == digest:
+                modules[name] = [module_file.mtime, digest, entry[2]]
+                changed = True
+                continue
+        to_scan.append(module_file)
+    if to_scan:
+        modules.update(_scan_modules(to_scan, module_files, found_packages, include_external, scan_imports))
+        changed = True
+    return modules, changed
+
+
+def _scan_modules(to_scan, module_files: dict, found_packages, include_external: bool, scan_imports) -> dict[str, list]:
+    scanned = scan_imports(
+        to_scan,
+        found_packages=found_packages,
+        include_external_packages=include_external,
+        exclude_type_checking_imports=False,
+    )
+    modules = {}
+    for module_file, direct_imports in scanned.items():
+        name = module_file.module.name
+        modules[name] = [
+            module_file.mtime,
+            hashlib.sha1(_module_source(module_files[name][0], name)).hexdigest(),
+            sorted({direct_import.imported.name for direct_import in direct_imports}),
+        ]
+    return modules
+
+
+def _add_imports(graph, present: set[str], name: str, imports: Iterable[str], roots: list[str]) -> None:
+    """Add ``name``'s imports; ``present`` mirrors graph.modules, which is rebuilt on every access."""
+    for imported in imports:
+        if imported not in present:
+            # External imports are squashed to their top-level package, like grimp.build_graph does.
+            graph.add_module(imported, is_squashed=not _is_internal(imported, roots))
+            present.add(imported)
+        graph.add_import(importer=name, imported=imported)
+
+
+def _graph_from_modules(grimp, found_packages, modules: dict[str, list]):
+    graph = grimp.ImportGraph()
+    for found_package in found_packages:
+        for namespace_package in found_package.namespace_packages:
+            graph.add_module(namespace_package)
+    for name in modules:
+        graph.add_module(name)
+    present = set(modules)
+    roots = [found_package.name for found_package in found_packages]
+    for name, (_, _, imports) in modules.items():
+        _add_imports(graph, present, name, imports, roots)
+    return graph
+
+
+def build_graph(packages: list[str], include_external: bool = False, cache_dir: str | None = DEFAULT_CACHE_DIR):
+    """Build the import graph of ``packages``, reusing the imports of unchanged modules from ``cache_dir``.
+
+    The cache is an adjacency list of every module's direct imports with its
+    mtime and content hash (import line details are not kept; no command
+    uses them). A module is only re-parsed when its content changed (a new
+    mtime with the same content, e.g. after a fresh checkout, just re-hashes
+    it) or when an added or removed module may change how its imports
+    resolve. ``cache_dir=None`` builds the graph from scratch.
+    """
+    grimp = _require_grimp()
+    if cache_dir is None:
+        return grimp.build_graph(*packages, include_external_packages=include_external, cache_dir=None)
+    internals = _grimp_internals()
+    if internals is None:
+        # Fall back to grimp's own (mtime-keyed) cache.
+        return grimp.build_graph(*packages, include_external_packages=include_external, cache_dir=cache_dir)
+    settings, scan_imports, find_packages = internals
+
+    found_packages = find_packages(file_system=settings.FILE_SYSTEM, package_names=packages)
+    cache_path = _cache_file(cache_dir, packages, include_external, getattr(grimp, "__version__", ""))
+    modules, changed = _update_modules(found_packages, _read_graph_cache(cache_path), include_external, scan_imports)
+    if changed:
+        _write_graph_cache(cache_path, modules)
+    return _graph_from_modules(grimp, found_packages, modules)
+
+
+# -----------------------------------------------------------------------------
+# Metrics
+# -----------------------------------------------------------------------------
+
+# Memory for one slice of the reachability bitsets; bigger graphs take more slices.
+_CLOSURE_CHUNK_BYTES = 64 << 20
+_CYCLE_MODULES_SHOWN = 10
+
+
+def _require_numpy_scipy():
+    try:
+        import numpy as np
+        from scipy import sparse
+        from scipy.sparse import csgraph
+    except ImportError:
+        raise ImportError("--metrics needs numpy and scipy. Install with: pip install numpy scipy") from None
+    return np, sparse, csgraph
+
+
+def _adjacency(graph) -> tuple[list[str], list[int], list[int]]:
+    """The graph as CSR lists: sorted module names, row offsets, and the indices each module imports."""
+    names = sorted(graph.modules)
+    index = {name: i for i, name in enumerate(names)}
+    indptr = [0]
+    indices: list[int] = []
+    for name in names:
+        indices.extend(map(index.__getitem__, graph.find_modules_directly_imported_by(name)))
+        indptr.append(len(indices))
+    return names, indptr, indices
+
+
+def _ranges(np, starts, ends):
+    """Concatenation of ``range(start, end)`` for each pair."""
+    counts = ends - starts
+    offsets = np.cumsum(counts) - counts
+    return np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+
+
+def _popcount(np, words):
+    """Set bits in each row of a uint64 array."""
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    table = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+    return table[words.view(np.uint8)].sum(axis=1)
+
+
+def _levels(np, dag) -> list:
+    """DAG nodes grouped by height (sinks first); each group only points into earlier groups."""
+    remaining = np.diff(dag.indptr).astype(np.int64)
+    predecessors = dag.T.tocsr()
+    frontier = np.flatnonzero(remaining == 0)
+    levels = []
+    while frontier.size:
+        levels.append(frontier)
+        touched = predecessors.indices[_ranges(np, predecessors.indptr[frontier], predecessors.indptr[frontier + 1])]
+        np.subtract.at(remaining, touched, 1)
+        touched = np.unique(touched)
+        frontier = touched[remaining[touched] == 0]
+    return levels
+
+
+def _propagate(np, dag, full, level) -> None:
+    """OR the (finished) bitsets of each node's successors into its own, in batches of bounded size."""
+    budget = max(1, _CLOSURE_CHUNK_BYTES // 4 // (8 * full.shape[1]))
+    degrees = dag.indptr[level + 1] - dag.indptr[level]
+    ends = np.cumsum(degrees)
+    start = 0
+    while start < len(level):
+        stop = max(start + 1, int(np.searchsorted(ends, ends[start] - degrees[start] + budget, side="right")))
+        batch = level[start:stop]
+        edges = _ranges(np, dag.indptr[batch], dag.indptr[batch + 1])
+        segments = np.cumsum(degrees[start:stop]) - degrees[start:stop]
+        full[batch] |= np.bitwise_or.reduceat(full[dag.indices[edges]], segments, axis=0)
+        start = stop
+
+
+def _closure_sizes(np, sparse, matrix, labels, n_components: int):
+    """How many modules each module reaches (itself excluded).
+
+    Works on the DAG of strongly connected components: a component's bitset
+    of reachable modules is its own members OR'd with its successors'
+    bitsets, filled in sinks first. The bitsets are built a slice of module
+    columns at a time so memory stays bounded on large graphs; columns are
+    ordered by height, so a slice skips the levels below its lowest member.
+    """
+    n = matrix.shape[0]
+    coo = matrix.tocoo()
+    src, dst = labels[coo.row], labels[coo.col]
+    keep = src != dst
+    dag = sparse.csr_matrix(
+        (np.ones(int(keep.sum()), dtype=np.int32), (src[keep], dst[keep])), shape=(n_components, n_components)
+    )
+    dag.sum_duplicates()
+    levels = _levels(np, dag)
+    height = np.empty(n_components, dtype=np.int64)
+    for h, level in enumerate(levels):
+        height[level] = h
+    order = np.argsort(height[labels], kind="stable")
+
+    bits = 64 * max(1, _CLOSURE_CHUNK_BYTES // (8 * n_components))
+    counts = np.zeros(n_components, dtype=np.int64)
+    for first in range(0, n, bits):
+        members = labels[order[first : first + bits]]
+        columns = np.arange(len(members))
+        full = np.zeros((n_components, (len(columns) + 63) // 64), dtype=np.uint64)
+        np.bitwise_or.at(full, (members, columns >> 6), np.left_shift(np.uint64(1), (columns & 63).astype(np.uint64)))
+        # Only higher components can reach this slice's members.
+        for level in levels[max(1, int(height[members[0]]) + 1) :]:
+            _propagate(np, dag, full, level)
+        counts += _popcount(np, full)
+    return counts[labels] - 1
+
+
+def _pagerank(np, matrix, damping: float = 0.85, tol: float = 1e-10, max_iter: int = 100):
+    """PageRank over import edges: a module ranks high when highly ranked modules import it."""
+    n = matrix.shape[0]
+    out_degree = np.diff(matrix.indptr)
+    inverse = np.divide(1.0, out_degree, out=np.zeros(n), where=out_degree > 0)
+    dangling = out_degree == 0
+    transposed = matrix.T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        new = damping * (transposed @ (rank * inverse)) + (damping * rank[dangling].sum() + 1 - damping) / n
+        done = np.abs(new - rank).sum() < tol
+        rank = new
+        if done:
+            break
+    return rank
+
+
+def explore_metrics(graph, packages: list[str], top: int = 10, adjacency=None) -> dict:
+    """Import cycles, transitive dependents/dependencies and PageRank, computed on a CSR matrix of the graph."""
+    np, sparse, csgraph = _require_numpy_scipy()
+    names, indptr, indices = adjacency or _adjacency(graph)
+    n = len(names)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(n, n),
+    )
+    n_components, labels = csgraph.connected_components(matrix, directed=True, connection="strong")
+    sizes = np.bincount(labels, minlength=n_components)
+    dependents = _closure_sizes(np, sparse, matrix.T.tocsr(), labels, n_components)
+    dependencies = _closure_sizes(np, sparse, matrix, labels, n_components)
+    rank = _pagerank(np, matrix)
+
+    internal = np.flatnonzero([_is_internal(name, packages) for name in names])
+
+    def ranked(values) -> list[int]:
+        # Highest first; ties in name order, which is index order.
+        return internal[np.lexsort((internal, -values[internal]))][:top].tolist()
+
+    cyclic = np.flatnonzero(sizes > 1)
+    largest = cyclic[np.lexsort((cyclic, -sizes[cyclic]))][:top]
+    return {
+        "cycles": {
+            "count": len(cyclic),
+            "modules": int(sizes[cyclic].sum()),
+            "largest": [
+                {
+                    "size": int(sizes[component]),
+                    "modules": [names[i] for i in np.flatnonzero(labels == component)[:_CYCLE_MODULES_SHOWN]],
+                }
+                for component in largest
+            ],
+        },
+        "transitive_dependents": [{"module": names[i], "count": int(dependents[i])} for i in ranked(dependents)],
+        "transitive_dependencies": [{"module": names[i], "count": int(dependencies[i])} for i in ranked(dependencies)],
+        "pagerank": [{"module": names[i], "score": round(float(rank[i]), 6)} for i in ranked(rank)],
+    }
+
+
+# -----------------------------------------------------------------------------
+# Changed modules
+# -----------------------------------------------------------------------------
+
+
+def _git(*args: str, cwd: str | None = None) -> str:
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True)
+    except FileNotFoundError:
+        raise ValueError("git is not installed") from None
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"git {' '.join(args)} failed: {e.stderr.strip()}") from None
+    return result.stdout
+
+
+def _git_changed_files(ref: str) -> list[str]:
+    """Absolute paths of files changed since ``ref``: committed, staged, unstaged and untracked."""
+    top = _git("rev-parse", "--show-toplevel").strip()
+    changed = _git("diff", "--name-only", "--no-renames", "-z", ref, "--", cwd=top).split("\0")
+    untracked = _git("ls-files", "--others", "--exclude-standard", "-z", cwd=top).split("\0")
+    return sorted({os.path.join(top, path) for path in changed + untracked if path})
+
+
+def _clean_commit(packages: Iterable[str]) -> str | None:
+    """HEAD's commit if the packages' files have no uncommitted changes, else None."""
+    dirs = list(_package_dirs(packages))
+    try:
+        if not dirs or _git("status", "--porcelain", "--", *dirs).strip():
+            return None
+        return _git("rev-parse", "HEAD").strip()
+    except ValueError:
+        return None
+
+
+def _check_baseline_ref(path: str, ref: str, layers: list, containers: Iterable[str] | None) -> None:
+    """Raise ValueError unless ``path`` is a 'layers --json' report for these layers taken at git ``ref``.
+
+    --changed-since only re-checks chains through changed modules, so every
+    other violation must already be in the baseline.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"cannot read baseline {path}: {e}") from None
+    if not isinstance(data, dict):
+        data = {}
+    commit = _git("rev-parse", "--verify", f"{ref}^{{commit}}").strip()
+    taken = data.get("git_commit")
+    if taken != commit:
+        where = f"commit {taken[:12]}" if taken else "an unknown commit or with uncommitted changes"
+        raise ValueError(
+            f"--changed-since {ref} needs a baseline from 'layers --json' run at {ref} ({commit[:12]}) "
+            f"with no uncommitted changes, but {path} was taken at {where}. "
+            f"Regenerate the baseline at {ref}, or drop --changed-since."
+        )
+    same_layers = data.get("layers") == [_layer_to_list(layer) for layer in layers]
+    if not same_layers or sorted(data.get("containers") or []) != sorted(containers or []):
+        raise ValueError(f"{path} was taken for other layers or containers; --changed-since needs the same ones.")
+
+
+def _package_dirs(packages: Iterable[str]) -> dict[str, str]:
+    dirs = {}
+    for package in packages:
+        spec = importlib.util.find_spec(package)
+        for directory in (spec.submodule_search_locations or []) if spec else []:
+            dirs[os.path.realpath(directory)] = package
+    return dirs
+
+
+def _changed_modules(graph, packages: list[str], paths: Iterable[str]) -> set[str]:
+    """Modules in ``graph`` whose edges may differ because the files at ``paths`` changed.
+
+    That is every changed module that still exists and, for deleted modules,
+    the nearest existing ancestor, which imports of them now resolve to.
+    """
+    present = graph.modules
+    dirs = _package_dirs(packages)
+    changed = set()
+    for path in paths:
+        if not path.endswith(".py"):
+            continue
+        path = os.path.realpath(path)
+        for directory, package in dirs.items():
+            relative = os.path.relpath(path, directory)
+            if relative.startswith(os.pardir + os.sep):
+                continue
+            parts = [package, *relative[:-3].split(os.sep)]
+            if parts[-1] == "__init__":
+                parts.pop()
+            while parts and ".".join(parts) not in present:
+                parts.pop()
+            if parts:
+                changed.add(".".join(parts))
+    return changed
+
+
+def _layer_pairs(layers: list, containers: set[str] | None) -> tuple[list[list[str]], list[tuple[int, int]]]:
+    """Layer modules grouped by container, and the (higher, lower) pairs of them that grimp checks.
+
+    Siblings in one layer are checked against each other in both directions.
+    Pairs are indices into the flattened list of groups.
+    """
+    groups = []
+    pairs = []
+    for container in sorted(containers) if containers else [None]:
+        prefix = f"{container}." if container else ""
+        levels = [[prefix + name for name in _layer_to_list(layer)] for layer in layers]
+        first = sum(len(group) for group in groups)
+        offsets = []
+        for level in levels:
+            offsets.append(list(range(first, first + len(level))))
+            first += len(level)
+        groups.append([name for level in levels for name in level])
+        for i, higher in enumerate(offsets):
+            for lower in offsets[i + 1 :]:
+                pairs.extend((h, l) for h in higher for l in lower)
+            pairs.extend((a, b) for a in higher for b in higher if a != b)
+    return groups, pairs
+
+
+def _reach(starts: Iterable[int], neighbours: list[list[int]], allowed) -> set[int]:
+    seen = {i for i in starts if allowed(i)}
+    stack = list(seen)
+    while stack:
+        for j in neighbours[stack.pop()]:
+            if j not in seen and allowed(j):
+                seen.add(j)
+                stack.append(j)
+    return seen
+
+
+class _LayerChains:
+    """The graph as index lists, with the layer each module sits in, for tracing chains as grimp's layer check does.
+
+    grimp checks each pair of layers on the graph without the container's
+    other layers.
+    """
+
+    def __init__(self, graph, layers: list, containers: set[str] | None):
+        names, indptr, indices = _adjacency(graph)
+        self.graph = graph
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.imports = [indices[indptr[i] : indptr[i + 1]] for i in range(len(names))]
+        self.importers: list[list[int]] = [[] for _ in names]
+        for i, targets in enumerate(self.imports):
+            for j in targets:
+                self.importers[j].append(i)
+
+        groups, self.pairs = _layer_pairs(layers, containers)
+        self.roots = [root for group in groups for root in group]
+        self.root_ids = {root: t for t, root in enumerate(self.roots)}
+        self.group_of = [g for g, group in enumerate(groups) for _ in group]
+        self.containers = set(containers or ())
+        # The deepest layer module each module sits in, or -1.
+        self.tree = []
+        for name in names:
+            parts = name.split(".")
+            ancestors = (".".join(parts[:k]) for k in range(len(parts), 0, -1))
+            self.tree.append(next((self.root_ids[a] for a in ancestors if a in self.root_ids), -1))
+
+    def allowed(self, higher: int, lower: int):
+        """Whether chains between layers ``higher`` and ``lower`` may pass through a module."""
+        tree, group_of, group = self.tree, self.group_of, self.group_of[higher]
+        return lambda i: tree[i] < 0 or tree[i] in (higher, lower) or group_of[tree[i]] != group
+
+
+def _affected_subgraph(chains: _LayerChains, changed: set[str]):
+    """The part of the graph holding every layer-violating import chain through ``changed`` modules.
+
+    For each pair of layers this keeps the modules on chains lower ->
+    changed module -> higher: those the lower layer reaches that reach a
+    changed module, and those a changed module reaches that reach the higher
+    layer. Layer modules, containers and the ancestors of everything kept
+    stay too, so grimp sees the same package tree. Violations found in the
+    result are real, and any violation with a chain through a changed module
+    is found.
+    """
+    grimp = _require_grimp()
+    names, index, imports, importers, tree = chains.names, chains.index, chains.imports, chains.importers, chains.tree
+    start = {index[name] for name in changed}
+    keep: set[int] = set()
+    for higher, lower in chains.pairs:
+        allowed = chains.allowed(higher, lower)
+        upstream = _reach(start, importers, allowed)
+        if not any(tree[i] == lower for i in upstream):
+            continue
+        downstream = _reach(start, imports, allowed)
+        if not any(tree[i] == higher for i in downstream):
+            continue
+        keep |= _reach((i for i in upstream if tree[i] == lower), imports, upstream.__contains__)
+        keep |= _reach((i for i in downstream if tree[i] == higher), importers, downstream.__contains__)
+
+    kept = {names[i] for i in keep} | ((set(chains.roots) | chains.containers) & index.keys())
+    for name in list(kept):
+        parts = name.split(".")
+        kept.update(ancestor for ancestor in (".".join(parts[:k]) for k in range(1, len(parts))) if ancestor in index)
+
+    subgraph = grimp.ImportGraph()
+    for name in kept:
+        subgraph.add_module(name, is_squashed=chains.graph.is_module_squashed(name))
+    for name in kept:
+        for j in imports[index[name]]:
+            if names[j] in kept:
+                subgraph.add_import(importer=name, imported=names[j])
+    return subgraph
+
+
+def _violations_around(
+    chains: _LayerChains, changed: set[str], violations: Iterable[tuple[str, str]]
+) -> set[tuple[str, str]]:
+    """The (importer, imported) layer violations that still have a chain through no ``changed`` module."""
+    avoided = {chains.index[name] for name in changed}
+    pairs = set(chains.pairs)
+    members: dict[int, list[int]] = {}
+    for i, t in enumerate(chains.tree):
+        members.setdefault(t, []).append(i)
+
+    found = set()
+    for importer, imported in violations:
+        lower, higher = chains.root_ids.get(importer), chains.root_ids.get(imported)
+        if (higher, lower) not in pairs:
+            continue
+        allowed = chains.allowed(higher, lower)
+        seen = {i for i in members.get(lower, []) if i not in avoided}
+        stack = list(seen)
+        while stack:
+            i = stack.pop()
+            if chains.tree[i] == higher:
+                found.add((importer, imported))
+                break
+            for j in chains.imports[i]:
+                if j not in seen and j not in avoided and allowed(j):
+                    seen.add(j)
+                    stack.append(j)
+    return found
+
+
+# -----------------------------------------------------------------------------
+# Queries
+# -----------------------------------------------------------------------------
+
+
+def explore_report(
+    graph,
+    packages: list[str],
+    top: int = 10,
+    min_in: int = 2,
+    min_out: int = 4,
+    max_children: int = 40,
+    metrics: bool = False,
+) -> dict:
+    """Module and import counts, children per package, and the top fan-out/fan-in modules over threshold.
+
+    ``metrics`` adds explore_metrics() (needs numpy and scipy).
+    """
+    adjacency = _adjacency(graph)
+    names, indptr, indices = adjacency
+
+    children = {}
+    for pkg in packages:
+        child_names = sorted(graph.find_children(pkg))
+        children[pkg] = {
+            "count": len(child_names),
+            "shown": [
+                {"module": child, "descendants": len(graph.find_descendants(child))} for child in child_names[:max_children]
+            ],
+        }
+
+    importers = Counter(indices)
+    fan_out = Counter()
+    fan_in = Counter()
+    for i, module in enumerate(names):
+        if _is_internal(module, packages):
+            fan_out[module] = indptr[i + 1] - indptr[i]
+            fan_in[module] = importers[i]
+
+    report = {
+        "packages": packages,
+        "modules": len(fan_out),
+        "imports": graph.count_imports(),
+        "children": children,
+        "fan_out": [
+            {"module": module, "count": count} for module, count in _sorted_modules(fan_out, top) if count >= min_out
+        ],
+        "fan_in": [
+            {"module": module, "count": count} for module, count in _sorted_modules(fan_in, top) if count >= min_in
+        ],
+    }
+    if metrics:
+        report["metrics"] = explore_metrics(graph, packages, top, adjacency)
+    return report
+
+
+def find_illegal(graph, layers: list, containers: set[str] | None = None) -> list:
+    """Illegal dependencies for ``layers`` (high -> low), sorted by (importer, imported)."""
+    illegal = graph.find_illegal_dependencies_for_layers(layers, containers=containers)
+    return sorted(illegal, key=lambda dep: (dep.importer, dep.imported))
+
+
 # -----------------------------------------------------------------------------
 # Commands
 # -----------------------------------------------------------------------------
@@ -141,84 +842,84 @@ def cmd_explore(args: argparse.Namespace) -> int:
     for pkg in args.package:
         _setup_pythonpath(pkg)
 
-    grimp = _require_grimp()
+    query = {
+        "type": "explore",
+        "packages": args.package,
+        "top": args.top,
+        "min_in": args.min_in,
+        "min_out": args.min_out,
+        "max_children": args.max_children,
+        "metrics": args.metrics,
+    }
     try:
-        graph = grimp.build_graph(
-            *args.package,
-            include_external_packages=args.include_external,
-        )
+        report = _answer(args, args.package, query)
     except (ValueError, ImportError, ModuleNotFoundError, SyntaxError) as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
-    packages = args.package
-    internal_modules = [m for m in graph.modules if _is_internal(m, packages)]
-
     print("Grimp import graph summary")
-    print(f"Packages: {', '.join(packages)}")
-    print(f"Modules: {len(internal_modules)}")
-    print(f"Total imports: {graph.count_imports()}")
+    print(f"Packages: {', '.join(report['packages'])}")
+    print(f"Modules: {report['modules']}")
+    print(f"Total imports: {report['imports']}")
 
-    for pkg in packages:
-        children = sorted(graph.find_children(pkg))
-        print(f"\nChildren of {pkg} ({len(children)}):")
-        for child in children[: args.max_children]:
-            descendant_count = len(graph.find_descendants(child))
-            print(f"  - {child} ({descendant_count} descendants)")
-        if len(children) > args.max_children:
-            print(f"  ... {len(children) - args.max_children} more")
-
-    fan_out = Counter()
-    fan_in = Counter()
-    for module in internal_modules:
-        fan_out[module] = len(graph.find_modules_directly_imported_by(module))
-        fan_in[module] = len(graph.find_modules_that_directly_import(module))
+    for pkg, children in report["children"].items():
+        print(f"\nChildren of {pkg} ({children['count']}):")
+        for child in children["shown"]:
+            print(f"  - {child['module']} ({child['descendants']} descendants)")
+        if children["count"] > len(children["shown"]):
+            print(f"  ... {children['count'] - len(children['shown'])} more")
 
     print("\nTop fan-out (imports many modules):")
-    shown_out = False
-    for module, count in _sorted_modules(fan_out, args.top):
-        if count < args.min_out:
-            continue
-        print(f"  - {module}: {count}")
-        shown_out = True
-    if not shown_out:
+    for item in report["fan_out"]:
+        print(f"  - {item['module']}: {item['count']}")
+    if not report["fan_out"]:
         print("  (none over threshold)")
 
     print("\nTop fan-in (imported by many modules):")
-    shown_in = False
-    for module, count in _sorted_modules(fan_in, args.top):
-        if count < args.min_in:
-            continue
-        print(f"  - {module}: {count}")
-        shown_in = True
-    if not shown_in:
+    for item in report["fan_in"]:
+        print(f"  - {item['module']}: {item['count']}")
+    if not report["fan_in"]:
         print("  (none over threshold)")
 
+    if "metrics" in report:
+        _print_metrics(report["metrics"])
+
     return 0
 
 
+def _print_metrics(metrics: dict) -> None:
+    cycles = metrics["cycles"]
+    print(f"\nImport cycles: {cycles['count']} (modules involved: {cycles['modules']})")
+    for cycle in cycles["largest"]:
+        more = cycle["size"] - len(cycle["modules"])
+        print(f"  - {cycle['size']} modules: {', '.join(cycle['modules'])}" + (f", ... {more} more" if more else ""))
+
+    print("\nMost depended on (transitive dependents):")
+    for item in metrics["transitive_dependents"]:
+        print(f"  - {item['module']}: {item['count']}")
+
+    print("\nMost dependencies (transitive imports):")
+    for item in metrics["transitive_dependencies"]:
+        print(f"  - {item['module']}: {item['count']}")
+
+    print("\nPageRank centrality:")
+    for item in metrics["pagerank"]:
+        print(f"  - {item['module']}: {item['score']:.6f}")
+
+
 def cmd_path(args: argparse.Namespace) -> int:
     """Find shortest import chain between modules/packages."""
     packages = _infer_packages_from_modules(args.importer, args.imported, args.package)
     for pkg in packages:
         _setup_pythonpath(pkg)
 
-    grimp = _require_grimp()
+    query = {"type": "path", "importer": args.importer, "imported": args.imported, "as_packages": args.as_packages}
     try:
-        graph = grimp.build_graph(
-            *packages,
-            include_external_packages=args.include_external,
-        )
+        chain = _answer(args, packages, query)["chain"]
     except (ValueError, ImportError, ModuleNotFoundError, SyntaxError) as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
-    chain = graph.find_shortest_chain(
-        importer=args.importer,
-        imported=args.imported,
-        as_packages=args.as_packages,
-    )
-
     if chain is None:
         print("No import chain found.")
         return 1
@@ -227,6 +928,14 @@ def cmd_path(args: argparse.Namespace) -> int:
     return 0
 
 
+def _layers_query(args: argparse.Namespace) -> dict:
+    return {
+        "type": "layers",
+        "layers": [_layer_to_list(layer) for layer in args.layer],
+        "containers": args.container or [],
+    }
+
+
 def cmd_layers(args: argparse.Namespace) -> int:
     """Find illegal dependencies for an ordered layer list."""
     layers = args.layer
@@ -234,49 +943,38 @@ def cmd_layers(args: argparse.Namespace) -> int:
     for pkg in packages:
         _setup_pythonpath(pkg)
 
-    grimp = _require_grimp()
-
     if len(layers) < 2:
         print("At least two layers are required.", file=sys.stderr)
         return 2
 
     try:
-        graph = grimp.build_graph(
-            *packages,
-            include_external_packages=args.include_external,
-        )
+        result = _answer(args, packages, _layers_query(args))
     except (ValueError, ImportError, ModuleNotFoundError, SyntaxError) as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
-    containers = set(args.container) if args.container else None
-    illegal = graph.find_illegal_dependencies_for_layers(
-        layers,
-        containers=containers,
-    )
-
-    illegal_sorted = sorted(illegal, key=lambda dep: (dep.importer, dep.imported))
-
+    illegal = result["illegal_dependencies"]
     if args.json:
         payload = {
             "packages": packages,
-            "layers": [_layer_to_list(layer) for layer in layers],
-            "containers": sorted(containers) if containers else [],
-            "illegal_dependencies": [_serialize_dependency(dep) for dep in illegal_sorted],
+            "layers": result["layers"],
+            "containers": result["containers"],
+            "illegal_dependencies": illegal,
+            "git_commit": _clean_commit(packages),
         }
         print(json.dumps(payload, indent=2))
     else:
-        if not illegal_sorted:
+        if not illegal:
             print("No illegal dependencies found.")
             return 0
 
         print("Illegal dependencies:")
-        for dep in illegal_sorted:
-            print(f"- {dep.importer} -> {dep.imported}")
-            for route in list(dep.routes)[: args.max_routes]:
+        for dep in illegal:
+            print(f"- {dep['importer']} -> {dep['imported']}")
+            for route in dep["routes"][: args.max_routes]:
                 print(f"    {_format_route(route)}")
 
-    return 2 if illegal_sorted else 0
+    return 2 if illegal else 0
 
 
 def cmd_diff(args: argparse.Namespace) -> int:
@@ -286,31 +984,30 @@ def cmd_diff(args: argparse.Namespace) -> int:
     for pkg in packages:
         _setup_pythonpath(pkg)
 
-    grimp = _require_grimp()
-
     if len(layers) < 2:
         print("At least two layers are required.", file=sys.stderr)
         return 2
 
+    # Sent inline: the daemon caches results by query, and the file may change.
+    baseline = [{"importer": importer, "imported": imported} for importer, imported in sorted(_load_baseline(args.baseline))]
+    query = {**_layers_query(args), "type": "diff", "baseline": baseline}
     try:
-        graph = grimp.build_graph(
-            *packages,
-            include_external_packages=args.include_external,
-        )
+        if args.changed_since:
+            _check_baseline_ref(args.baseline, args.changed_since, layers, args.container)
+            query["changed_files"] = _git_changed_files(args.changed_since)
+        result = _answer(args, packages, query)
     except (ValueError, ImportError, ModuleNotFoundError, SyntaxError) as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
-    containers = set(args.container) if args.container else None
-    illegal = graph.find_illegal_dependencies_for_layers(
-        layers,
-        containers=containers,
-    )
-
-    current = {(dep.importer, dep.imported) for dep in illegal}
-    baseline = _load_baseline(args.baseline)
-    new = sorted(current - baseline)
-    resolved = sorted(baseline - current)
+    new = [(dep["importer"], dep["imported"]) for dep in result["new_violations"]]
+    resolved = result["resolved_violations"]
+    if args.changed_since:
+        print(
+            f"Changed since {args.changed_since}: {len(result['changed_modules'])} module(s); "
+            f"checked {result['checked_modules']} module(s) on layer-crossing chains through them.",
+            file=sys.stderr,
+        )
 
     if not new:
         print("No new layer violations.")
@@ -327,6 +1024,585 @@ def cmd_diff(args: argparse.Namespace) -> int:
     return 2
 
 
+# -----------------------------------------------------------------------------
+# Batch
+# -----------------------------------------------------------------------------
+
+QUERY_TYPES = ("explore", "path", "layers", "diff")
+
+
+def _load_batch(path: str) -> dict:
+    """A batch file: JSON, or TOML for ``.toml`` files (Python 3.11+)."""
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("TOML batch files need Python 3.11+; use JSON instead") from None
+        with open(path, "rb") as handle:
+            data = tomllib.load(handle)
+    else:
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    if not isinstance(data, dict) or not isinstance(data.get("queries"), list):
+        raise ValueError("batch file needs a 'queries' list")
+    for i, query in enumerate(data["queries"]):
+        if not isinstance(query, dict) or query.get("type") not in QUERY_TYPES:
+            raise ValueError(f"query {i}: 'type' must be one of {', '.join(QUERY_TYPES)}")
+    return data
+
+
+def _batch_layers(query: dict) -> list:
+    """Layers as --layer takes them: a list per layer of siblings, or a comma-separated string."""
+    layers = []
+    for layer in query.get("layers", []):
+        if isinstance(layer, list):
+            layer = ",".join(layer)
+        layers.append(_parse_layer(str(layer)))
+    return layers
+
+
+def _batch_packages(data: dict) -> list[str]:
+    if data.get("packages"):
+        return sorted(set(data["packages"]))
+    packages: set[str] = set()
+    for query in data["queries"]:
+        if query["type"] == "explore":
+            packages.update(query.get("packages", []))
+        elif query["type"] == "path":
+            packages.update(_infer_packages_from_modules(query.get("importer", ""), query.get("imported", ""), None))
+        else:
+            packages.update(_infer_packages_from_layers(_batch_layers(query)))
+    return sorted(p for p in packages if p)
+
+
+def run_query(graph, query: dict, packages: list[str]) -> dict:
+    """Run one batch query; ``exit_code`` is what the matching subcommand would have returned."""
+    kind = query["type"]
+    if kind == "explore":
+        report = explore_report(
+            graph,
+            query.get("packages") or packages,
+            query.get("top", 10),
+            query.get("min_in", 2),
+            query.get("min_out", 4),
+            query.get("max_children", 40),
+            query.get("metrics", False),
+        )
+        return {**report, "exit_code": 0}
+
+    if kind == "path":
+        chain = graph.find_shortest_chain(
+            importer=query["importer"], imported=query["imported"], as_packages=query.get("as_packages", False)
+        )
+        return {"chain": list(chain) if chain else None, "exit_code": 0 if chain else 1}
+
+    layers = _batch_layers(query)
+    if len(layers) < 2:
+        return {"error": "At least two layers are required.", "exit_code": 2}
+    containers = set(query["containers"]) if query.get("containers") else None
+    checked = {}
+    if query.get("changed_files") is not None:
+        # Only chains through changed modules: all other violations already existed before the change.
+        changed = _changed_modules(graph, packages, query["changed_files"])
+        chains = _LayerChains(graph, layers, containers)
+        subgraph = _affected_subgraph(chains, changed)
+        checked = {"changed_modules": sorted(changed), "checked_modules": len(subgraph.modules)}
+        illegal = find_illegal(subgraph, layers, containers)
+    else:
+        illegal = find_illegal(graph, layers, containers)
+    if kind == "layers":
+        return {
+            "layers": [_layer_to_list(layer) for layer in layers],
+            "containers": sorted(containers) if containers else [],
+            "illegal_dependencies": [_serialize_dependency(dep) for dep in illegal],
+            **checked,
+            "exit_code": 2 if illegal else 0,
+        }
+
+    current = {(dep.importer, dep.imported) for dep in illegal}
+    baseline = _read_baseline(query["baseline"]) if isinstance(query["baseline"], str) else _baseline_pairs(query["baseline"])
+    new = sorted(current - baseline)
+    if checked:
+        # The rest of the baseline still holds where a chain avoids the changed modules.
+        current |= _violations_around(chains, changed, baseline - current)
+    resolved = sorted(baseline - current)
+    return {
+        "new_violations": [{"importer": importer, "imported": imported} for importer, imported in new],
+        "resolved_violations": [{"importer": importer, "imported": imported} for importer, imported in resolved],
+        **checked,
+        "exit_code": 2 if new else 0,
+    }
+
+
+def _run_query_safely(graph, index: int, query: dict, packages: list[str]) -> dict:
+    name = query.get("name", f"{query['type']}-{index}")
+    start = time.perf_counter()
+    try:
+        result = run_query(graph, query, packages)
+    except KeyError as e:
+        result = {"error": f"missing field {e}", "exit_code": 1}
+    except Exception as e:  # One bad query (unknown module, unreadable baseline, ...) must not sink the batch.
+        result = {"error": f"{type(e).__name__}: {e}", "exit_code": 1}
+    return {"name": name, "type": query["type"], **result, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    """Build the graph once and run every query in a batch file, printing one JSON report."""
+    try:
+        data = _load_batch(args.file)
+    except (OSError, ValueError) as e:
+        print(f"Invalid batch file {args.file}: {e}", file=sys.stderr)
+        return 1
+
+    packages = _batch_packages(data)
+    if not packages:
+        print("No packages given or inferable from the queries.", file=sys.stderr)
+        return 1
+    for pkg in packages:
+        _setup_pythonpath(pkg)
+
+    include_external = args.include_external or bool(data.get("include_external", False))
+    queries = data["queries"]
+    try:
+        for query in queries:
+            if isinstance(query.get("baseline"), str):
+                # The daemon may run from another directory.
+                query["baseline"] = os.path.abspath(query["baseline"])
+            if query.get("changed_since"):
+                if query["type"] == "diff":
+                    _check_baseline_ref(query["baseline"], query["changed_since"], _batch_layers(query), query.get("containers"))
+                query["changed_files"] = _git_changed_files(query["changed_since"])
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    try:
+        served = _ask_daemon(args, packages, include_external, {"op": "batch", "queries": queries})
+        if served is None:
+            _require_grimp()
+            graph = build_graph(packages, include_external, args.cache_dir)
+    except (ValueError, ImportError, ModuleNotFoundError, SyntaxError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    graph_seconds = time.perf_counter() - start
+
+    if served is not None:
+        modules, imports, results = served["modules"], served["imports"], served["results"]
+    else:
+        modules, imports = len(graph.modules), graph.count_imports()
+        if args.jobs > 1 and len(queries) > 1:
+            # Imported here: it is slow to import, and daemon clients should start fast.
+            from concurrent.futures import ThreadPoolExecutor
+
+            # Queries only read the graph, and grimp answers them in Rust.
+            with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+                results = list(pool.map(_run_query_safely, repeat(graph), range(len(queries)), queries, repeat(packages)))
+        else:
+            results = [_run_query_safely(graph, i, query, packages) for i, query in enumerate(queries)]
+
+    exit_code = max((result["exit_code"] for result in results), default=0)
+    print(
+        json.dumps(
+            {
+                "packages": packages,
+                "include_external": include_external,
+                "modules": modules,
+                "imports": imports,
+                "daemon": served is not None,
+                "graph_seconds": round(graph_seconds, 3) if served is None else 0.0,
+                "results": results,
+                "exit_code": exit_code,
+            },
+            indent=2,
+        )
+    )
+    return exit_code
+
+
+# -----------------------------------------------------------------------------
+# Daemon
+# -----------------------------------------------------------------------------
+
+DAEMON_SOCKET = "serve.sock"
+# Changes are applied once the tree has been quiet this long, or right away when a query arrives.
+DAEMON_DEBOUNCE = 0.05
+# Idle seconds before an updated graph is written back to the cache.
+DAEMON_SAVE_DELAY = 2.0
+
+
+def _daemon_socket(cache_dir: str) -> str:
+    return os.path.join(cache_dir, DAEMON_SOCKET)
+
+
+def _daemon_request(path: str, request: dict) -> dict | None:
+    """Send one request to the daemon listening on ``path``; None if nothing is listening."""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    chunks = []
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            while chunk := sock.recv(1 << 16):
+                chunks.append(chunk)
+        reply = json.loads(b"".join(chunks))
+    except (OSError, ValueError):
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+def _ask_daemon(args: argparse.Namespace, packages: list[str], include_external: bool, request: dict):
+    """The daemon's result for ``request``, or None unless a daemon serves exactly this graph.
+
+    Errors the daemon hit answering it are raised as ValueError.
+    """
+    if args.cache_dir is None or args.no_daemon:
+        return None
+    reply = _daemon_request(
+        _daemon_socket(args.cache_dir), {**request, "packages": packages, "include_external": include_external}
+    )
+    if reply is None or "unsupported" in reply:
+        return None
+    if "error" in reply:
+        raise ValueError(reply["error"])
+    return reply.get("result")
+
+
+def _answer(args: argparse.Namespace, packages: list[str], query: dict) -> dict:
+    """Answer ``query`` from a running ``serve`` daemon if there is one for this graph, else build the graph here."""
+    result = _ask_daemon(args, packages, args.include_external, {"op": "query", "query": query})
+    if result is not None:
+        return result
+    _require_grimp()
+    graph = build_graph(packages, args.include_external, args.cache_dir)
+    return run_query(graph, query, packages)
+
+
+def _watched_dir(name: str) -> bool:
+    # grimp skips directories that are not identifiers; __pycache__ never holds source.
+    return name.isidentifier() and name != "__pycache__"
+
+
+class _Inotify:
+    """Recursive inotify watches over package directories, through libc (Linux only)."""
+
+    IN_MODIFY = 0x2
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ISDIR = 0x40000000
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        self._ctypes = ctypes
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, str] = {}
+
+    def watch_tree(self, root: str) -> None:
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [name for name in dirnames if _watched_dir(name)]
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), self.MASK)
+            if wd >= 0:
+                self._dirs[wd] = dirpath
+                continue
+            errno = self._ctypes.get_errno()
+            if errno == 28:  # ENOSPC
+                raise OSError(errno, "out of inotify watches; raise fs.inotify.max_user_watches")
+            if errno != 2:  # ENOENT: removed while walking
+                raise OSError(errno, f"cannot watch {dirpath}")
+
+    def read(self) -> tuple[set[str], bool]:
+        """Drain queued events: (touched .py files, whether directories were added or removed)."""
+        touched: set[str] = set()
+        structural = False
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return touched, structural
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + self._EVENT.size : offset + self._EVENT.size + length].rstrip(b"\0"))
+                offset += self._EVENT.size + length
+                if mask & self.IN_Q_OVERFLOW:
+                    structural = True
+                elif mask & self.IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                elif wd in self._dirs:
+                    path = os.path.join(self._dirs[wd], name)
+                    if mask & self.IN_ISDIR:
+                        if _watched_dir(name):
+                            structural = True
+                            if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                                self.watch_tree(path)
+                    elif name.endswith(".py"):
+                        touched.add(path)
+
+
+class GraphServer:
+    """One import graph kept in memory and patched as its source files change."""
+
+    def __init__(self, packages: list[str], include_external: bool, cache_dir: str, watcher: _Inotify):
+        self.grimp = _require_grimp()
+        internals = _grimp_internals()
+        if internals is None:
+            raise ImportError("this grimp version does not expose the import scanner 'serve' needs")
+        self.settings, self.scan_imports, self.find_packages = internals
+        self.packages = packages
+        self.include_external = include_external
+        self.cache_path = _cache_file(cache_dir, packages, include_external, getattr(self.grimp, "__version__", ""))
+        self.watcher = watcher
+        self.watched: set[str] = set()
+        self.results: dict[str, dict] = {}
+        self.touched: set[str] = set()
+        self.structural = False
+        self.dirty = False
+        self.updates = 0
+        self.started = time.time()
+        self._load(_read_graph_cache(self.cache_path))
+
+    def _load(self, cached: dict[str, list]) -> None:
+        """Rediscover the packages and rebuild the graph, re-parsing only modules that changed."""
+        self.found_packages = self.find_packages(file_system=self.settings.FILE_SYSTEM, package_names=self.packages)
+        for found_package in self.found_packages:
+            if found_package.directory not in self.watched:
+                # Watch before reading any file so that no change slips in between.
+                self.watcher.watch_tree(found_package.directory)
+                self.watched.add(found_package.directory)
+        self.modules, changed = _update_modules(self.found_packages, cached, self.include_external, self.scan_imports)
+        self.dirty = self.dirty or changed
+        self.module_files = _find_module_files(self.found_packages)
+        self.paths = {
+            path: name
+            for name, (found_package, _) in self.module_files.items()
+            for path in _module_paths(found_package, name)
+        }
+        self.roots = [found_package.name for found_package in self.found_packages]
+        self.graph = _graph_from_modules(self.grimp, self.found_packages, self.modules)
+        self.present = set(self.graph.modules)
+
+    def _refresh(self, names: set[str]) -> bool:
+        """Re-parse edited modules and patch their imports in place; True if any import changed."""
+        to_scan = []
+        for name in names:
+            found_package, module_file = self.module_files[name]
+            mtime = self.settings.FILE_SYSTEM.get_mtime(_module_path(found_package, name))
+            entry = self.modules[name]
+            if entry[0] == mtime:
+                continue
+            self.dirty = True
+            digest = hashlib.sha1(_module_source(found_package, name)).hexdigest()
+            if entry[1] == digest:
+                self.modules[name] = [mtime, digest, entry[2]]
+                continue
+            module_file = type(module_file)(module=module_file.module, mtime=mtime)
+            self.module_files[name] = (found_package, module_file)
+            to_scan.append(module_file)
+        if not to_scan:
+            return False
+
+        changed = False
+        scanned = _scan_modules(to_scan, self.module_files, self.found_packages, self.include_external, self.scan_imports)
+        for name, entry in scanned.items():
+            old, new = set(self.modules[name][2]), set(entry[2])
+            self.modules[name] = entry
+            for imported in sorted(old - new):
+                self.graph.remove_import(importer=name, imported=imported)
+                if not _is_internal(imported, self.roots) and not self.graph.find_modules_that_directly_import(imported):
+                    # Nothing imports this external package any more; a fresh build would not have it.
+                    self.graph.remove_module(imported)
+                    self.present.discard(imported)
+            _add_imports(self.graph, self.present, name, sorted(new - old), self.roots)
+            changed = changed or old != new
+        return changed
+
+    def sync(self) -> None:
+        """Apply the file changes seen so far."""
+        touched, structural = self.watcher.read()
+        self.touched |= touched
+        self.structural = self.structural or structural
+        if not self.touched and not self.structural:
+            return
+        start = time.perf_counter()
+        names = {self.paths.get(path) for path in self.touched}
+        structural = self.structural or None in names or not all(map(os.path.isfile, self.touched))
+        self.touched, self.structural = set(), False
+        if structural:
+            self._load(self.modules)
+            changed, what = True, "reloaded packages"
+        else:
+            changed, what = self._refresh(names), f"re-read {len(names)} module(s)"
+        if changed:
+            self.results.clear()
+            self.updates += 1
+        print(f"grimp serve: {what} in {(time.perf_counter() - start) * 1000:.0f}ms", file=sys.stderr)
+
+    def save(self) -> None:
+        _write_graph_cache(self.cache_path, self.modules)
+        self.dirty = False
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "packages": self.packages,
+            "include_external": self.include_external,
+            "modules": len(self.present),
+            "imports": self.graph.count_imports(),
+            "updates": self.updates,
+            "cached_results": len(self.results),
+            "uptime_seconds": round(time.time() - self.started, 1),
+        }
+
+    def handle(self, request: dict) -> dict:
+        op = request.get("op")
+        if op in ("status", "stop"):
+            return {"result": self.status()}
+        if op not in ("query", "batch"):
+            return {"error": f"unknown op {op!r}"}
+        packages = sorted(set(request.get("packages") or []))
+        if packages != self.packages or bool(request.get("include_external")) != self.include_external:
+            return {"unsupported": f"serving {', '.join(self.packages)} (include_external={self.include_external})"}
+
+        self.sync()
+        if op == "batch":
+            queries = request.get("queries") or []
+            results = [_run_query_safely(self.graph, i, query, self.packages) for i, query in enumerate(queries)]
+            return {"result": {"modules": len(self.present), "imports": self.graph.count_imports(), "results": results}}
+
+        # Repeated queries on an unchanged graph are answered from memory.
+        key = json.dumps(request.get("query"), sort_keys=True)
+        if key not in self.results:
+            try:
+                self.results[key] = run_query(self.graph, request["query"], self.packages)
+            except Exception as e:
+                return {"error": str(e)}
+        return {"result": self.results[key]}
+
+    def _serve_client(self, conn: socket.socket) -> bool:
+        """Answer one connection; False once asked to stop."""
+        with conn:
+            conn.settimeout(10)
+            try:
+                with conn.makefile("rb") as reader:
+                    request = json.loads(reader.readline())
+                reply = self.handle(request) if isinstance(request, dict) else {"error": "request must be an object"}
+            except (OSError, ValueError) as e:
+                request, reply = {}, {"error": f"bad request: {e}"}
+            try:
+                conn.sendall(json.dumps(reply).encode())
+            except OSError:
+                pass
+        return request.get("op") != "stop"
+
+    def serve_forever(self, path: str) -> None:
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        os.chmod(path, 0o600)
+        listener.listen(16)
+        selector = selectors.DefaultSelector()
+        selector.register(listener, selectors.EVENT_READ)
+        selector.register(self.watcher.fd, selectors.EVENT_READ)
+        try:
+            running = True
+            while running:
+                pending = None
+                if self.touched or self.structural:
+                    pending = DAEMON_DEBOUNCE
+                elif self.dirty:
+                    pending = DAEMON_SAVE_DELAY
+                ready = selector.select(pending)
+                if not ready:
+                    if self.touched or self.structural:
+                        self.sync()
+                    elif self.dirty:
+                        self.save()
+                for key, _ in ready:
+                    if key.fileobj is listener:
+                        conn, _ = listener.accept()
+                        running = self._serve_client(conn) and running
+                    else:
+                        touched, structural = self.watcher.read()
+                        self.touched |= touched
+                        self.structural = self.structural or structural
+        finally:
+            selector.close()
+            listener.close()
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            if self.dirty:
+                self.save()
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    """Keep the import graph in memory and answer the other commands over a Unix socket."""
+    path = _daemon_socket(args.cache_dir)
+    running = _daemon_request(path, {"op": "stop" if args.stop else "status"})
+    if args.stop or args.status:
+        if running is None:
+            print("No grimp daemon is running.", file=sys.stderr)
+            return 1
+        print(json.dumps(running.get("result"), indent=2))
+        return 0
+    if running is not None:
+        print(f"A grimp daemon is already serving {path} (pid {running['result']['pid']}).", file=sys.stderr)
+        return 1
+    if not args.package:
+        print("Give the package(s) to serve.", file=sys.stderr)
+        return 2
+
+    packages = sorted(set(args.package))
+    for pkg in packages:
+        _setup_pythonpath(pkg)
+    _require_grimp()
+    try:
+        watcher = _Inotify()
+    except OSError as e:
+        print(f"serve needs Linux inotify: {e}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    try:
+        server = GraphServer(packages, args.include_external, args.cache_dir, watcher)
+    except (OSError, ValueError, ImportError, ModuleNotFoundError, SyntaxError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    _make_cache_dir(Path(args.cache_dir))
+    if os.path.exists(path):
+        os.unlink(path)  # Left behind by a daemon that did not shut down cleanly.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    status = server.status()
+    print(
+        f"grimp serve: {status['modules']} modules, {status['imports']} imports of {', '.join(packages)} "
+        f"ready in {time.perf_counter() - start:.2f}s on {path}",
+        file=sys.stderr,
+    )
+    try:
+        server.serve_forever(path)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: cannot serve on {path}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
 # -----------------------------------------------------------------------------
 # CLI
 # -----------------------------------------------------------------------------
@@ -347,6 +1623,10 @@ def main() -> int:
     p_explore.add_argument("--min-in", type=_positive_int, default=2, help="Minimum fan-in to display (default: 2)")
     p_explore.add_argument("--min-out", type=_positive_int, default=4, help="Minimum fan-out to display (default: 4)")
     p_explore.add_argument("--max-children", type=_positive_int, default=40, help="Max children per package (default: 40)")
+    p_explore.add_argument(
+        "--metrics", action="store_true", help="Add cycles, transitive closure sizes and PageRank (needs numpy, scipy)"
+    )
+    _add_graph_arguments(p_explore)
     p_explore.set_defaults(func=cmd_explore)
 
     # path
@@ -356,6 +1636,7 @@ def main() -> int:
     p_path.add_argument("--package", action="append", help="Top-level package (repeatable)")
     p_path.add_argument("--include-external", action="store_true", help="Include external packages")
     p_path.add_argument("--as-packages", action="store_true", help="Treat as packages, not modules")
+    _add_graph_arguments(p_path)
     p_path.set_defaults(func=cmd_path)
 
     # layers
@@ -366,6 +1647,7 @@ def main() -> int:
     p_layers.add_argument("--include-external", action="store_true", help="Include external packages")
     p_layers.add_argument("--max-routes", type=_positive_int, default=3, help="Max routes per dependency (default: 3)")
     p_layers.add_argument("--json", action="store_true", help="Emit JSON output")
+    _add_graph_arguments(p_layers)
     p_layers.set_defaults(func=cmd_layers)
 
     # diff
@@ -376,8 +1658,35 @@ def main() -> int:
     p_diff.add_argument("--container", action="append", help="Container packages (repeatable)")
     p_diff.add_argument("--include-external", action="store_true", help="Include external packages")
     p_diff.add_argument("--max-show", type=_positive_int, default=25, help="Max new violations to show (default: 25)")
+    p_diff.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Only check import chains through modules changed since git REF (needs a baseline taken at REF)",
+    )
+    _add_graph_arguments(p_diff)
     p_diff.set_defaults(func=cmd_diff)
 
+    # batch
+    p_batch = subparsers.add_parser("batch", help="Run many queries from a JSON/TOML file on one graph.")
+    p_batch.add_argument("file", help="Batch file (.json or .toml) with a 'queries' list")
+    p_batch.add_argument("--include-external", action="store_true", help="Include external packages")
+    p_batch.add_argument(
+        "--jobs", type=_positive_int, default=min(4, os.cpu_count() or 1), help="Queries run concurrently (default: up to 4)"
+    )
+    _add_graph_arguments(p_batch)
+    p_batch.set_defaults(func=cmd_batch)
+
+    # serve
+    p_serve = subparsers.add_parser("serve", help="Keep the graph in memory for the other commands (Linux).")
+    p_serve.add_argument("package", nargs="*", help="Top-level package(s) to serve")
+    p_serve.add_argument("--include-external", action="store_true", help="Include external packages")
+    p_serve.add_argument(
+        "--cache-dir", default=DEFAULT_CACHE_DIR, help=f"Graph cache and socket directory (default: {DEFAULT_CACHE_DIR})"
+    )
+    p_serve.add_argument("--status", action="store_true", help="Show the running daemon's status")
+    p_serve.add_argument("--stop", action="store_true", help="Stop the running daemon")
+    p_serve.set_defaults(func=cmd_serve)
+
     args = parser.parse_args()
     return args.func(args)
 
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Tests that diff --changed-since reports what a full diff does.
+
+Needs grimp and git. Run from this directory:
+  python -m unittest test_changed_since
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+CLI = Path(__file__).resolve().parent / "grimp_cli.py"
+LAYERS = ["l0", "l1", "l2", "l3"]
+RANKS = {name: rank for rank, name in enumerate([*LAYERS, "shared"])}
+MODULES = 6
+ROUNDS = 25
+# A plain check, siblings in one layer, and a container with a layer left out.
+CONFIGS = [
+    {"layers": ["app.l0", "app.l1", "app.l2", "app.l3"]},
+    {"layers": ["app.l0", ["app.l1", "app.l2"], "app.l3"]},
+    {"layers": ["l0", "l2", "l3"], "containers": ["app"]},
+]
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@unittest.skipUnless(importlib.util.find_spec("grimp") and shutil.which("git"), "needs grimp and git")
+class ChangedSinceTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix="grimp-test-")
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.repo = self.tmp / "repo"
+        self.rng = random.Random(0)
+        for directory in ["", "app", "app/shared", *(f"app/{layer}" for layer in LAYERS)]:
+            (self.repo / directory).mkdir()
+            (self.repo / directory / "__init__.py").write_text("")
+        for package in ["shared", *LAYERS]:
+            for j in range(MODULES):
+                (self.repo / f"app/{package}/m{j}.py").write_text("")
+        # Downward imports (shared is the lowest) and a few upward ones, so that edits add and resolve violations.
+        modules = self.modules()
+        for path in modules:
+            below = [m for m in modules if RANKS[m.parent.name] >= RANKS[path.parent.name] and m != path]
+            for _ in range(self.rng.randint(0, 2)):
+                self.add_import(path, self.rng.choice(below))
+        for _ in range(3):
+            self.add_import(self.rng.choice(modules), self.rng.choice(modules))
+        _git(self.repo, "init", "-q")
+        self.commit()
+
+    def modules(self) -> list[Path]:
+        return sorted(p for p in (self.repo / "app").rglob("*.py") if p.name != "__init__.py")
+
+    def module_name(self, path: Path) -> str:
+        return ".".join(path.relative_to(self.repo).with_suffix("").parts)
+
+    def add_import(self, path: Path, target: Path) -> None:
+        with path.open("a") as handle:
+            handle.write(f"import {self.module_name(target)}\n")
+
+    def commit(self) -> None:
+        _git(self.repo, "add", "-A")
+        author = ("-c", "user.name=test", "-c", "user.email=test@example.com")
+        _git(self.repo, *author, "commit", "-q", "--allow-empty", "-m", "change")
+
+    def cli(self, *argv: str) -> subprocess.CompletedProcess:
+        argv = [sys.executable, str(CLI), *argv, "--no-cache", "--no-daemon"]
+        return subprocess.run(argv, cwd=self.repo, capture_output=True, text=True)
+
+    def take_baselines(self) -> list[str]:
+        paths = []
+        for i, config in enumerate(CONFIGS):
+            argv = ["layers", "--json", "--package", "app"]
+            argv += [arg for container in config.get("containers", []) for arg in ("--container", container)]
+            for layer in config["layers"]:
+                argv += ["--layer", ",".join(layer) if isinstance(layer, list) else layer]
+            report = self.cli(*argv).stdout
+            self.assertIsNotNone(json.loads(report)["git_commit"])
+            path = self.tmp / f"baseline-{i}.json"
+            path.write_text(report)
+            paths.append(str(path))
+        return paths
+
+    def edit(self) -> None:
+        for _ in range(self.rng.randint(1, 3)):
+            kind = self.rng.choice(("import", "import", "drop", "drop", "add", "delete"))
+            modules = self.modules()
+            path = self.rng.choice(modules)
+            if kind == "import":
+                self.add_import(path, self.rng.choice(modules))
+            elif kind == "drop":
+                path.write_text("")
+            elif kind == "add":
+                new = path.with_name(f"new{self.rng.randrange(10**6)}.py")
+                new.write_text("")
+                self.add_import(new, self.rng.choice(modules))
+                self.add_import(self.rng.choice(modules), new)
+            elif len(modules) > 2:
+                path.unlink()
+
+    def test_random_edits_match_full_diff(self):
+        seen = {"new_violations": 0, "resolved_violations": 0}
+        for step in range(ROUNDS):
+            baselines = self.take_baselines()
+            self.edit()
+            queries = []
+            for config, baseline in zip(CONFIGS, baselines):
+                query = {"type": "diff", "baseline": baseline, **config}
+                queries += [query, {**query, "changed_since": "HEAD"}]
+            batch = self.tmp / "batch.json"
+            batch.write_text(json.dumps({"packages": ["app"], "queries": queries}))
+            results = json.loads(self.cli("batch", str(batch), "--jobs", "1").stdout)["results"]
+            for i in range(0, len(results), 2):
+                full, incremental = results[i], results[i + 1]
+                for key in seen:
+                    self.assertEqual(incremental[key], full[key], f"{key} in round {step}, config {i // 2}")
+                    seen[key] += bool(full[key])
+            self.commit()
+        # The edits must exercise both sides of the diff.
+        self.assertTrue(all(seen.values()), seen)
+
+    def test_refuses_baseline_not_taken_at_ref(self):
+        baseline = self.take_baselines()[0]
+        argv = ["diff", "--baseline", baseline, "--package", "app"]
+        argv += [arg for layer in CONFIGS[0]["layers"] for arg in ("--layer", layer)]
+        self.assertEqual(self.cli(*argv, "--changed-since", "HEAD").returncode, 0)
+
+        self.edit()
+        self.commit()
+        stale = self.cli(*argv, "--changed-since", "HEAD")
+        self.assertEqual(stale.returncode, 1)
+        self.assertIn("needs a baseline", stale.stderr)
+
+        other = self.cli(*argv[:-2], "--changed-since", "HEAD~1")
+        self.assertEqual(other.returncode, 1)
+        self.assertIn("other layers", other.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
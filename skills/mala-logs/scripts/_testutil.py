@@ -0,0 +1,64 @@
+"""Helpers shared by the mala-logs tests and bench.py.
+
+The scripts have hyphenated names, so they are loaded from their files
+rather than imported; logs come from gen-logs.py.
+"""
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Stdlib only
+
+SCRIPTS = Path(__file__).resolve().parent
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+
+def load_script(name: str, filename: str):
+    """Import one of the hyphenated sibling scripts as module ``name`` (once)."""
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, SCRIPTS / filename)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+def generate_logs(out: Path, size: str, sessions: int, seed: int = 0) -> dict:
+    """Generate a log environment with gen-logs.py; returns its description (including the env to use it)."""
+    gen = load_script("gen_logs", "gen-logs.py")
+    args = gen.build_parser().parse_args([str(out), "--size", size, "--sessions", str(sessions), "--seed", str(seed)])
+    return gen.generate(out, args)
+
+
+def run_main(module, *argv: str) -> str:
+    """Stdout of ``module.main()`` run with ``argv``."""
+    out = io.StringIO()
+    with mock.patch.object(sys, "argv", [Path(module.__file__).name, *argv]), contextlib.redirect_stdout(out):
+        module.main()
+    return out.getvalue()
+
+
+class LogsTestCase(unittest.TestCase):
+    """Runs each test against freshly generated logs, with the environment and index pointed at them."""
+
+    SIZE = "256KB"
+    SESSIONS = 4
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix="mala-test-")
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.info = generate_logs(self.tmp / "data", self.SIZE, self.SESSIONS)
+        self.logs = sorted((self.tmp / "data" / "claude").rglob("*.jsonl"))
+        env = mock.patch.dict(os.environ, {**self.info["env"], "MALA_LOG_INDEX": str(self.tmp / "index.sqlite")})
+        env.start()
+        self.addCleanup(env.stop)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Benchmark the mala-logs queries on synthetic logs and compare against saved baselines.
+
+Logs for each scale are generated once with gen-logs.py and kept under
+--data-dir. Every case is timed --repeat times; "cold" cases start from an
+empty SQLite index, "warm" ones reuse an index the query has already filled
+(the OS page cache is warm either way).
+
+Results are compared with the baseline checked in as
+bench-baselines/reference.json unless --compare names another or
+--no-compare is given. The 1GB scale is opt-in: generating it takes a few
+minutes and 1GB of disk, and each cold search_logs run on it ~90s on one
+core, so a default run (1MB,100MB) stays a quick check. Pass
+--scales 1MB,100MB,1GB before merging changes to the scan or index paths.
+
+Usage:
+  bench.py [--scales 1MB,100MB,1GB] [--repeat N] [--save NAME] [--compare NAME | --no-compare]
+
+Examples:
+  bench.py
+  bench.py --scales 1MB,100MB,1GB --repeat 1
+  bench.py --scales 1MB,100MB --save main
+  bench.py --scales 100MB --compare main --threshold 1.2
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from _testutil import generate_logs, load_script
+
+# Stdlib only
+
+SEARCH_PATTERN = "AssertionError: expected [0-4]"
+DEFAULT_SCALES = "1MB,100MB"
+DEFAULT_THRESHOLD = 1.25
+# Baselines live next to the script so they can be committed; "reference" is the checked-in one.
+BASELINE_DIR = Path(__file__).resolve().parent / "bench-baselines"
+REFERENCE_BASELINE = "reference"
+
+
+def get_data_dir() -> Path:
+    return Path(os.environ.get("MALA_BENCH_DIR", str(Path.home() / ".cache/mala-logs-bench")))
+
+
+# -----------------------------------------------------------------------------
+# Data
+# -----------------------------------------------------------------------------
+
+
+def default_sessions(size: int) -> int:
+    """Sessions per scale: 4 up to 256MB, then one per 64MB, at most 20."""
+    return max(4, min(20, size >> 26))
+
+
+def prepare(data_dir: Path, scale: str, seed: int) -> dict:
+    """Generate (or reuse) the logs for one scale; returns gen-logs.py's description of them."""
+    gen = load_script("gen_logs", "gen-logs.py")
+    size = gen.parse_size(scale)
+    sessions = default_sessions(size)
+    out = data_dir / f"{scale}-s{sessions}-seed{seed}-v{gen.GENERATOR_VERSION}"
+    marker = out / "generated.json"
+    if marker.exists():
+        return json.loads(marker.read_text())
+    print(f"generating {scale} ({sessions} sessions) in {out} ...", file=sys.stderr)
+    info = generate_logs(out, scale, sessions, seed)
+    marker.write_text(json.dumps(info, indent=2))
+    return info
+
+
+# -----------------------------------------------------------------------------
+# Cases
+# -----------------------------------------------------------------------------
+
+
+def _time(fn: Callable[[], object], repeat: int, setup: Callable[[], None] | None = None) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_scale(info: dict, repeat: int, jobs: int) -> dict[str, dict]:
+    """Time every case on one generated scale."""
+    os.environ.update(info["env"])
+    find_logs = load_script("find_logs", "find-logs.py")
+    parse_session = load_script("parse_session", "parse-session.py")
+    repo = Path(info["repo"])
+    issue_id = info["issues"][len(info["issues"]) // 2]
+    largest = max(Path(find_logs.get_session_logs_dir(repo)).glob("*.jsonl"), key=lambda p: p.stat().st_size)
+
+    queries = {
+        "list_sessions": lambda index: find_logs.list_sessions(repo, recent=0, index=index),
+        "search_logs": lambda index: find_logs.search_logs(SEARCH_PATTERN, repo, recent=0, index=index, jobs=jobs),
+        "find_issue_logs": lambda index: find_logs.find_issue_logs(issue_id, repo, index=index),
+    }
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="mala-bench-") as tmp:
+        state = {}
+
+        def fresh_index():
+            if "index" in state:
+                state["index"].close()
+            path = Path(tmp) / f"cold-{time.monotonic_ns()}.sqlite"
+            state["index"] = find_logs.LogIndex(path)
+
+        for name, query in queries.items():
+            results[f"{name}/cold"] = _time(lambda: query(state["index"]), repeat, setup=fresh_index)
+            warm = find_logs.LogIndex(Path(tmp) / f"warm-{name}.sqlite")
+            query(warm)
+            results[f"{name}/warm"] = _time(lambda: query(warm), repeat)
+            warm.close()
+            _progress(name, results)
+        state["index"].close()
+
+    results["analyze_session"] = _time(lambda: parse_session.analyze_session(largest), repeat)
+    _progress("analyze_session", results)
+    return {
+        case: {"min": round(min(times), 4), "median": round(statistics.median(times), 4), "runs": len(times)}
+        for case, times in results.items()
+    }
+
+
+def _progress(prefix: str, results: dict[str, list[float]]) -> None:
+    for case, times in results.items():
+        if case.startswith(prefix):
+            print(f"  {case:<24} min {min(times):8.3f}s  median {statistics.median(times):8.3f}s", file=sys.stderr)
+
+
+# -----------------------------------------------------------------------------
+# Baselines
+# -----------------------------------------------------------------------------
+
+
+def baseline_path(baseline_dir: Path, name: str) -> Path:
+    return baseline_dir / f"{name}.json"
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Cases present in both reports whose best time grew by more than ``threshold``x.
+
+    Only cases slower than 10ms are judged, since shorter ones are mostly noise.
+    """
+    regressions = []
+    for scale, cases in current["results"].items():
+        for case, stats in cases.items():
+            base = baseline["results"].get(scale, {}).get(case)
+            if base is None or max(base["min"], stats["min"]) < 0.01:
+                continue
+            ratio = stats["min"] / max(base["min"], 1e-6)
+            stats["baseline_min"] = base["min"]
+            stats["ratio"] = round(ratio, 3)
+            if ratio > threshold:
+                regressions.append({"scale": scale, "case": case, **stats})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mala-logs queries on synthetic logs")
+    parser.add_argument("--scales", default=DEFAULT_SCALES,
+                        help=f"Comma-separated total log sizes (default {DEFAULT_SCALES}; add 1GB for a full run)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (the best and median are kept)")
+    parser.add_argument("--jobs", type=int, default=1, help="search_logs worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--data-dir", type=Path, default=None, help="Generated logs (default ~/.cache/mala-logs-bench)")
+    parser.add_argument("--baseline-dir", type=Path, default=BASELINE_DIR,
+                        help="Saved baselines (default bench-baselines/ next to this script)")
+    parser.add_argument("--save", metavar="NAME", help="Save the results as baseline NAME")
+    parser.add_argument("--compare", metavar="NAME", default=REFERENCE_BASELINE,
+                        help=f"Compare against baseline NAME; exit 1 on regression (default {REFERENCE_BASELINE})")
+    parser.add_argument("--no-compare", dest="compare", action="store_const", const=None, help="Don't compare")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Slowdown ratio that counts as a regression (default {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or get_data_dir()
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "results": {},
+    }
+    baseline = None
+    if args.compare:
+        path = baseline_path(args.baseline_dir, args.compare)
+        if not path.exists():
+            print(f"No baseline {args.compare!r} at {path}", file=sys.stderr)
+            sys.exit(1)
+        baseline = json.loads(path.read_text())
+        differs = [key for key in ("python", "machine", "cpus") if baseline.get(key) != report[key]]
+        if differs:
+            print(
+                f"Note: baseline {args.compare!r} was taken with a different {', '.join(differs)}; "
+                f"save one on this machine (--save NAME) for tight comparisons",
+                file=sys.stderr,
+            )
+    for scale in filter(None, (s.strip() for s in args.scales.split(","))):
+        info = prepare(data_dir, scale, args.seed)
+        print(f"{scale}: {info['sessions']} sessions, {info['bytes'] / 1e6:.1f} MB", file=sys.stderr)
+        report["results"][scale] = run_scale(info, args.repeat, args.jobs)
+
+    regressions = compare(report, baseline, args.threshold) if baseline is not None else []
+    if baseline is not None:
+        report["baseline"] = args.compare
+        report["regressions"] = regressions
+    if args.save:
+        path = baseline_path(args.baseline_dir, args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+        print(f"Saved baseline {args.save!r} to {path}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,27 +2,64 @@
 """Find mala/claude logs by various criteria.
 
 Usage:
-  find-logs.py sessions [--repo PATH] [--recent N] [--after DATE]
+  find-logs.py sessions [--repo PATH | --all-repos] [--recent N] [--after DATE]
   find-logs.py runs [--repo PATH] [--recent N]
   find-logs.py session SESSION_ID [--repo PATH]
-  find-logs.py issue ISSUE_ID [--repo PATH]
-  find-logs.py search PATTERN [--repo PATH] [--recent N]
+  find-logs.py issue ISSUE_ID [--repo PATH | --all-repos]
+  find-logs.py search PATTERN [--repo PATH | --all-repos] [--recent N] [--jobs N]
+                       [--since TIME] [--until TIME]
+  find-logs.py archive --older-than TIME [--repo PATH | --all-repos] [--format gz|zst] [--dry-run]
 
 Examples:
   find-logs.py sessions --recent 5
   find-logs.py session 8ebf0b25-370c-40cc-8de2-8fb13ab62dd4
   find-logs.py issue mala-51q.1
   find-logs.py search "pytest.*failed"
+  find-logs.py search "Exit code [1-9]" --recent 0 --jobs 8
+  find-logs.py search "pytest.*test_login" --all-repos --recent 0
+  find-logs.py search "Traceback" --since 30m
+  find-logs.py archive --older-than 30d --format zst
 """
 from __future__ import annotations
 
 import argparse
 import json
+import multiprocessing
 import os
 import re
+import sqlite3
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from types import GeneratorType
+from typing import Callable, Iterable, Iterator
+
+from mala_logs_lib import (
+    LOG_SUFFIXES,
+    MAX_PREVIEW_MATCHES as _MAX_PREVIEW_MATCHES,
+    SCAN_CHUNK_BYTES as _SCAN_CHUNK_BYTES,
+    TimeIndex,
+    compress_log,
+    connect_index,
+    format_timestamp,
+    get_index_path,
+    get_mala_runs_dir,
+    is_compressed,
+    parse_jobs_arg,
+    parse_time_arg,
+    print_json_array,
+    require_zstandard,
+    scan_spans as _scan_spans,
+    session_id_of,
+    tail_hash as _tail_hash,
+)
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse  # type: ignore
 
 
 # All stdlib - no external dependencies needed
@@ -38,10 +75,6 @@ def get_claude_config_dir() -> Path:
     return Path(os.environ.get("CLAUDE_CONFIG_DIR", str(Path.home() / ".claude")))
 
 
-def get_mala_runs_dir() -> Path:
-    return Path(os.environ.get("MALA_RUNS_DIR", str(Path.home() / ".config/mala/runs")))
-
-
 def get_session_logs_dir(repo_path: Path) -> Path:
     encoded = encode_repo_path(repo_path)
     return get_claude_config_dir() / "projects" / encoded
@@ -52,125 +85,999 @@ def get_run_metadata_dir(repo_path: Path) -> Path:
     return get_mala_runs_dir() / encoded
 
 
-def list_sessions(repo_path: Path, recent: int = 10, after: str | None = None) -> list[dict]:
+def list_project_dirs() -> list[Path]:
+    """Every encoded repo directory with Claude session logs."""
+    projects = get_claude_config_dir() / "projects"
+    return sorted(p for p in projects.iterdir() if p.is_dir()) if projects.is_dir() else []
+
+
+def list_run_dirs() -> list[Path]:
+    """Every encoded repo directory with mala run metadata."""
+    runs = get_mala_runs_dir()
+    return sorted(p for p in runs.iterdir() if p.is_dir()) if runs.is_dir() else []
+
+
+# -----------------------------------------------------------------------------
+# Index
+# -----------------------------------------------------------------------------
+
+# Lines are grouped into ~64KB blocks for the trigram index; regexes only run on candidate blocks.
+_TEXT_BLOCK_BYTES = 64 * 1024
+# Directories scanned at once by --all-repos.
+_REPO_THREADS = 8
+
+
+class LogIndex:
+    """Persistent index of session logs keyed by path + size + mtime.
+
+    Session listings are refreshed from a single ``scandir`` per directory and
+    search results are cached per (pattern, path) together with the byte offset
+    they cover, so appended logs only have their new lines rescanned.
+
+    Log content is also indexed as trigrams over blocks of lines, which lets
+    ``search_logs`` skip every block that cannot contain a regex match.
+
+    Mala run metadata is indexed the same way: a run file is only parsed again
+    when its size or mtime changes, and each of its issues gets a row, so issue
+    lookups and recent-run listings never load the other run files.
+
+    Logs compressed by ``archive`` keep their uncompressed size and line count
+    on the session row, so listings never decompress them.
+    """
+
+    SCHEMA_VERSION = 4
+    TABLES = (
+        "sessions", "search_cache", "text_files", "text_blocks", "text_blocks_fts", "meta", "runs", "run_issues",
+    )
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            path TEXT PRIMARY KEY,
+            dir TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            raw_size INTEGER,
+            lines INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS sessions_dir ON sessions(dir, mtime_ns);
+        CREATE TABLE IF NOT EXISTS search_cache (
+            pattern TEXT NOT NULL,
+            path TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            lines INTEGER NOT NULL,
+            tail_hash TEXT NOT NULL,
+            match_count INTEGER NOT NULL,
+            matches TEXT NOT NULL,
+            PRIMARY KEY (pattern, path)
+        );
+        CREATE TABLE IF NOT EXISTS text_files (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT UNIQUE NOT NULL,
+            offset INTEGER NOT NULL,
+            lines INTEGER NOT NULL,
+            tail_hash TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS text_blocks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_id INTEGER NOT NULL,
+            offset INTEGER NOT NULL,
+            end INTEGER NOT NULL,
+            first_line INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS text_blocks_file ON text_blocks(file_id);
+        CREATE VIRTUAL TABLE IF NOT EXISTS text_blocks_fts
+            USING fts5(text, content='', tokenize='trigram', detail='none');
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS runs (
+            path TEXT PRIMARY KEY,
+            dir TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            valid INTEGER NOT NULL,
+            run_id TEXT,
+            started_at TEXT,
+            issues TEXT
+        );
+        CREATE INDEX IF NOT EXISTS runs_dir ON runs(dir, started_at);
+        CREATE TABLE IF NOT EXISTS run_issues (
+            issue_id TEXT NOT NULL,
+            dir TEXT NOT NULL,
+            run_path TEXT NOT NULL,
+            record TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS run_issues_issue ON run_issues(issue_id, dir);
+        CREATE INDEX IF NOT EXISTS run_issues_path ON run_issues(run_path);
+    """
+
+    def __init__(self, path: Path | None = None):
+        try:
+            self.conn = connect_index(path or get_index_path())
+            self._init_schema()
+        except sqlite3.Error:
+            # Unwritable or corrupt index: fall back to a throwaway one.
+            self.conn = sqlite3.connect(":memory:")
+            self._init_schema()
+
+    def _init_schema(self) -> None:
+        """Create tables, discarding an index written by an older schema (it is only a cache)."""
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            for table in self.TABLES:
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.conn.executescript(self.SCHEMA)
+        self.times = TimeIndex(self.conn)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def refresh_dir(self, logs_dir: Path) -> list[tuple]:
+        """Sync index rows for ``logs_dir`` with disk.
+
+        Returns (path, session_id, size, mtime_ns, raw_size, lines) rows; the
+        last two are only known for logs compressed by ``archive``.
+        """
+        dir_key = str(logs_dir)
+        known = {
+            row[0]: row[1:]
+            for row in self.conn.execute(
+                "SELECT path, size, mtime_ns, raw_size, lines FROM sessions WHERE dir = ?", (dir_key,)
+            )
+        }
+        seen = []
+        changed = []
+        try:
+            entries = list(os.scandir(logs_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            session_id = session_id_of(entry.name)
+            if session_id is None:
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            row = (entry.path, session_id, stat.st_size, stat.st_mtime_ns)
+            old = known.get(entry.path)
+            if old is not None and old[:2] == (stat.st_size, stat.st_mtime_ns):
+                seen.append((*row, *old[2:]))
+            else:
+                seen.append((*row, None, None))
+                changed.append(row)
+
+        gone = set(known) - {row[0] for row in seen}
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO sessions (path, dir, session_id, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                [(path, dir_key, sid, size, mtime) for path, sid, size, mtime in changed],
+            )
+            for path in gone:
+                self._forget(path)
+        return seen
+
+    def _forget(self, path: str) -> None:
+        """Drop everything cached for a log that no longer exists."""
+        self.conn.execute("DELETE FROM sessions WHERE path = ?", (path,))
+        self.conn.execute("DELETE FROM search_cache WHERE path = ?", (path,))
+        self._drop_text(path)
+        self.times.forget(path)
+
+    def record_archive(self, original: str, archive: str, size: int, mtime_ns: int, raw_size: int, lines: int) -> None:
+        """Replace a plain log's rows with its compressed copy, keeping the uncompressed size and line count."""
+        with self.conn:
+            self._forget(original)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sessions (path, dir, session_id, size, mtime_ns, raw_size, lines) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (archive, str(Path(archive).parent), session_id_of(Path(archive).name), size, mtime_ns, raw_size, lines),
+            )
+
+    def lookup(self, log_file: Path) -> tuple[int, int, int | None, int | None] | None:
+        """Stat a single log and record it; returns (size, mtime_ns, raw_size, lines)."""
+        try:
+            stat = log_file.stat()
+        except FileNotFoundError:
+            return None
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, raw_size, lines FROM sessions WHERE path = ?", (str(log_file),)
+        ).fetchone()
+        if row is not None and row[:2] == (stat.st_size, stat.st_mtime_ns):
+            return row
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sessions (path, dir, session_id, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                (str(log_file), str(log_file.parent), session_id_of(log_file.name), stat.st_size, stat.st_mtime_ns),
+            )
+        return stat.st_size, stat.st_mtime_ns, None, None
+
+    def cached_search(self, pattern: str, path: str) -> tuple[int, int, str, int, list[dict]] | None:
+        row = self.conn.execute(
+            "SELECT offset, lines, tail_hash, match_count, matches FROM search_cache WHERE pattern = ? AND path = ?",
+            (pattern, path),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], row[2], row[3], json.loads(row[4])
+
+    def store_search(
+        self, pattern: str, path: str, offset: int, lines: int, tail_hash: str, match_count: int, matches: list[dict]
+    ) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_cache (pattern, path, offset, lines, tail_hash, match_count, matches) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (pattern, path, offset, lines, tail_hash, match_count, json.dumps(matches)),
+            )
+
+    def update_text(self, path: str) -> tuple[int, int]:
+        """Index newly appended complete lines of ``path``; returns the (offset, lines) now covered."""
+        row = self.conn.execute(
+            "SELECT id, offset, lines, tail_hash FROM text_files WHERE path = ?", (path,)
+        ).fetchone()
+        with open(path, "rb") as f:
+            if row is not None:
+                file_id, offset, lines, tail_hash = row
+                f.seek(0, os.SEEK_END)
+                if f.tell() < offset or _tail_hash(f, offset) != tail_hash:
+                    self._drop_text(path)
+                    row = None
+            if row is None:
+                file_id, offset, lines = None, 0, 0
+
+            f.seek(offset)
+            start, first_line = offset, lines + 1
+            chunks: list[bytes] = []
+            blocks: list[tuple[int, int, int, str]] = []
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                chunks.append(raw)
+                lines += 1
+                offset += len(raw)
+                if offset - start >= _TEXT_BLOCK_BYTES:
+                    blocks.append((start, offset, first_line, b"".join(chunks).decode("utf-8", errors="replace")))
+                    start, first_line, chunks = offset, lines + 1, []
+            if chunks:
+                blocks.append((start, offset, first_line, b"".join(chunks).decode("utf-8", errors="replace")))
+            if row is not None and not blocks:
+                return offset, lines
+            tail_hash = _tail_hash(f, offset)
+
+        with self.conn:
+            if file_id is None:
+                file_id = self.conn.execute(
+                    "INSERT INTO text_files (path, offset, lines, tail_hash) VALUES (?, ?, ?, ?)",
+                    (path, offset, lines, tail_hash),
+                ).lastrowid
+            else:
+                self.conn.execute(
+                    "UPDATE text_files SET offset = ?, lines = ?, tail_hash = ? WHERE id = ?",
+                    (offset, lines, tail_hash, file_id),
+                )
+            for block_start, block_end, block_line, text in blocks:
+                block_id = self.conn.execute(
+                    "INSERT INTO text_blocks (file_id, offset, end, first_line) VALUES (?, ?, ?, ?)",
+                    (file_id, block_start, block_end, block_line),
+                ).lastrowid
+                self.conn.execute("INSERT INTO text_blocks_fts (rowid, text) VALUES (?, ?)", (block_id, text))
+        return offset, lines
+
+    def candidate_blocks(self, query: str, paths: list[str]) -> dict[str, list[tuple[int, int, int]]]:
+        """Map path -> [(offset, end, first_line)] for indexed blocks matching an FTS ``query``."""
+        wanted = set(paths)
+        candidates: dict[str, list[tuple[int, int, int]]] = {path: [] for path in paths}
+        rows = self.conn.execute(
+            "SELECT f.path, b.offset, b.end, b.first_line FROM text_blocks_fts "
+            "JOIN text_blocks b ON b.id = text_blocks_fts.rowid "
+            "JOIN text_files f ON f.id = b.file_id "
+            "WHERE text_blocks_fts MATCH ? ORDER BY b.file_id, b.offset",
+            (query,),
+        )
+        for path, offset, end, first_line in rows:
+            if path in wanted:
+                candidates[path].append((offset, end, first_line))
+        return candidates
+
+    def _drop_text(self, path: str) -> None:
+        """Forget the text index for ``path``.
+
+        Contentless FTS rows cannot be deleted individually, so they are left
+        orphaned (block ids are never reused) and the whole trigram index is
+        reset once orphans outnumber live blocks.
+        """
+        row = self.conn.execute("SELECT id FROM text_files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return
+        orphaned = self.conn.execute("DELETE FROM text_blocks WHERE file_id = ?", (row[0],)).rowcount
+        self.conn.execute("DELETE FROM text_files WHERE id = ?", (row[0],))
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('orphaned_blocks', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+            (orphaned,),
+        )
+        total_orphaned = self.conn.execute("SELECT value FROM meta WHERE key = 'orphaned_blocks'").fetchone()[0]
+        live = self.conn.execute("SELECT count(*) FROM text_blocks").fetchone()[0]
+        if total_orphaned > max(live, 1000):
+            self.conn.execute("INSERT INTO text_blocks_fts (text_blocks_fts) VALUES ('delete-all')")
+            self.conn.execute("DELETE FROM text_blocks")
+            self.conn.execute("DELETE FROM text_files")
+            self.conn.execute("UPDATE meta SET value = 0 WHERE key = 'orphaned_blocks'")
+
+    def refresh_runs(self, runs_dir: Path) -> None:
+        """Sync run rows for ``runs_dir`` with disk, re-parsing only new or changed run files."""
+        dir_key = str(runs_dir)
+        known = {
+            row[0]: (row[1], row[2])
+            for row in self.conn.execute("SELECT path, size, mtime_ns FROM runs WHERE dir = ?", (dir_key,))
+        }
+        seen = set()
+        changed = []
+        try:
+            entries = list(os.scandir(runs_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            seen.add(entry.path)
+            if known.get(entry.path) != (stat.st_size, stat.st_mtime_ns):
+                changed.append((entry.path, stat.st_size, stat.st_mtime_ns))
+
+        parsed = [(path, size, mtime_ns, _load_run(Path(path))) for path, size, mtime_ns in changed]
+        with self.conn:
+            for path in set(known) - seen:
+                self.conn.execute("DELETE FROM runs WHERE path = ?", (path,))
+                self.conn.execute("DELETE FROM run_issues WHERE run_path = ?", (path,))
+            for path, size, mtime_ns, run in parsed:
+                self.conn.execute("DELETE FROM run_issues WHERE run_path = ?", (path,))
+                if run is None:
+                    # Unparseable (possibly still being written); retried once it changes.
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO runs (path, dir, size, mtime_ns, valid) VALUES (?, ?, ?, ?, 0)",
+                        (path, dir_key, size, mtime_ns),
+                    )
+                    continue
+                run_id, started_at, issues = run
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO runs (path, dir, size, mtime_ns, valid, run_id, started_at, issues) "
+                    "VALUES (?, ?, ?, ?, 1, ?, ?, ?)",
+                    (path, dir_key, size, mtime_ns, run_id, started_at, json.dumps(list(issues))),
+                )
+                self.conn.executemany(
+                    "INSERT INTO run_issues (issue_id, dir, run_path, record) VALUES (?, ?, ?, ?)",
+                    [(issue_id, dir_key, path, json.dumps(record)) for issue_id, record in issues.items()],
+                )
+
+    def recent_runs(self, runs_dir: Path, recent: int) -> list[tuple]:
+        """(path, run_id, started_at, issue ids) for the most recently started runs in ``runs_dir``."""
+        rows = self.conn.execute(
+            "SELECT path, run_id, started_at, issues FROM runs WHERE dir = ? AND valid "
+            "ORDER BY started_at DESC LIMIT ?",
+            (str(runs_dir), recent if recent else -1),
+        )
+        return [(path, run_id, started_at, json.loads(issues)) for path, run_id, started_at, issues in rows]
+
+    def issue_runs(self, runs_dir: Path, issue_id: str) -> list[tuple[str, dict]]:
+        """(run path, issue record) for every run in ``runs_dir`` that includes ``issue_id``, newest file first."""
+        rows = self.conn.execute(
+            "SELECT run_path, record FROM run_issues WHERE issue_id = ? AND dir = ? ORDER BY run_path DESC",
+            (issue_id, str(runs_dir)),
+        )
+        return [(run_path, json.loads(record)) for run_path, record in rows]
+
+
+def _load_run(path: Path) -> tuple[str | None, str, dict[str, dict]] | None:
+    """Parse a run metadata file into (run_id, started_at, issue_id -> lookup record)."""
+    try:
+        with open(path) as fh:
+            data = json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("issues", {}), dict):
+        return None
+
+    issues = {}
+    for issue_id, issue in data.get("issues", {}).items():
+        if not isinstance(issue, dict):
+            continue
+        issues[issue_id] = {
+            "run_id": data.get("run_id"),
+            "run_path": str(path),
+            "session_id": issue.get("session_id"),
+            "log_path": issue.get("log_path"),
+            "status": issue.get("status"),
+            "duration_seconds": issue.get("duration_seconds"),
+            "quality_gate": (issue.get("quality_gate") or {}).get("passed"),
+        }
+    return data.get("run_id"), data.get("started_at", ""), issues
+
+
+def _session_record(
+    path: str, session_id: str, size: int, mtime_ns: int, raw_size: int | None = None, lines: int | None = None
+) -> dict:
+    record = {
+        "session_id": session_id,
+        "path": path,
+        "modified": datetime.fromtimestamp(mtime_ns / 1e9).isoformat(),
+        "size_kb": (size if raw_size is None else raw_size) // 1024,
+    }
+    if is_compressed(path):
+        # size_kb is the uncompressed size when the log was compressed by `archive`.
+        record["compressed_kb"] = size // 1024
+        if lines is not None:
+            record["lines"] = lines
+    return record
+
+
+# -----------------------------------------------------------------------------
+# Queries
+# -----------------------------------------------------------------------------
+
+
+def list_sessions(
+    repo_path: Path, recent: int = 10, after: str | None = None, index: LogIndex | None = None
+) -> list[dict]:
     """List recent session logs."""
-    logs_dir = get_session_logs_dir(repo_path)
+    return _list_sessions_in(get_session_logs_dir(repo_path), recent, after, index)
+
+
+def _list_sessions_in(
+    logs_dir: Path, recent: int = 10, after: str | None = None, index: LogIndex | None = None
+) -> list[dict]:
     if not logs_dir.exists():
         return []
 
+    index = index or LogIndex()
     sessions = []
-    for f in logs_dir.glob("*.jsonl"):
-        stat = f.stat()
-        mtime = datetime.fromtimestamp(stat.st_mtime)
-        if after and mtime.isoformat() < after:
+    for row in index.refresh_dir(logs_dir):
+        session = _session_record(*row)
+        if after and session["modified"] < after:
             continue
-        sessions.append({
-            "session_id": f.stem,
-            "path": str(f),
-            "modified": mtime.isoformat(),
-            "size_kb": stat.st_size // 1024,
-        })
+        sessions.append(session)
 
     sessions.sort(key=lambda x: x["modified"], reverse=True)
     return sessions[:recent] if recent else sessions
 
 
-def list_runs(repo_path: Path, recent: int = 10) -> list[dict]:
+def list_runs(repo_path: Path, recent: int = 10, index: LogIndex | None = None) -> list[dict]:
     """List mala run metadata files."""
     runs_dir = get_run_metadata_dir(repo_path)
     if not runs_dir.exists():
         return []
 
-    runs = []
-    for f in runs_dir.glob("*.json"):
-        try:
-            with open(f) as fh:
-                data = json.load(fh)
-            runs.append({
-                "run_id": data.get("run_id", f.stem),
-                "path": str(f),
-                "started_at": data.get("started_at", ""),
-                "issues": list(data.get("issues", {}).keys()),
-                "issue_count": len(data.get("issues", {})),
-            })
-        except (json.JSONDecodeError, KeyError):
-            continue
+    index = index or LogIndex()
+    index.refresh_runs(runs_dir)
+    return [
+        {
+            "run_id": run_id if run_id is not None else Path(path).stem,
+            "path": path,
+            "started_at": started_at,
+            "issues": issues,
+            "issue_count": len(issues),
+        }
+        for path, run_id, started_at, issues in index.recent_runs(runs_dir, recent)
+    ]
 
-    runs.sort(key=lambda x: x["started_at"], reverse=True)
-    return runs[:recent] if recent else runs
 
-
-def find_session(session_id: str, repo_path: Path) -> dict | None:
+def find_session(session_id: str, repo_path: Path, index: LogIndex | None = None) -> dict | None:
     """Find a specific session by ID."""
     logs_dir = get_session_logs_dir(repo_path)
-    log_file = logs_dir / f"{session_id}.jsonl"
-    if not log_file.exists():
-        return None
+    index = index or LogIndex()
+    for suffix in LOG_SUFFIXES:
+        log_file = logs_dir / f"{session_id}{suffix}"
+        stat = index.lookup(log_file)
+        if stat is not None:
+            return _session_record(str(log_file), session_id, *stat)
+    return None
 
-    stat = log_file.stat()
-    return {
-        "session_id": session_id,
-        "path": str(log_file),
-        "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-        "size_kb": stat.st_size // 1024,
-    }
 
-
-def find_issue_logs(issue_id: str, repo_path: Path) -> list[dict]:
+def find_issue_logs(issue_id: str, repo_path: Path, index: LogIndex | None = None) -> list[dict]:
     """Find logs for a specific issue from run metadata."""
-    runs_dir = get_run_metadata_dir(repo_path)
+    return list(iter_issue_logs(issue_id, repo_path, index))
+
+
+def iter_issue_logs(issue_id: str, repo_path: Path, index: LogIndex | None = None) -> Iterator[dict]:
+    """Like ``find_issue_logs``, but yield each run as soon as it is found."""
+    return _iter_issue_logs_in(issue_id, get_run_metadata_dir(repo_path), index)
+
+
+def _iter_issue_logs_in(issue_id: str, runs_dir: Path, index: LogIndex | None = None) -> Iterator[dict]:
     if not runs_dir.exists():
-        return []
+        return
+
+    index = index or LogIndex()
+    index.refresh_runs(runs_dir)
+    for _, record in index.issue_runs(runs_dir, issue_id):
+        yield record
+
+
+def archive_logs(
+    repo_path: Path,
+    older_than: str,
+    fmt: str = "gz",
+    level: int | None = None,
+    dry_run: bool = False,
+    index: LogIndex | None = None,
+) -> Iterator[dict]:
+    """Compress session logs last written before ``older_than`` (a log timestamp string)."""
+    return _archive_logs_in(get_session_logs_dir(repo_path), older_than, fmt, level, dry_run, index)
+
 
-    results = []
-    for f in sorted(runs_dir.glob("*.json"), reverse=True):
+def _archive_logs_in(
+    logs_dir: Path,
+    older_than: str,
+    fmt: str = "gz",
+    level: int | None = None,
+    dry_run: bool = False,
+    index: LogIndex | None = None,
+) -> Iterator[dict]:
+    """Replace each old plain ``.jsonl`` log with ``.jsonl.gz`` / ``.jsonl.zst``, oldest first.
+
+    The archive keeps the original mtime, and its uncompressed size and line
+    count go into the index. A log that changes while it is being compressed
+    is left alone.
+    """
+    if not logs_dir.exists():
+        return
+
+    index = index or LogIndex()
+    cutoff_ns = datetime.fromisoformat(older_than.replace("Z", "+00:00")).timestamp() * 1e9
+    for path, session_id, size, mtime_ns, *_ in sorted(index.refresh_dir(logs_dir), key=lambda row: row[3]):
+        dest = f"{path}.{fmt}"
+        if is_compressed(path) or mtime_ns >= cutoff_ns or os.path.exists(dest):
+            continue
+        record = {
+            "session_id": session_id,
+            "source": path,
+            "archive": dest,
+            "modified": datetime.fromtimestamp(mtime_ns / 1e9).isoformat(),
+            "size_kb": size // 1024,
+        }
+        if dry_run:
+            yield record
+            continue
+
+        tmp = dest + ".tmp"
         try:
-            with open(f) as fh:
-                data = json.load(fh)
-            issues = data.get("issues", {})
-            if issue_id in issues:
-                issue = issues[issue_id]
-                results.append({
-                    "run_id": data.get("run_id"),
-                    "run_path": str(f),
-                    "session_id": issue.get("session_id"),
-                    "log_path": issue.get("log_path"),
-                    "status": issue.get("status"),
-                    "duration_seconds": issue.get("duration_seconds"),
-                    "quality_gate": issue.get("quality_gate", {}).get("passed"),
-                })
-        except (json.JSONDecodeError, KeyError):
+            raw_size, lines = compress_log(path, tmp, fmt, level)
+            stat = os.stat(path)
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                os.unlink(tmp)
+                continue
+            os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            os.replace(tmp, dest)
+            os.unlink(path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        compressed_size = os.path.getsize(dest)
+        index.record_archive(path, dest, compressed_size, mtime_ns, raw_size, lines)
+        yield {**record, "size_kb": raw_size // 1024, "compressed_kb": compressed_size // 1024, "lines": lines}
+
+
+def _resume_search(path: str, pattern: str, index: LogIndex) -> tuple[int, int, int, list[dict]] | None:
+    """Cached (offset, lines, match_count, matches) a full scan of ``path`` can resume from."""
+    cached = index.cached_search(pattern, path)
+    if cached is None:
+        return None
+    offset, lines, tail_hash, match_count, matches = cached
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() < offset or _tail_hash(f, offset) != tail_hash:
+            return None
+    return offset, lines, match_count, matches
+
+
+def _split_spans(path: str, spans: list[tuple[int, int, int | None]]) -> list[tuple[int, int, int | None]]:
+    """Cut (start, end, first_line) byte spans into ~_SCAN_CHUNK_BYTES pieces on line boundaries.
+
+    An ``end`` of -1 means EOF. Pieces after the first get ``first_line=None``:
+    their line numbers follow on from the previous piece's line count.
+    """
+    pieces = []
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        for start, end, first_line in spans:
+            stop = size if end < 0 else end
+            while stop - start > _SCAN_CHUNK_BYTES:
+                f.seek(start + _SCAN_CHUNK_BYTES - 1)
+                f.readline()
+                cut = f.tell()
+                if cut >= stop:
+                    break
+                pieces.append((start, cut, first_line))
+                start, first_line = cut, None
+            pieces.append((start, end, first_line))
+    return pieces
+
+
+def _process_pool(jobs: int) -> ProcessPoolExecutor:
+    # --all-repos starts workers while other threads hold sqlite/file locks, so never fork from here.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context(method))
+
+
+def _trigram_query(pattern: str) -> str | None:
+    """Build an FTS5 trigram query that every line matching ``pattern`` satisfies.
+
+    Returns None when the regex has no literal text to anchor on, in which case
+    every line has to be scanned.
+    """
+    try:
+        return _literal_query(sre_parse.parse(pattern, re.IGNORECASE))
+    except (re.error, RecursionError):
+        return None
+
+
+def _literal_query(items) -> str | None:
+    clauses: list[str] = []
+    run: list[str] = []
+
+    def flush() -> None:
+        text = "".join(run)
+        run.clear()
+        for i in range(len(text) - 2):
+            gram = text[i : i + 3]
+            # Python folds "İ"/"ı" to "i" under IGNORECASE but SQLite does not.
+            if "i" in gram:
+                continue
+            quoted = '"' + gram.replace('"', '""') + '"'
+            if quoted not in clauses:
+                clauses.append(quoted)
+
+    for op, av in items:
+        if op is sre_parse.LITERAL and av < 128:
+            run.append(chr(av).lower())
             continue
+        flush()
+        sub = None
+        if op is sre_parse.SUBPATTERN:
+            sub = _literal_query(av[-1])
+        elif op is sre_parse.BRANCH:
+            alternatives = [_literal_query(branch) for branch in av[1]]
+            if all(alternatives):
+                sub = "(" + " OR ".join(f"({alt})" for alt in alternatives) + ")"
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            sub = _literal_query(av[2])
+        if sub:
+            clauses.append(sub if sub.startswith("(") else f"({sub})")
+    flush()
+    return " AND ".join(clauses) if clauses else None
+
+
+def search_logs(
+    pattern: str,
+    repo_path: Path,
+    recent: int = 5,
+    index: LogIndex | None = None,
+    jobs: int = 1,
+    since: str | None = None,
+    until: str | None = None,
+) -> list[dict]:
+    """Search within recent session logs.
+
+    Logs are scanned as line-aligned byte spans (candidate trigram blocks, or
+    the whole uncached remainder of the file), so ``jobs > 1`` can spread them
+    over a process pool; results are merged back in session order. ``since``
+    and ``until`` (log timestamp strings) clip the spans to the lines inside
+    that time window, located through the sparse timestamp index.
+    """
+    return list(iter_search_logs(pattern, repo_path, recent, index, jobs, since, until))
+
+
+def iter_search_logs(
+    pattern: str,
+    repo_path: Path,
+    recent: int = 5,
+    index: LogIndex | None = None,
+    jobs: int = 1,
+    since: str | None = None,
+    until: str | None = None,
+) -> Iterator[dict]:
+    """Like ``search_logs``, but yield each session's result as soon as it has been scanned."""
+    return _iter_search_in(pattern, get_session_logs_dir(repo_path), recent, index, jobs, since=since, until=until)
+
+
+def _iter_search_in(
+    pattern: str,
+    logs_dir: Path,
+    recent: int = 5,
+    index: LogIndex | None = None,
+    jobs: int = 1,
+    pool: ProcessPoolExecutor | None = None,
+    since: str | None = None,
+    until: str | None = None,
+) -> Iterator[dict]:
+    index = index or LogIndex()
+    sessions = _list_sessions_in(logs_dir, recent=recent, index=index)
+    re.compile(pattern, re.IGNORECASE)  # Fail fast on invalid patterns
+    query = _trigram_query(pattern)
+    windows: dict[str, tuple[int, int, int]] | None = None
+    if since is not None or until is not None:
+        sessions, windows = _time_windows(sessions, since, until, index)
 
-    return results
+    indexed: dict[str, tuple[int, int]] = {}
+    candidates: dict[str, list[tuple[int, int, int]]] = {}
+    if query is not None:
+        for session in sessions:
+            if is_compressed(session["path"]):
+                continue  # Archives are only scanned whole; they have no block index.
+            try:
+                indexed[session["path"]] = index.update_text(session["path"])
+            except OSError:
+                continue
+        candidates = index.candidate_blocks(query, list(indexed))
 
+    plans = (_plan_search(session, pattern, query, indexed, candidates, index, windows) for session in sessions)
+    plans = (plan for plan in plans if plan is not None)
+    # Archives can't be seeked, so their scan applies the time window itself.
+    bounds = (since, until) if windows is not None else None
 
-def search_logs(pattern: str, repo_path: Path, recent: int = 5) -> list[dict]:
-    """Search within recent session logs."""
-    sessions = list_sessions(repo_path, recent=recent)
-    regex = re.compile(pattern, re.IGNORECASE)
-    results = []
+    if jobs <= 1:
+        for session, resume, spans, tasks, cache in plans:
+            outputs = [_scan_spans(session["path"], pattern, task, bounds) for task in tasks]
+            result = _finish_search(session, resume, spans, outputs, pattern, cache, index)
+            if result is not None:
+                yield result
+        return
 
+    own_pool = _process_pool(jobs) if pool is None else None
+    pool = pool or own_pool
+    try:
+        # Submit every task up front, then hand results back in session order.
+        pending = deque(
+            (plan, [pool.submit(_scan_spans, plan[0]["path"], pattern, task, bounds) for task in plan[3]])
+            for plan in plans
+        )
+        while pending:
+            (session, resume, spans, _, cache), futures = pending.popleft()
+            outputs = [future.result() for future in futures]
+            result = _finish_search(session, resume, spans, outputs, pattern, cache, index)
+            if result is not None:
+                yield result
+    finally:
+        if own_pool is not None:
+            own_pool.shutdown(cancel_futures=True)
+
+
+def _time_windows(
+    sessions: list[dict], since: str | None, until: str | None, index: LogIndex
+) -> tuple[list[dict], dict[str, tuple[int, int, int]]]:
+    """Drop sessions last written before ``since`` and find each remaining log's (start, lines, end) window."""
+    kept, windows = [], {}
     for session in sessions:
-        path = Path(session["path"])
-        matches = []
-        try:
-            with open(path) as f:
-                for i, line in enumerate(f, 1):
-                    if regex.search(line):
-                        matches.append({"line": i, "preview": line.strip()[:200]})
-        except Exception:
+        if since is not None and format_timestamp(datetime.fromisoformat(session["modified"]).astimezone()) < since:
             continue
+        if not is_compressed(session["path"]):
+            try:
+                windows[session["path"]] = index.times.window(session["path"], since, until)
+            except OSError:
+                continue
+        kept.append(session)
+    return kept, windows
 
-        if matches:
-            results.append({
-                "session_id": session["session_id"],
-                "path": session["path"],
-                "match_count": len(matches),
-                "matches": matches[:5],  # First 5 matches
-            })
 
-    return results
+def _clip_spans(
+    spans: list[tuple[int, int, int]], window: tuple[int, int, int]
+) -> list[tuple[int, int, int]]:
+    """Restrict (start, end, first_line) spans to a (start, lines before start, end) time window."""
+    low, low_lines, high = window
+    clipped = []
+    for start, end, first_line in spans:
+        if (end >= 0 and end <= low) or (high >= 0 and start >= high):
+            continue
+        if start < low:
+            start, first_line = low, low_lines + 1
+        if high >= 0 and (end < 0 or end > high):
+            end = high
+        clipped.append((start, end, first_line))
+    return clipped
+
+
+def _plan_search(
+    session: dict,
+    pattern: str,
+    query: str | None,
+    indexed: dict[str, tuple[int, int]],
+    candidates: dict[str, list[tuple[int, int, int]]],
+    index: LogIndex,
+    windows: dict[str, tuple[int, int, int]] | None = None,
+) -> tuple[dict, tuple | None, list[tuple[int, int, int | None]], list[list[tuple[int, int]]], bool] | None:
+    """Pick the spans to scan for one session and group them into scan tasks of ~_SCAN_CHUNK_BYTES.
+
+    The last element of the plan says whether the result covers the whole
+    file and so can be stored in the search cache.
+    """
+    path = session["path"]
+    compressed = is_compressed(path)
+    full_scan = query is None or compressed
+    resume = None
+    try:
+        if full_scan and windows is None:
+            resume = _resume_search(path, pattern, index)
+            offset, lines = (resume[0], resume[1]) if resume else (0, 0)
+            spans = [(offset, -1, lines + 1)]
+        elif full_scan:
+            spans = [(0, -1, 1)]
+        elif path in indexed:
+            offset, lines = indexed[path]
+            spans = [*candidates[path], (offset, -1, lines + 1)]
+        else:
+            return None
+        if windows is not None and not compressed:
+            spans = _clip_spans(spans, windows[path])
+            if not spans:
+                return None
+        if not compressed:
+            spans = _split_spans(path, spans)
+    except OSError:
+        return None
+
+    tasks = []
+    group: list[tuple[int, int]] = []
+    group_bytes = 0
+    for start, end, _ in spans:
+        if group and (end < 0 or group_bytes + end - start > _SCAN_CHUNK_BYTES):
+            tasks.append(group)
+            group, group_bytes = [], 0
+        group.append((start, end))
+        group_bytes += end - start
+    tasks.append(group)
+    return session, resume, spans, tasks, full_scan and windows is None
+
+
+def _finish_search(
+    session: dict,
+    resume: tuple | None,
+    spans: list[tuple[int, int, int | None]],
+    outputs: list,
+    pattern: str,
+    cache: bool,
+    index: LogIndex,
+) -> dict | None:
+    """Merge per-span scan results into one session's search result (``cache`` stores full scans)."""
+    span_results = []
+    for output in outputs:
+        if output is None:
+            return None
+        span_results.extend(output)
+    if len(span_results) != len(spans):
+        return None
+
+    offset, lines, match_count, matches = resume or (0, 0, 0, [])
+    matches = list(matches)
+    partial_hit = None
+    next_line = lines + 1
+    for (start, _, first_line), (span_lines, nbytes, count, span_matches, partial) in zip(spans, span_results):
+        base = first_line if first_line is not None else next_line
+        match_count += count
+        for line_in_span, preview in span_matches:
+            if len(matches) < _MAX_PREVIEW_MATCHES:
+                matches.append({"line": base + line_in_span - 1, "preview": preview})
+        next_line = base + span_lines
+        offset = start + nbytes
+        if partial is not None and partial[0]:
+            partial_hit = {"line": next_line, "preview": partial[1]}
+
+    if cache and (resume is None or offset != resume[0]):
+        # Cache the full scan up to the last complete line.
+        try:
+            with open(session["path"], "rb") as f:
+                tail_hash = _tail_hash(f, offset)
+        except OSError:
+            return None
+        index.store_search(pattern, session["path"], offset, next_line - 1, tail_hash, match_count, matches)
+
+    if partial_hit is not None:
+        # Partially written last line: report it, but don't cache past it.
+        match_count += 1
+        if len(matches) < _MAX_PREVIEW_MATCHES:
+            matches.append(partial_hit)
+
+    if not match_count:
+        return None
+    return {
+        "session_id": session["session_id"],
+        "path": session["path"],
+        "match_count": match_count,
+        "matches": matches,  # First 5 matches
+    }
+
+
+# -----------------------------------------------------------------------------
+# All repos
+# -----------------------------------------------------------------------------
+
+
+def _fan_out(dirs: list[Path], scan: Callable[[Path], list[dict]]) -> Iterator[tuple[Path, list[dict]]]:
+    """Run ``scan`` over directories on a thread pool, yielding (dir, results) as each finishes."""
+    if not dirs:
+        return
+    pool = ThreadPoolExecutor(max_workers=min(_REPO_THREADS, len(dirs)))
+    try:
+        futures = {pool.submit(scan, d): d for d in dirs}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _with_index(fn: Callable[..., Iterable[dict]]) -> Callable[..., list[dict]]:
+    """Give each call its own LogIndex, since sqlite connections can't be shared across threads."""
+
+    def wrapper(*args, **kwargs):
+        index = LogIndex()
+        try:
+            return list(fn(*args, index=index, **kwargs))
+        finally:
+            index.close()
+
+    return wrapper
+
+
+def list_all_sessions(recent: int = 10, after: str | None = None) -> list[dict]:
+    """List recent session logs across every repo."""
+    scan = _with_index(_list_sessions_in)
+    sessions = []
+    for logs_dir, found in _fan_out(list_project_dirs(), lambda d: scan(d, 0, after)):
+        sessions.extend({"repo": logs_dir.name, **session} for session in found)
+    sessions.sort(key=lambda x: x["modified"], reverse=True)
+    return sessions[:recent] if recent else sessions
+
+
+def search_all_logs(
+    pattern: str, recent: int = 5, jobs: int = 1, since: str | None = None, until: str | None = None
+) -> Iterator[dict]:
+    """Search the recent session logs of every repo, yielding matches as each repo finishes."""
+    re.compile(pattern, re.IGNORECASE)  # Fail fast on invalid patterns
+    pool = _process_pool(jobs) if jobs > 1 else None
+    scan = _with_index(_iter_search_in)
+    try:
+        for logs_dir, found in _fan_out(
+            list_project_dirs(), lambda d: scan(pattern, d, recent, jobs=jobs, pool=pool, since=since, until=until)
+        ):
+            for result in found:
+                yield {"repo": logs_dir.name, **result}
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def archive_all_logs(
+    older_than: str, fmt: str = "gz", level: int | None = None, dry_run: bool = False
+) -> Iterator[dict]:
+    """Archive old session logs of every repo, one directory at a time (compression is CPU-bound)."""
+    index = LogIndex()
+    try:
+        for logs_dir in list_project_dirs():
+            for result in _archive_logs_in(logs_dir, older_than, fmt, level, dry_run, index):
+                yield {"repo": logs_dir.name, **result}
+    finally:
+        index.close()
+
+
+def find_all_issue_logs(issue_id: str) -> Iterator[dict]:
+    """Find logs for an issue in the run metadata of every repo, yielding runs as they are found."""
+    scan = _with_index(_iter_issue_logs_in)
+    for runs_dir, found in _fan_out(list_run_dirs(), lambda d: scan(issue_id, d)):
+        for result in found:
+            yield {"repo": runs_dir.name, **result}
+
+
+# -----------------------------------------------------------------------------
+# CLI
+# -----------------------------------------------------------------------------
+
+
+def _print_ndjson(items: Iterable) -> None:
+    """Print one compact JSON object per line, flushing each so consumers see it immediately."""
+    for item in items:
+        print(json.dumps(item), flush=True)
 
 
 def main():
@@ -180,11 +1087,13 @@ def main():
     # Common parent for --repo
     repo_parent = argparse.ArgumentParser(add_help=False)
     repo_parent.add_argument("--repo", type=Path, default=Path.cwd(), help="Repository path")
+    repo_parent.add_argument("--ndjson", action="store_true", help="Stream one JSON object per line")
 
     # sessions
     p = subparsers.add_parser("sessions", parents=[repo_parent], help="List session logs")
     p.add_argument("--recent", type=int, default=10, help="Number of recent sessions")
     p.add_argument("--after", type=str, help="Only sessions after this ISO date")
+    p.add_argument("--all-repos", action="store_true", help="List sessions across every repo")
 
     # runs
     p = subparsers.add_parser("runs", parents=[repo_parent], help="List mala run metadata")
@@ -197,26 +1106,75 @@ def main():
     # issue
     p = subparsers.add_parser("issue", parents=[repo_parent], help="Find logs for issue")
     p.add_argument("issue_id", help="Issue ID (e.g., mala-51q.1)")
+    p.add_argument("--all-repos", action="store_true", help="Search run metadata of every repo")
 
     # search
     p = subparsers.add_parser("search", parents=[repo_parent], help="Search in logs")
     p.add_argument("pattern", help="Regex pattern")
-    p.add_argument("--recent", type=int, default=5, help="Search in N recent sessions")
+    p.add_argument("--recent", type=int, default=5, help="Search in N recent sessions (0 = all)")
+    p.add_argument("--jobs", type=parse_jobs_arg, default=1, help="Worker processes for scanning (0 = all cores)")
+    p.add_argument("--all-repos", action="store_true", help="Search N recent sessions of every repo")
+    p.add_argument("--since", type=parse_time_arg, help="Only lines logged at/after this time (ISO or 10m/2h/1d)")
+    p.add_argument("--until", type=parse_time_arg, help="Only lines logged at/before this time")
+
+    # archive
+    p = subparsers.add_parser("archive", parents=[repo_parent], help="Compress old session logs")
+    p.add_argument(
+        "--older-than", type=parse_time_arg, required=True, help="Logs last written before this (ISO or 30d)"
+    )
+    p.add_argument("--format", choices=("gz", "zst"), default="gz", help="Compression format (zst needs zstandard)")
+    p.add_argument("--level", type=int, help="Compression level (default: gzip 6, zstd 3)")
+    p.add_argument("--dry-run", action="store_true", help="Only list the logs that would be compressed")
+    p.add_argument("--all-repos", action="store_true", help="Archive logs of every repo")
 
     args = parser.parse_args()
 
     if args.command == "sessions":
-        result = list_sessions(args.repo, args.recent, getattr(args, "after", None))
+        if args.all_repos:
+            result = list_all_sessions(args.recent, args.after)
+        else:
+            result = list_sessions(args.repo, args.recent, getattr(args, "after", None))
     elif args.command == "runs":
         result = list_runs(args.repo, args.recent)
     elif args.command == "session":
         result = find_session(args.session_id, args.repo)
     elif args.command == "issue":
-        result = find_issue_logs(args.issue_id, args.repo)
+        if args.all_repos:
+            result = find_all_issue_logs(args.issue_id)
+        elif args.ndjson:
+            result = iter_issue_logs(args.issue_id, args.repo)
+        else:
+            result = find_issue_logs(args.issue_id, args.repo)
     elif args.command == "search":
-        result = search_logs(args.pattern, args.repo, args.recent)
+        if args.all_repos:
+            result = search_all_logs(args.pattern, args.recent, args.jobs, args.since, args.until)
+        else:
+            search = iter_search_logs if args.ndjson else search_logs
+            result = search(args.pattern, args.repo, args.recent, jobs=args.jobs, since=args.since, until=args.until)
+
+    elif args.command == "archive":
+        if args.format == "zst":
+            try:
+                require_zstandard()
+            except OSError as e:
+                print(e, file=sys.stderr)
+                sys.exit(1)
+        if args.all_repos:
+            result = archive_all_logs(args.older_than, args.format, args.level, args.dry_run)
+        else:
+            result = archive_logs(args.repo, args.older_than, args.format, args.level, args.dry_run)
 
-    print(json.dumps(result, indent=2))
+    try:
+        if args.ndjson:
+            _print_ndjson([result] if isinstance(result, dict) or result is None else result)
+        elif isinstance(result, GeneratorType):
+            print_json_array(result)
+        else:
+            print(json.dumps(result, indent=2))
+    except BrokenPipeError:
+        # The consumer (e.g. `head`) stopped reading; exit quietly without a traceback.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(0)
 
 
 if __name__ == "__main__":
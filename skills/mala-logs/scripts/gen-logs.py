@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""Generate synthetic Claude session logs and mala run metadata for benchmarks.
+
+Writes the same layout the real tools read (see references/log-schema.md):
+  OUT/claude/projects/{encoded-repo}/{session_id}.jsonl
+  OUT/mala-runs/{encoded-repo}/{timestamp}_{run_id}.json
+so pointing CLAUDE_CONFIG_DIR and MALA_RUNS_DIR at them makes find-logs.py and
+parse-session.py treat OUT as a real environment.
+
+Usage:
+  gen-logs.py OUT [--repo PATH] [--sessions N] [--size SIZE] [--runs N]
+              [--tool-mix NAME=WEIGHT,...] [--error-rate R] [--payload-bytes N] [--seed N]
+
+Examples:
+  gen-logs.py /tmp/bench --size 100MB --sessions 10 --runs 3
+  gen-logs.py /tmp/bench --size 1GB --sessions 20 --tool-mix Bash=8,Read=2 --error-rate 0.1
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from mala_logs_lib import format_timestamp
+
+# Stdlib only
+
+# Bumped whenever the generated logs change, so bench.py regenerates its cached data.
+GENERATOR_VERSION = 2
+DEFAULT_TOOL_MIX = "Bash=6,Read=4,Edit=3,Grep=2,Glob=1,Write=1"
+_SIZE = re.compile(r"^(\d+(?:\.\d+)?)\s*([KMG]?B?)$", re.IGNORECASE)
+_UNITS = {"": 1, "B": 1, "K": 1 << 10, "KB": 1 << 10, "M": 1 << 20, "MB": 1 << 20, "G": 1 << 30, "GB": 1 << 30}
+_ERRORS = (
+    "Exit code 1\nFAILED {test} - AssertionError: expected {digit}",
+    "Exit code 1\nModuleNotFoundError: No module named 'module_{n}'",
+    "Exit code 1\n{path}:{n}:5: F401 imported but unused\nFound {n} errors.",
+    "Exit code 124\nCommand timed out after {n}000ms",
+    "<tool_use_error>File has not been read yet. Read it first before writing to it.</tool_use_error>",
+    "<tool_use_error>String to replace not found in file.</tool_use_error>",
+    "File does not exist: {path}",
+)
+_WORDS = (
+    "the test suite fails because fixture config path module import error value check run build "
+    "cache index session parse log tool result assert expected actual retry timeout worker queue"
+).split()
+
+
+def parse_size(value: str) -> int:
+    """Byte count for ``512KB`` / ``100MB`` / ``1GB`` / a plain number."""
+    match = _SIZE.match(value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size {value!r} (use e.g. 512KB, 100MB, 1GB)")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def parse_tool_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        try:
+            mix[name.strip()] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid tool weight {item!r} (use NAME=WEIGHT)") from None
+    if not mix or not any(mix.values()):
+        raise argparse.ArgumentTypeError("tool mix needs at least one positive weight")
+    return mix
+
+
+def encode_repo_path(repo_path: Path) -> str:
+    """Same encoding as find-logs.py (``/home/u/repo`` -> ``-home-u-repo``)."""
+    return "-" + "-".join(repo_path.resolve().parts[1:])
+
+
+class SessionWriter:
+    """Writes one session as a chain of prompt -> (assistant response -> tool results)* turns.
+
+    Entries look like Claude Code's: a response is split into one assistant
+    entry per content block sharing a message id and usage, tool results come
+    back as user entries with ``toolUseResult``, and every entry is threaded
+    through ``uuid`` / ``parentUuid``.
+    """
+
+    def __init__(self, out, rng: random.Random, session_id: str, repo: Path, start: datetime, args):
+        self.out = out
+        self.rng = rng
+        self.session_id = session_id
+        self.repo = str(repo)
+        self.now = start
+        self.args = args
+        self.parent: str | None = None
+        self.names = list(args.tool_mix)
+        self.weights = list(args.tool_mix.values())
+        self.prompt_tokens = 4000
+        self.written = 0
+        self.calls = 0
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _text(self, nbytes: int) -> str:
+        words = []
+        size = 0
+        while size < nbytes:
+            word = self.rng.choice(_WORDS)
+            words.append(word)
+            size += len(word) + 1
+        return " ".join(words)
+
+    def _payload_size(self) -> int:
+        return max(1, int(self.rng.expovariate(1 / self.args.payload_bytes)))
+
+    def _write(self, entry: dict, sidechain: bool = False) -> None:
+        self.now += timedelta(milliseconds=self.rng.randint(5, 400))
+        node = self._uuid()
+        line = {
+            "parentUuid": self.parent,
+            "isSidechain": sidechain,
+            "userType": "external",
+            "cwd": self.repo,
+            "sessionId": self.session_id,
+            "version": "2.0.72",
+            "gitBranch": "main",
+            **entry,
+            "uuid": node,
+            "timestamp": format_timestamp(self.now),
+        }
+        data = json.dumps(line, separators=(",", ":"), ensure_ascii=False) + "\n"
+        self.out.write(data)
+        self.written += len(data.encode())
+        self.parent = node
+
+    def meta(self, operation: str) -> None:
+        data = json.dumps(
+            {"type": "queue-operation", "operation": operation, "timestamp": format_timestamp(self.now),
+             "sessionId": self.session_id},
+            separators=(",", ":"),
+        ) + "\n"
+        self.out.write(data)
+        self.written += len(data)
+
+    def prompt(self) -> None:
+        content = f"Fix issue {self.rng.randint(1, 999)}: " + self._text(self.rng.randint(80, 600))
+        self._write({"type": "user", "message": {"role": "user", "content": content}})
+
+    def _tool_input(self, name: str, call: int) -> dict:
+        path = f"{self.repo}/src/module_{self.rng.randint(1, 200)}.py"
+        if name == "Bash":
+            command = self.rng.choice(["uv run pytest -x -q", "ruff check .", "git status", "uv run pytest -k test_"])
+            return {"command": f"{command}{call}", "description": "Run checks"}
+        if name in ("Read", "Glob"):
+            return {"file_path": path} if name == "Read" else {"pattern": "**/*.py"}
+        if name == "Grep":
+            return {"pattern": self.rng.choice(_WORDS), "path": self.repo}
+        if name in ("Edit", "Write"):
+            body = self._text(self._payload_size() // 4)
+            if name == "Write":
+                return {"file_path": path, "content": body}
+            return {"file_path": path, "old_string": self._text(40), "new_string": body}
+        return {"arg": self._text(60)}
+
+    def _tool_output(self, name: str, error: bool) -> str:
+        if not error:
+            return self._text(self._payload_size())
+        # A few recurring failure modes with varying paths and numbers, padded by a traceback.
+        path = f"{self.repo}/src/module_{self.rng.randint(1, 200)}.py"
+        n = self.rng.randint(1, 900)
+        head = self.rng.choice(_ERRORS).format(
+            path=path, n=n, test=f"tests/test_{self.rng.choice(_WORDS)}.py::test_{n}", digit=n % 10
+        )
+        frame = f'  File "{path}", line {n}, in run\n'
+        return head + "\nTraceback (most recent call last):\n" + frame * (self._payload_size() // len(frame) + 1)
+
+    def response(self, sidechain: bool = False) -> None:
+        """One model call: thinking/text blocks and 1-3 tool uses, then their results."""
+        self.calls += 1
+        message_id = f"msg_{self.rng.getrandbits(96):024x}"
+        self.prompt_tokens += self.rng.randint(200, 3000)
+        cache_write = self.rng.choice([0, 0, 1024, 2048, 4096])
+        usage = {
+            "input_tokens": self.rng.randint(1, 2000),
+            "cache_creation_input_tokens": cache_write,
+            "cache_read_input_tokens": max(0, self.prompt_tokens - cache_write),
+            "output_tokens": self.rng.randint(20, 1500),
+            "service_tier": "standard",
+        }
+        base = {"type": "assistant", "requestId": f"req_{self.rng.getrandbits(96):024x}"}
+
+        def block(content: dict) -> None:
+            message = {"id": message_id, "type": "message", "role": "assistant", "model": "claude-sonnet",
+                       "content": [content], "stop_reason": "tool_use", "usage": usage}
+            self._write({**base, "message": message}, sidechain)
+
+        if self.rng.random() < 0.5:
+            block({"type": "thinking", "thinking": self._text(self.rng.randint(100, 1500)), "signature": "sig"})
+        if self.rng.random() < 0.4:
+            block({"type": "text", "text": self._text(self.rng.randint(40, 400))})
+        tools = []
+        for _ in range(self.rng.choice([1, 1, 1, 2, 3])):
+            name = self.rng.choices(self.names, self.weights)[0]
+            tool_id = f"toolu_{self.rng.getrandbits(96):024x}"
+            tools.append((tool_id, name))
+            block({"type": "tool_use", "id": tool_id, "name": name, "input": self._tool_input(name, self.calls)})
+        for tool_id, name in tools:
+            self.now += timedelta(milliseconds=int(self.rng.lognormvariate(6, 1.2)))
+            error = self.rng.random() < self.args.error_rate
+            output = self._tool_output(name, error)
+            result = {"type": "tool_result", "tool_use_id": tool_id, "content": output, "is_error": error}
+            self._write(
+                {
+                    "type": "user",
+                    "message": {"role": "user", "content": [result]},
+                    "toolUseResult": {"stdout": "" if error else output, "stderr": output if error else "",
+                                      "interrupted": False, "isImage": False},
+                },
+                sidechain,
+            )
+
+
+def generate_session(path: Path, target_bytes: int, rng: random.Random, repo: Path, start: datetime, args) -> dict:
+    """Write a session of roughly ``target_bytes`` to ``path``; returns its run-metadata issue record."""
+    session_id = path.stem
+    with open(path, "w", encoding="utf-8") as out:
+        writer = SessionWriter(out, rng, session_id, repo, start, args)
+        writer.meta("enqueue")
+        writer.meta("dequeue")
+        writer.prompt()
+        while writer.written < target_bytes:
+            if rng.random() < 0.01:
+                # A subagent: a short sidechain hanging off the current entry.
+                fork = writer.parent
+                for _ in range(rng.randint(2, 6)):
+                    writer.response(sidechain=True)
+                writer.parent = fork
+            writer.response()
+            if rng.random() < 0.02:
+                writer.prompt()
+    failed = rng.random() < args.error_rate * 2
+    return {
+        "session_id": session_id,
+        "log_path": str(path),
+        "status": "failed" if failed else "success",
+        "duration_seconds": round((writer.now - start).total_seconds(), 1),
+        "started": start,
+        "ended": writer.now,
+    }
+
+
+def write_runs(runs_dir: Path, sessions: list[dict], runs: int, repo: Path, rng: random.Random) -> list[str]:
+    """Spread the sessions over ``runs`` mala run files, one issue per session."""
+    runs_dir.mkdir(parents=True, exist_ok=True)
+    issue_ids = []
+    for r in range(runs):
+        batch = sessions[r::runs]
+        if not batch:
+            continue
+        run_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        started = min(s["started"] for s in batch)
+        issues = {}
+        for s in batch:
+            issue_id = f"bench-{len(issue_ids) + 1}"
+            issue_ids.append(issue_id)
+            passed = s["status"] == "success"
+            issues[issue_id] = {
+                "issue_id": issue_id,
+                "agent_id": f"{issue_id}-{rng.getrandbits(32):08x}",
+                "status": s["status"],
+                "duration_seconds": s["duration_seconds"],
+                "session_id": s["session_id"],
+                "log_path": s["log_path"],
+                "error": None if passed else "quality gate failed",
+                "gate_attempts": rng.randint(1, 3),
+                "review_attempts": rng.randint(0, 2),
+                "quality_gate": {"passed": passed, "evidence": {"pytest_ran": True}, "failure_reasons": []},
+                "resolution": None,
+            }
+        data = {
+            "run_id": run_id,
+            "started_at": started.isoformat(),
+            "completed_at": max(s["ended"] for s in batch).isoformat(),
+            "version": "0.1.0",
+            "repo_path": str(repo),
+            "config": {"max_agents": 2, "max_gate_retries": 3, "max_review_retries": 5},
+            "issues": issues,
+        }
+        name = f"{started.strftime('%Y-%m-%dT%H-%M-%S')}_{run_id}.json"
+        (runs_dir / name).write_text(json.dumps(data, indent=2))
+    return issue_ids
+
+
+def generate(out: Path, args) -> dict:
+    """Generate the whole environment under ``out``; returns what was written and the env to use it."""
+    rng = random.Random(args.seed)
+    encoded = encode_repo_path(args.repo)
+    logs_dir = out / "claude" / "projects" / encoded
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    per_session = max(1, args.size // args.sessions)
+    start = datetime(2025, 12, 28, 7, 0, tzinfo=timezone.utc)
+    sessions = []
+    for i in range(args.sessions):
+        session_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        sessions.append(generate_session(logs_dir / f"{session_id}.jsonl", per_session, rng, args.repo, start, args))
+        start = sessions[-1]["ended"] + timedelta(minutes=rng.randint(1, 30))
+    issue_ids = write_runs(out / "mala-runs" / encoded, sessions, args.runs, args.repo, rng)
+    return {
+        "repo": str(args.repo),
+        "sessions": len(sessions),
+        "bytes": sum(Path(s["log_path"]).stat().st_size for s in sessions),
+        "issues": issue_ids,
+        "env": {"CLAUDE_CONFIG_DIR": str(out / "claude"), "MALA_RUNS_DIR": str(out / "mala-runs")},
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate synthetic mala/claude logs")
+    parser.add_argument("out", type=Path, help="Output directory")
+    parser.add_argument("--repo", type=Path, default=Path("/tmp/mala-bench-repo"), help="Repository path to encode")
+    parser.add_argument("--sessions", type=int, default=4, help="Number of session logs")
+    parser.add_argument("--size", type=parse_size, default=parse_size("1MB"), help="Total log size (e.g. 100MB, 1GB)")
+    parser.add_argument("--runs", type=int, default=2, help="Mala run metadata files (issues spread across them)")
+    parser.add_argument("--tool-mix", type=parse_tool_mix, default=parse_tool_mix(DEFAULT_TOOL_MIX),
+                        help=f"Relative tool weights (default {DEFAULT_TOOL_MIX})")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of tool results that are errors")
+    parser.add_argument("--payload-bytes", type=int, default=1500, help="Mean tool output / edit payload size")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed, same logs)")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    if args.sessions < 1 or args.payload_bytes < 1 or not 0 <= args.error_rate <= 1:
+        print("--sessions and --payload-bytes must be positive and --error-rate within [0, 1]", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(generate(args.out, args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
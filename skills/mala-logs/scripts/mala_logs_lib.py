@@ -0,0 +1,545 @@
+"""Helpers shared by find-logs.py and parse-session.py.
+
+Both scripts put their on-disk indexes in the same SQLite file; this module
+owns its location, the timestamp index used to seek into session logs,
+transparent reading of compressed (``.jsonl.gz`` / ``.jsonl.zst``) logs, and
+find-logs' search scanner (importable here by its ``--jobs`` pool workers).
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import functools
+import gzip
+import hashlib
+import io
+import json
+import mmap
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse  # type: ignore
+
+
+# Stdlib only; zstandard is imported lazily for .zst logs
+
+# A (byte offset, timestamp) checkpoint is recorded every this many log lines.
+TIME_INDEX_STRIDE = 256
+# Bytes hashed just before an indexed offset to detect rewritten (non-appended) logs.
+TAIL_CHECK_BYTES = 4096
+
+# Session logs have lines of 100KB+; a large buffer makes line iteration ~3x faster than the 8KB default.
+_READ_BUFFER = 1024 * 1024
+# Session log file suffixes, plain first; archived logs keep their session id.
+LOG_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+COMPRESSED_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+
+# Matches kept per session in search output (and in find-logs' search cache).
+MAX_PREVIEW_MATCHES = 5
+# Byte span handed to one scan task; large logs are split into several on line boundaries.
+SCAN_CHUNK_BYTES = 8 * 1024 * 1024
+
+_RELATIVE_TIME = re.compile(r"^(\d+(?:\.\d+)?)([smhd])$")
+_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+def get_mala_runs_dir() -> Path:
+    return Path(os.environ.get("MALA_RUNS_DIR", str(Path.home() / ".config/mala/runs")))
+
+
+def get_index_path() -> Path:
+    """SQLite index shared by all mala-logs invocations (``:memory:`` disables persistence)."""
+    return Path(os.environ.get("MALA_LOG_INDEX", str(get_mala_runs_dir() / ".find-logs-index.sqlite")))
+
+
+def connect_index(path: Path | None = None) -> sqlite3.Connection:
+    """Open the shared index, falling back to a throwaway in-memory one if it is unusable."""
+    path = path or get_index_path()
+    try:
+        if str(path) != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+    except (OSError, sqlite3.Error):
+        return sqlite3.connect(":memory:")
+
+
+def session_id_of(name: str) -> str | None:
+    """Session id for a log file name, or None if it isn't a session log."""
+    for suffix in LOG_SUFFIXES:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return None
+
+
+def is_compressed(path: str | Path) -> bool:
+    return str(path).endswith((".gz", ".zst"))
+
+
+def require_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise OSError("zstandard not installed. Run: pip install zstandard") from None
+    return zstandard
+
+
+class _ZstdReader(io.RawIOBase):
+    """Streaming zstd decompression that reports corrupt data as OSError, like gzip does."""
+
+    def __init__(self, fh):
+        zstandard = require_zstandard()
+        self._error = zstandard.ZstdError
+        self._fh = fh
+        self._reader = zstandard.ZstdDecompressor().stream_reader(fh, read_across_frames=True)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        try:
+            return self._reader.readinto(buffer)
+        except self._error as e:
+            raise OSError(f"corrupt zstd data: {e}") from e
+
+    def close(self) -> None:
+        if not self.closed:
+            self._reader.close()
+            self._fh.close()
+        super().close()
+
+
+def open_log(path: str | Path):
+    """Open a session log for binary line iteration, decompressing ``.gz`` / ``.zst`` on the fly.
+
+    Compressed logs can only be read forwards; decompression errors surface as
+    OSError (or EOFError for a truncated gzip stream).
+    """
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        return io.BufferedReader(_ZstdReader(open(path, "rb")), buffer_size=_READ_BUFFER)
+    return open(path, "rb", buffering=_READ_BUFFER)
+
+
+def compress_log(src: str | Path, dest: str | Path, fmt: str = "gz", level: int | None = None) -> tuple[int, int]:
+    """Stream ``src`` into a ``gz`` or ``zst`` file at ``dest``; returns (uncompressed bytes, lines)."""
+    if fmt == "zst":
+        zstandard = require_zstandard()
+        out = zstandard.ZstdCompressor(level=3 if level is None else level).stream_writer(open(dest, "wb"))
+    else:
+        out = gzip.open(dest, "wb", compresslevel=6 if level is None else level)
+    size = lines = 0
+    last = b"\n"
+    with open(src, "rb") as f, out:
+        while chunk := f.read(1024 * 1024):
+            out.write(chunk)
+            size += len(chunk)
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    return size, lines + (last != b"\n")
+
+
+def tail_hash(fh, offset: int) -> str:
+    """Hash the bytes just before ``offset`` so a resumed scan can tell appends from rewrites."""
+    start = max(0, offset - TAIL_CHECK_BYTES)
+    fh.seek(start)
+    return hashlib.sha1(fh.read(offset - start)).hexdigest()
+
+
+def parse_jobs_arg(value: str) -> int:
+    """A --jobs value: a worker process count, with 0 meaning one per core."""
+    jobs = int(value)
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"must be non-negative: {value}")
+    return jobs or os.cpu_count() or 1
+
+
+def parse_time_arg(value: str) -> str:
+    """Normalize a --since/--until value to the log timestamp format (UTC, ms, ``Z``).
+
+    Accepts ISO 8601 (naive values are taken as UTC, like the logs) or a
+    relative age such as ``10m``, ``2h`` or ``1d``.
+    """
+    match = _RELATIVE_TIME.match(value.strip())
+    if match:
+        moment = datetime.now(timezone.utc) - timedelta(**{_UNITS[match.group(2)]: float(match.group(1))})
+    else:
+        try:
+            moment = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid time {value!r} (use ISO 8601 or an age like 10m, 2h, 1d)")
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+    return format_timestamp(moment)
+
+
+def print_json_array(items: Iterable) -> None:
+    """Print items as a JSON array, formatted like ``json.dumps(indent=2)``, as they are produced."""
+    first = True
+    for item in items:
+        body = json.dumps(item, indent=2).replace("\n", "\n  ")
+        print(("[\n  " if first else ",\n  ") + body, end="", flush=True)
+        first = False
+    print("[]" if first else "\n]")
+
+
+def format_timestamp(moment: datetime) -> str:
+    """Render an aware datetime like the logs' ``timestamp`` fields, so strings compare in time order."""
+    moment = moment.astimezone(timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+def line_timestamp(raw: bytes) -> str | None:
+    """Top-level ``timestamp`` of one JSONL line, if it has one."""
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    timestamp = data.get("timestamp") if isinstance(data, dict) else None
+    return timestamp if isinstance(timestamp, str) else None
+
+
+class TimeIndex:
+    """Sparse (line -> byte offset, timestamp) checkpoints for session logs.
+
+    Entries are roughly in timestamp order, so a --since/--until window can be
+    located by binary search over the checkpoints plus a scan of at most a
+    couple of strides, instead of reading the log from the first byte.
+    Checkpoints are appended incrementally as logs grow.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS time_files_v1 (
+            path TEXT PRIMARY KEY,
+            offset INTEGER NOT NULL,
+            lines INTEGER NOT NULL,
+            next_checkpoint INTEGER NOT NULL,
+            tail_hash TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS time_checkpoints_v1 (
+            path TEXT NOT NULL,
+            line INTEGER NOT NULL,
+            offset INTEGER NOT NULL,
+            timestamp TEXT NOT NULL,
+            PRIMARY KEY (path, line)
+        );
+    """
+
+    def __init__(self, conn: sqlite3.Connection | None = None):
+        self.conn = conn or connect_index()
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def forget(self, path: str) -> None:
+        """Drop the checkpoints of a deleted log (inside the caller's transaction)."""
+        self.conn.execute("DELETE FROM time_files_v1 WHERE path = ?", (path,))
+        self.conn.execute("DELETE FROM time_checkpoints_v1 WHERE path = ?", (path,))
+
+    def update(self, path: str) -> list[tuple[int, int, str]]:
+        """Index newly appended lines of ``path``; returns its (line, offset, timestamp) checkpoints."""
+        row = self.conn.execute(
+            "SELECT offset, lines, next_checkpoint, tail_hash FROM time_files_v1 WHERE path = ?", (path,)
+        ).fetchone()
+        with open(path, "rb") as f:
+            if row is not None:
+                offset, lines, next_checkpoint, stored_hash = row
+                size = f.seek(0, os.SEEK_END)
+                if size < offset or tail_hash(f, offset) != stored_hash:
+                    row = None
+            if row is None:
+                offset, lines, next_checkpoint = 0, 0, 1
+                with self.conn:
+                    self.conn.execute("DELETE FROM time_checkpoints_v1 WHERE path = ?", (path,))
+
+            f.seek(offset)
+            start_offset = offset
+            checkpoints = []
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                lines += 1
+                if lines >= next_checkpoint:
+                    timestamp = line_timestamp(raw)
+                    if timestamp is not None:
+                        checkpoints.append((path, lines, offset, timestamp))
+                        next_checkpoint = lines + TIME_INDEX_STRIDE
+                offset += len(raw)
+            if offset != start_offset or row is None:
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO time_checkpoints_v1 (path, line, offset, timestamp) "
+                        "VALUES (?, ?, ?, ?)",
+                        checkpoints,
+                    )
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO time_files_v1 (path, offset, lines, next_checkpoint, tail_hash) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (path, offset, lines, next_checkpoint, tail_hash(f, offset)),
+                    )
+
+        return self.conn.execute(
+            "SELECT line, offset, timestamp FROM time_checkpoints_v1 WHERE path = ? ORDER BY line", (path,)
+        ).fetchall()
+
+    def window(self, path: str, since: str | None = None, until: str | None = None) -> tuple[int, int, int]:
+        """Byte range of the entries with ``since <= timestamp <= until``.
+
+        Returns (start offset, lines before start, end offset or -1 for EOF).
+        Both bounds land on line boundaries; lines without a timestamp never
+        end the window early.
+        """
+        checkpoints = self.update(path)
+        timestamps = [timestamp for _, _, timestamp in checkpoints]
+        start, start_line, end = 0, 0, -1
+        with open(path, "rb") as f:
+            if since is not None:
+                # Back off one extra checkpoint to tolerate slightly out-of-order entries.
+                k = bisect.bisect_left(timestamps, since) - 2
+                if k >= 0:
+                    start_line, start = checkpoints[k][0] - 1, checkpoints[k][1]
+                start, start_line = _scan_to(f, start, start_line, lambda ts: ts >= since)
+            if until is not None:
+                k = bisect.bisect_right(timestamps, until) - 2
+                offset, line = start, start_line
+                if k >= 0 and checkpoints[k][1] > start:
+                    line, offset = checkpoints[k][0] - 1, checkpoints[k][1]
+                end, _ = _scan_to(f, offset, line, lambda ts: ts > until)
+                if end == f.seek(0, os.SEEK_END):
+                    end = -1
+        return start, start_line, end
+
+
+def _scan_to(f, offset: int, lines: int, stop) -> tuple[int, int]:
+    """From a line boundary, return (offset, lines before it) of the first line whose timestamp satisfies ``stop``."""
+    f.seek(offset)
+    for raw in f:
+        timestamp = line_timestamp(raw)
+        if timestamp is not None and stop(timestamp):
+            break
+        offset += len(raw)
+        lines += 1
+    return offset, lines
+
+
+# Non-ASCII characters that Python's IGNORECASE folds onto ASCII letters ("İ", "ı", "ſ", Kelvin sign).
+_UNICODE_FOLDS = {"i": "\u0130\u0131", "k": "\u212a", "s": "\u017f"}
+
+
+@functools.lru_cache(maxsize=64)
+def _bytes_regex(pattern: str) -> re.Pattern | None:
+    """Translate ``pattern`` into a bytes regex over ASCII-lowercased UTF-8, if exactly possible.
+
+    Case-insensitive matching is done by lowercasing the scanned bytes rather
+    than with ``re.IGNORECASE``, which keeps CPython's literal-prefix search.
+    Only a subset is translated: ASCII literals and classes, ``.*``/``.+``,
+    groups, alternation and repeats. Anything whose byte-level meaning could
+    differ from the line-by-line ``str`` search (anchors, ``\\w``-style classes,
+    lone ``.``, newlines, flags) returns None and uses the decoding path.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except (re.error, RecursionError):
+        return None
+    if parsed.state.flags & (re.DOTALL | re.MULTILINE | re.LOCALE):
+        return None
+    folds = {} if parsed.state.flags & re.ASCII else _UNICODE_FOLDS
+    translated = _translate_bytes(parsed, folds)
+    if translated is None:
+        return None
+    return re.compile(translated.encode("utf-8"))
+
+
+def _translate_bytes(items, folds: dict[str, str]) -> str | None:
+    out = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            if av >= 128 or av == ord("\n"):
+                return None
+            char = chr(av).lower()
+            extra = folds.get(char, "")
+            out.append(f"(?:{re.escape(char)}|{'|'.join(extra)})" if extra else re.escape(char))
+        elif op is sre_parse.IN:
+            chars: set[str] = set()
+            for item_op, item_av in av:
+                if item_op is sre_parse.LITERAL:
+                    lo = hi = item_av
+                elif item_op is sre_parse.RANGE:
+                    lo, hi = item_av
+                else:
+                    return None
+                if hi >= 128:
+                    return None
+                chars.update(chr(c).lower() for c in range(lo, hi + 1))
+            if "\n" in chars or chars & set(folds):
+                return None
+            out.append("[" + "".join(re.escape(c) for c in sorted(chars)) + "]")
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            low, high, item = av
+            lazy = "?" if op is sre_parse.MIN_REPEAT else ""
+            bound = "{%d,%s}" % (low, "" if high is sre_parse.MAXREPEAT else high)
+            if list(item) == [(sre_parse.ANY, None)]:
+                # ".*" / ".+" match some run of non-newline characters, bytewise or not.
+                if high is not sre_parse.MAXREPEAT or low > 1:
+                    return None
+                out.append("." + bound + lazy)
+                continue
+            inner = _translate_bytes(item, folds)
+            if inner is None:
+                return None
+            out.append(f"(?:{inner}){bound}{lazy}")
+        elif op is sre_parse.SUBPATTERN:
+            if av[1] or av[2]:
+                return None
+            inner = _translate_bytes(av[-1], folds)
+            if inner is None:
+                return None
+            out.append(f"(?:{inner})")
+        elif op is sre_parse.BRANCH:
+            alternatives = [_translate_bytes(branch, folds) for branch in av[1]]
+            if any(alt is None for alt in alternatives):
+                return None
+            out.append("(?:" + "|".join(alternatives) + ")")
+        else:
+            return None
+    return "".join(out)
+
+
+def scan_spans(
+    path: str, pattern: str, spans: list[tuple[int, int]], bounds: tuple[str | None, str | None] | None = None
+) -> list[tuple] | None:
+    """Run ``pattern`` over whole lines of each (start, end) span of ``path``.
+
+    Returns, per span, (complete lines, bytes in complete lines, match count,
+    first matches as (line within span, preview), partial last line as
+    (matched, preview) or None); None if the file can't be read. Also the
+    worker entry point for find-logs' ``--jobs``, so it only takes picklable arguments
+    and lives here, where pool workers can import it.
+
+    Compressed logs are always planned as one whole-file span (or an empty
+    one at EOF when fully cached); ``bounds`` is their (since, until) window.
+    """
+    regex = re.compile(pattern, re.IGNORECASE)
+    bregex = _bytes_regex(pattern)
+    try:
+        if is_compressed(path):
+            return [
+                _scan_compressed(path, regex, bregex, bounds) if start == 0 else (0, 0, 0, [], None)
+                for start, _ in spans
+            ]
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if bregex is not None and size:
+                with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                    return [_scan_buffer(mm, bregex, regex, start, end) for start, end in spans]
+            return [_scan_lines(f, regex, start, end) for start, end in spans]
+    except (OSError, EOFError):
+        return None
+
+
+def _scan_lines(f, regex: re.Pattern, start: int, end: int) -> tuple:
+    """Decode and match one line at a time."""
+    f.seek(start)
+    lines = nbytes = match_count = 0
+    matches = []
+    partial = None
+    for raw in io.BytesIO(f.read(end - start if end >= 0 else -1)):
+        line = raw.decode("utf-8", errors="replace")
+        hit = regex.search(line) is not None
+        if not raw.endswith(b"\n"):
+            partial = (hit, line.strip()[:200])
+            break
+        lines += 1
+        nbytes += len(raw)
+        if hit:
+            match_count += 1
+            if len(matches) < MAX_PREVIEW_MATCHES:
+                matches.append((lines, line.strip()[:200]))
+    return lines, nbytes, match_count, matches, partial
+
+
+def _scan_buffer(mm: mmap.mmap | bytes, bregex: re.Pattern, regex: re.Pattern, start: int, end: int) -> tuple:
+    """Run a bytes regex across a lowercased copy of the mapped (or read) span; only matching lines are decoded."""
+    stop = len(mm) if end < 0 or end > len(mm) else end
+    buf = mm[start:stop].lower()
+    complete = buf.rfind(b"\n") + 1
+    match_count = 0
+    matches = []
+    line_num = counted = pos = 0
+    while True:
+        m = bregex.search(buf, pos, complete)
+        if m is None:
+            break
+        line_start = buf.rfind(b"\n", 0, m.start()) + 1
+        pos = buf.find(b"\n", m.start(), complete) + 1
+        match_count += 1
+        if len(matches) < MAX_PREVIEW_MATCHES:
+            line_num += buf.count(b"\n", counted, line_start)
+            counted = line_start
+            line = mm[start + line_start : start + pos].decode("utf-8", errors="replace")
+            matches.append((line_num + 1, line.strip()[:200]))
+    lines = line_num + buf.count(b"\n", counted, complete)
+
+    partial = None
+    if complete < len(buf):
+        line = mm[start + complete : stop].decode("utf-8", errors="replace")
+        partial = (regex.search(line) is not None, line.strip()[:200])
+    return lines, complete, match_count, matches, partial
+
+
+def _scan_compressed(
+    path: str, regex: re.Pattern, bregex: re.Pattern | None, bounds: tuple[str | None, str | None] | None
+) -> tuple:
+    """Stream-decompress a whole archived log, scanning ~SCAN_CHUNK_BYTES of lines at a time.
+
+    Archives are never appended to, so an unterminated last line counts as a
+    complete line, and the byte count returned is the compressed file size:
+    the search cache then records the archive as fully scanned.
+    """
+    lines = match_count = 0
+    matches: list[tuple[int, str]] = []
+    with open_log(path) as f:
+        if bregex is not None and bounds is None:
+            carry = b""
+            while True:
+                chunk = f.read(SCAN_CHUNK_BYTES)
+                if not chunk and not carry:
+                    break
+                buf = carry + chunk if chunk else carry + b"\n"
+                complete = buf.rfind(b"\n") + 1
+                span_lines, _, count, found, _ = _scan_buffer(buf, bregex, regex, 0, complete)
+                matches.extend((lines + n, preview) for n, preview in found[: MAX_PREVIEW_MATCHES - len(matches)])
+                lines += span_lines
+                match_count += count
+                carry = buf[complete:]
+        else:
+            since, until = bounds or (None, None)
+            inside = since is None
+            for raw in f:
+                if bounds is not None:
+                    timestamp = line_timestamp(raw) if not inside or until is not None else None
+                    if not inside:
+                        if timestamp is None or timestamp < since:
+                            lines += 1
+                            continue
+                        inside = True
+                    if until is not None and timestamp is not None and timestamp > until:
+                        break
+                line = raw.decode("utf-8", errors="replace")
+                lines += 1
+                if regex.search(line):
+                    match_count += 1
+                    if len(matches) < MAX_PREVIEW_MATCHES:
+                        matches.append((lines, line.strip()[:200]))
+    return lines, os.path.getsize(path), match_count, matches, None
@@ -2,26 +2,79 @@
 """Parse and analyze a Claude session log.
 
 Usage:
-  parse-session.py PATH [--summary] [--tools] [--errors] [--text]
+  parse-session.py PATH [--summary] [--tools] [--errors] [--text] [--since TIME] [--until TIME]
   parse-session.py PATH --tools --filter Bash
   parse-session.py PATH --tools --limit 10
+  parse-session.py PATH [--tools | --errors | --text] --ndjson
+  parse-session.py PATH --timings [--filter NAME] [--limit N]
+  parse-session.py PATH --usage [--summary]
+  parse-session.py PATH --tree [--limit N] | --subtree UUID
+  parse-session.py (DIR | GLOB | -) --corpus [--summary] [--jobs N] [--ndjson]
+  parse-session.py PATH [--corpus] --clusters [--limit N]
+  parse-session.py PATH [--corpus] --export DIR [--format parquet|arrow]
+  parse-session.py PATH --follow [--tools | --errors] [--pattern REGEX] [--from-start]
 
 Examples:
   parse-session.py ~/.claude/projects/-home-cyou-mala/abc123.jsonl --summary
   parse-session.py session.jsonl --tools
   parse-session.py session.jsonl --tools --filter Bash --limit 5
   parse-session.py session.jsonl --errors
+  parse-session.py session.jsonl --errors --ndjson | head -3
+  parse-session.py session.jsonl --timings --limit 5
+  parse-session.py ~/.claude/projects --corpus --summary
+  parse-session.py ~/.claude/projects --corpus --export /tmp/sessions-parquet
+  parse-session.py ~/.claude/projects --corpus --clusters --limit 10
+  find-logs.py sessions --all-repos --recent 0 --after 2025-12-22 | parse-session.py - --corpus
+  parse-session.py session.jsonl --errors --since 10m
+  parse-session.py session.jsonl --summary --since 2025-12-28T07:00 --until 2025-12-28T08:00
+  parse-session.py session.jsonl --follow --pattern "pytest.*failed"
 """
 from __future__ import annotations
 
 import argparse
+import ctypes
+import ctypes.util
+import glob
+import hashlib
 import json
+import math
+import os
+import re
+import select
+import sqlite3
 import sys
+import time
+from array import array
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice, repeat
 from pathlib import Path
+from typing import Any, Iterable, Iterator
 
+from mala_logs_lib import (
+    TimeIndex,
+    connect_index,
+    format_timestamp,
+    is_compressed,
+    open_log,
+    parse_jobs_arg,
+    parse_time_arg,
+    print_json_array,
+    require_zstandard,
+    session_id_of,
+    tail_hash,
+)
 
-# All stdlib - no external dependencies needed
+# Stdlib only; msgspec or orjson are used for faster decoding when installed, pyarrow only for --export
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 def parse_content_block(block: dict) -> dict | None:
@@ -38,15 +91,31 @@ def parse_content_block(block: dict) -> dict | None:
             "input": block.get("input", {}),
         }
     elif block_type == "tool_result":
+        content = block.get("content", "")
         return {
             "type": "tool_result",
             "tool_use_id": block.get("tool_use_id"),
             "is_error": block.get("is_error", False),
-            "content_preview": str(block.get("content", ""))[:200],
+            "content_preview": str(content)[:200],
+            # Sized only when asked for (see content_bytes), since only --timings and --export need it.
+            "content": content,
         }
     return None
 
 
+def _json_size(value: Any) -> int:
+    """Size of ``value`` as the logs encode it (compact JSON, raw UTF-8)."""
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8", "surrogatepass"))
+
+
+def content_bytes(block: dict) -> int:
+    """Size of a tool_result block's content as encoded in the log."""
+    size = block.get("content_bytes")
+    if size is None:
+        size = block["content_bytes"] = _json_size(block["content"])
+    return size
+
+
 def parse_log_entry(data: dict) -> dict | None:
     """Parse a JSONL log entry."""
     entry_type = data.get("type")
@@ -75,110 +144,1949 @@ def parse_log_entry(data: dict) -> dict | None:
     }
 
 
-def analyze_session(path: Path) -> dict:
-    """Analyze a session log file."""
-    entries = []
-    tool_uses = []
-    tool_results = []
-    errors = []
-    text_blocks = []
+# -----------------------------------------------------------------------------
+# Decoding
+# -----------------------------------------------------------------------------
+
+# message.usage fields read by --usage, in the order of its token tuples.
+_USAGE_KEYS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+# Bytes of a tool_result's JSON string decoded for its 200-char preview (an escaped char is at most 12 bytes).
+_PREVIEW_RAW_BYTES = 4096
+
+
+def _loads(raw: bytes) -> dict:
+    data = None
+    if orjson is not None and _JSON_BACKEND != "stdlib":
+        try:
+            data = orjson.loads(raw)
+        except ValueError:
+            pass  # NaN, lone surrogates, huge ints...: let the stdlib decide
+    if data is None:
+        data = json.loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError("log line is not a JSON object")
+    return data
+
+
+def _decode_dict(raw: bytes) -> tuple[dict | None, Any]:
+    data = _loads(raw)
+    return parse_log_entry(data), data.get("timestamp")
+
+
+def _token_count(value: Any) -> int:
+    return value if type(value) is int else 0
+
+
+def _decode_usage_dict(raw: bytes) -> tuple[tuple, Any]:
+    data = _loads(raw)
+    message = data.get("message")
+    message = message if isinstance(message, dict) else {}
+    entry_type = data.get("type")
+    if entry_type is None:
+        entry_type = message.get("role")
+    usage = message.get("usage")
+    tokens = None
+    if isinstance(usage, dict):
+        tokens = tuple(_token_count(usage.get(key)) for key in _USAGE_KEYS)
+    content = message.get("content", [])
+    tools, has_result = [], False
+    has_text = isinstance(content, str)
+    if not has_text and isinstance(content, list):
+        for block in content:
+            if not isinstance(block, dict):
+                continue
+            block_type = block.get("type")
+            if block_type == "tool_use":
+                tools.append(block.get("name"))
+            elif block_type == "tool_result":
+                has_result = True
+            elif block_type == "text":
+                has_text = True
+    record = (entry_type, message.get("id"), tokens, tools, has_result, has_text, bool(data.get("isMeta")))
+    return record, data.get("timestamp")
+
+
+def _decode_node_dict(raw: bytes) -> tuple[Any, Any, bool, int, int]:
+    data = _loads(raw)
+    message = data.get("message", {})
+    tools = errors = 0
+    entry_type = data.get("type")
+    if entry_type is None and isinstance(message, dict):
+        entry_type = message.get("role")
+    if entry_type in ("assistant", "user") and isinstance(message, dict):
+        content = message.get("content", [])
+        if not isinstance(content, str):
+            for block in content:
+                if not isinstance(block, dict):
+                    continue
+                if block.get("type") == "tool_use":
+                    tools += 1
+                elif block.get("type") == "tool_result" and block.get("is_error", False):
+                    errors += 1
+    return data.get("uuid"), data.get("parentUuid"), bool(data.get("isSidechain")), tools, errors
+
+
+if msgspec is not None:
+
+    class _Block(msgspec.Struct):
+        """One content block; fields mirror ``parse_content_block``'s defaults."""
+
+        type: Any = None
+        text: Any = ""
+        id: Any = None
+        name: Any = None
+        input: Any = msgspec.field(default_factory=dict)
+        tool_use_id: Any = None
+        is_error: Any = False
+        # Only a preview of a tool_result's payload is kept, so it stays undecoded.
+        content: msgspec.Raw = msgspec.Raw(b'""')
+
+    class _Message(msgspec.Struct):
+        role: Any = None
+        content: str | list[_Block] = msgspec.field(default_factory=list)
+
+    class _Entry(msgspec.Struct):
+        """The fields of a log entry that are read here (see references/log-schema.md).
+
+        Everything else (``toolUseResult``, thinking blocks, ...) is skipped by
+        the decoder without being built into Python objects.
+        """
+
+        type: Any = None
+        timestamp: Any = None
+        sessionId: Any = None
+        message: _Message | None = None
+
+    _entry_decoder = msgspec.json.Decoder(_Entry)
+
+    class _NodeBlock(msgspec.Struct):
+        type: Any = None
+        is_error: Any = False
+
+    class _NodeMessage(msgspec.Struct):
+        role: Any = None
+        content: str | list[_NodeBlock] = msgspec.field(default_factory=list)
+
+    class _Node(msgspec.Struct):
+        """Just what the conversation tree needs from an entry."""
+
+        type: Any = None
+        uuid: Any = None
+        parentUuid: Any = None
+        isSidechain: Any = False
+        message: _NodeMessage | None = None
+
+    _node_decoder = msgspec.json.Decoder(_Node)
+
+    class _Usage(msgspec.Struct):
+        input_tokens: Any = 0
+        output_tokens: Any = 0
+        cache_read_input_tokens: Any = 0
+        cache_creation_input_tokens: Any = 0
+
+    class _UsageBlock(msgspec.Struct):
+        type: Any = None
+        name: Any = None
 
-    with open(path) as f:
-        for line_num, line in enumerate(f, 1):
+    class _UsageMessage(msgspec.Struct):
+        role: Any = None
+        id: Any = None
+        usage: _Usage | None = None
+        content: str | list[_UsageBlock] = msgspec.field(default_factory=list)
+
+    class _UsageEntry(msgspec.Struct):
+        """Just what ``--usage`` needs from an entry."""
+
+        type: Any = None
+        timestamp: Any = None
+        isMeta: Any = False
+        message: _UsageMessage | None = None
+
+    _usage_decoder = msgspec.json.Decoder(_UsageEntry)
+
+    def _raw_preview(raw: msgspec.Raw) -> str:
+        """``str(content)[:200]`` without decoding more of a long string than the preview needs."""
+        data = bytes(raw)
+        if data[:1] == b'"' and len(data) > _PREVIEW_RAW_BYTES:
+            prefix = data[:_PREVIEW_RAW_BYTES]
+            # Back off until the cut doesn't split an escape or a UTF-8 sequence.
+            for cut in range(len(prefix), len(prefix) - 16, -1):
+                try:
+                    return msgspec.json.decode(prefix[:cut] + b'"')[:200]
+                except ValueError:
+                    continue
+        return str(msgspec.json.decode(data))[:200]
+
+    def _decode_msgspec(raw: bytes) -> tuple[dict | None, Any]:
+        # Skipped fields aren't UTF-8 checked; reject bad lines as a whole, as json.loads does.
+        if not raw.isascii():
+            raw.decode("utf-8")
+        try:
+            data = _entry_decoder.decode(raw)
+        except ValueError:
+            # Unexpected shapes (and JSON msgspec rejects, like lone surrogates) take the dict path.
+            return _decode_dict(raw)
+
+        message = data.message
+        entry_type = data.type
+        if entry_type is None and message is not None:
+            entry_type = message.role
+        if entry_type not in ("assistant", "user"):
+            return {"type": entry_type, "meta": True}, data.timestamp
+
+        content = message.content if message is not None else []
+        if isinstance(content, str):
+            blocks = [{"type": "text", "text": content}]
+        else:
+            blocks = []
+            for block in content:
+                if block.type == "text":
+                    blocks.append({"type": "text", "text": block.text})
+                elif block.type == "tool_use":
+                    blocks.append({"type": "tool_use", "id": block.id, "name": block.name, "input": block.input})
+                elif block.type == "tool_result":
+                    blocks.append({
+                        "type": "tool_result",
+                        "tool_use_id": block.tool_use_id,
+                        "is_error": block.is_error,
+                        "content_preview": _raw_preview(block.content),
+                        "content_bytes": len(block.content),
+                    })
+        entry = {
+            "type": entry_type,
+            "timestamp": data.timestamp,
+            "session_id": data.sessionId,
+            "blocks": blocks,
+        }
+        return entry, data.timestamp
+
+    def _decode_node_msgspec(raw: bytes) -> tuple[Any, Any, bool, int, int]:
+        if not raw.isascii():
+            raw.decode("utf-8")
+        try:
+            data = _node_decoder.decode(raw)
+        except ValueError:
+            return _decode_node_dict(raw)
+        message = data.message
+        tools = errors = 0
+        entry_type = data.type
+        if entry_type is None and message is not None:
+            entry_type = message.role
+        if entry_type in ("assistant", "user") and message is not None and not isinstance(message.content, str):
+            for block in message.content:
+                if block.type == "tool_use":
+                    tools += 1
+                elif block.type == "tool_result" and block.is_error:
+                    errors += 1
+        return data.uuid, data.parentUuid, bool(data.isSidechain), tools, errors
+
+    def _decode_usage_msgspec(raw: bytes) -> tuple[tuple, Any]:
+        if not raw.isascii():
+            raw.decode("utf-8")
+        try:
+            data = _usage_decoder.decode(raw)
+        except ValueError:
+            return _decode_usage_dict(raw)
+        message = data.message or _UsageMessage()
+        entry_type = data.type if data.type is not None else message.role
+        usage = message.usage
+        tokens = None
+        if usage is not None:
+            tokens = (
+                _token_count(usage.input_tokens),
+                _token_count(usage.output_tokens),
+                _token_count(usage.cache_read_input_tokens),
+                _token_count(usage.cache_creation_input_tokens),
+            )
+        content = message.content
+        tools, has_result = [], False
+        has_text = isinstance(content, str)
+        if not has_text:
+            for block in content:
+                if block.type == "tool_use":
+                    tools.append(block.name)
+                elif block.type == "tool_result":
+                    has_result = True
+                elif block.type == "text":
+                    has_text = True
+        record = (entry_type, message.id, tokens, tools, has_result, has_text, bool(data.isMeta))
+        return record, data.timestamp
+
+
+# MALA_LOGS_JSON=stdlib|orjson|msgspec forces a decoder (e.g. to compare them); default is the fastest installed.
+_JSON_BACKEND = os.environ.get("MALA_LOGS_JSON") or ("msgspec" if msgspec else "orjson" if orjson else "stdlib")
+
+
+_decode = _decode_msgspec if _JSON_BACKEND == "msgspec" and msgspec is not None else _decode_dict
+_decode_node = _decode_node_msgspec if _JSON_BACKEND == "msgspec" and msgspec is not None else _decode_node_dict
+_decode_usage = _decode_usage_msgspec if _JSON_BACKEND == "msgspec" and msgspec is not None else _decode_usage_dict
+
+
+def decode_entry(raw: bytes) -> tuple[dict | None, Any]:
+    """Decode one JSONL line into (``parse_log_entry`` result, top-level timestamp).
+
+    Raises ValueError for lines that aren't a JSON object.
+    """
+    return _decode(raw)
+
+
+def _read_bytes(f, nbytes: int) -> Iterator[bytes]:
+    """Lines of ``f`` up to ``nbytes`` further on (a line-aligned window end)."""
+    for raw in f:
+        if nbytes <= 0:
+            return
+        nbytes -= len(raw)
+        yield raw
+
+
+def iter_session(path: Path, since: str | None = None, until: str | None = None) -> Iterator[tuple[str, dict]]:
+    """Yield ("entry" | "tool_use" | "tool_result" | "error" | "text", record) in file order."""
+    for line_num, entry, _ in iter_entries(path, since, until):
+        yield from iter_entry_records(line_num, entry)
+
+
+def iter_entries(
+    path: Path, since: str | None = None, until: str | None = None, decode=None
+) -> Iterator[tuple[int, Any, Any]]:
+    """Yield (line number, ``parse_log_entry`` result, top-level timestamp) for each decodable line.
+
+    ``decode`` swaps in another ``raw -> (record, timestamp)`` decoder for
+    views that need different fields of each entry.
+
+    With ``since``/``until`` (log timestamp strings) only the lines logged in
+    that window are read: the sparse timestamp index locates its byte range,
+    so a time slice of a large log costs about as much as its own size.
+    ``.jsonl.gz`` / ``.jsonl.zst`` logs are decompressed on the fly; they can't
+    be seeked, so their window is found while streaming.
+    """
+    windowed = since is not None or until is not None
+    start, lines, end = 0, 0, -1
+    if windowed and not is_compressed(path):
+        times = TimeIndex()
+        try:
+            start, lines, end = times.window(str(path), since, until)
+        finally:
+            times.close()
+        windowed = False
+
+    inside = since is None
+    decode = decode or _decode
+    with open_log(path) as f:
+        if start:
+            f.seek(start)
+        for line_num, raw in enumerate(f if end < 0 else _read_bytes(f, end - start), lines + 1):
             try:
-                data = json.loads(line)
-                entry = parse_log_entry(data)
-                if entry:
-                    entries.append(entry)
-                    for block in entry.get("blocks", []):
-                        if block["type"] == "tool_use":
-                            tool_uses.append({
-                                "line": line_num,
-                                "name": block["name"],
-                                "id": block["id"],
-                                "input": block["input"],
-                            })
-                        elif block["type"] == "tool_result":
-                            tool_results.append({
-                                "line": line_num,
-                                "tool_use_id": block["tool_use_id"],
-                                "is_error": block["is_error"],
-                                "preview": block["content_preview"],
-                            })
-                            if block["is_error"]:
-                                errors.append({
-                                    "line": line_num,
-                                    "tool_use_id": block["tool_use_id"],
-                                    "preview": block["content_preview"],
-                                })
-                        elif block["type"] == "text":
-                            text_blocks.append({
-                                "line": line_num,
-                                "text": block["text"][:500],
-                            })
-            except json.JSONDecodeError:
+                entry, timestamp = decode(raw)
+            except ValueError:
                 continue
+            if windowed:
+                if isinstance(timestamp, str):
+                    if not inside and timestamp < since:
+                        continue
+                    inside = True
+                    if until is not None and timestamp > until:
+                        break
+                elif not inside:
+                    continue
+            yield line_num, entry, timestamp
+
 
-    tool_counts = Counter(t["name"] for t in tool_uses)
+def iter_entry_records(line_num: int, entry: dict | None) -> Iterator[tuple[str, dict]]:
+    """Yield the records ``iter_session`` produces for one parsed log entry."""
+    if not entry:
+        return
+    yield "entry", entry
+    for block in entry.get("blocks", []):
+        if block["type"] == "tool_use":
+            yield "tool_use", {
+                "line": line_num,
+                "name": block["name"],
+                "id": block["id"],
+                "input": block["input"],
+            }
+        elif block["type"] == "tool_result":
+            yield "tool_result", {
+                "line": line_num,
+                "tool_use_id": block["tool_use_id"],
+                "is_error": block["is_error"],
+                "preview": block["content_preview"],
+            }
+            if block["is_error"]:
+                yield "error", {
+                    "line": line_num,
+                    "tool_use_id": block["tool_use_id"],
+                    "preview": block["content_preview"],
+                }
+        elif block["type"] == "text":
+            yield "text", {
+                "line": line_num,
+                "text": block["text"][:500],
+            }
+
+
+def analyze_session(path: Path, since: str | None = None, until: str | None = None) -> dict:
+    """Analyze a session log file (optionally only the entries between ``since`` and ``until``).
+
+    Entries and tool results are only counted; just the lists that appear in
+    the output (tool uses, errors, text blocks) are kept.
+    """
+    counts: Counter[str] = Counter()
+    collect: dict[str, list[dict]] = {"tool_use": [], "error": [], "text": []}
+    for kind, record in iter_session(path, since, until):
+        counts[kind] += 1
+        if kind in collect:
+            collect[kind].append(record)
+
+    tool_counts = Counter(t["name"] for t in collect["tool_use"])
 
     return {
         "path": str(path),
-        "entry_count": len(entries),
-        "tool_use_count": len(tool_uses),
-        "tool_result_count": len(tool_results),
-        "error_count": len(errors),
+        "entry_count": counts["entry"],
+        "tool_use_count": counts["tool_use"],
+        "tool_result_count": counts["tool_result"],
+        "error_count": counts["error"],
         "tool_frequency": dict(tool_counts.most_common()),
+        "tool_uses": collect["tool_use"],
+        "errors": collect["error"],
+        "text_blocks": collect["text"],
+    }
+
+
+class SummaryView:
+    """``--summary`` aggregates: counters only, so memory stays flat however large the log is."""
+
+    KEY = "summary/1"
+
+    def __init__(self, state: dict | None = None):
+        state = state or {}
+        self.counts: Counter[str] = Counter(dict(state.get("counts", [])))
+        self.tool_counts: Counter[str] = Counter(dict(state.get("tool_counts", [])))
+
+    def add(self, line_num: int, entry: dict | None) -> None:
+        for kind, record in iter_entry_records(line_num, entry):
+            self.counts[kind] += 1
+            if kind == "tool_use":
+                self.tool_counts[record["name"]] += 1
+
+    def state(self) -> dict:
+        return {"counts": list(self.counts.items()), "tool_counts": list(self.tool_counts.items())}
+
+    def result(self, path: Path) -> dict:
+        return {
+            "path": str(path),
+            "entries": self.counts["entry"],
+            "tool_uses": self.counts["tool_use"],
+            "errors": self.counts["error"],
+            "tool_frequency": dict(self.tool_counts.most_common()),
+        }
+
+
+def summarize_session(
+    path: Path, since: str | None = None, until: str | None = None, checkpoint: bool = True
+) -> dict:
+    """The ``--summary`` view, resumed from its checkpoint when the log has only grown."""
+    return aggregate(path, SummaryView, since, until, checkpoint).result(path)
+
+
+def select_records(path: Path, args: argparse.Namespace) -> Iterator[dict]:
+    """Records for ``--tools`` / ``--errors`` / ``--text``, filtered and cut to ``--limit``.
+
+    Lazy: reading the log stops as soon as ``--limit`` records have been taken.
+    """
+    kind = "tool_use" if args.tools else "error" if args.errors else "text"
+    records = (record for k, record in iter_session(path, args.since, args.until) if k == kind)
+    if args.tools and args.filter:
+        records = (t for t in records if args.filter.lower() in t["name"].lower())
+    return islice(records, args.limit or None)
+
+
+def stream_session(path: Path, args: argparse.Namespace) -> Iterator[dict]:
+    """Yield NDJSON records for the selected output mode as they are parsed.
+
+    Only counters are kept, so memory stays bounded; the full-analysis mode
+    tags each record with a ``kind`` and ends with a ``summary`` record.
+    """
+    if args.summary:
+        yield summarize_session(path, args.since, args.until, not args.no_checkpoint)
+        return
+    if args.timings:
+        timings = tool_timings(path, args)
+        for tool in timings.pop("tools"):
+            yield {"kind": "tool", **tool}
+        yield {"kind": "summary", **timings}
+        return
+    if args.tools or args.errors or args.text:
+        yield from select_records(path, args)
+        return
+
+    counts: Counter[str] = Counter()
+    tool_counts: Counter[str] = Counter()
+    for kind, record in iter_session(path, args.since, args.until):
+        counts[kind] += 1
+        if kind == "tool_use":
+            tool_counts[record["name"]] += 1
+        if kind != "entry":
+            yield {"kind": kind, **record}
+
+    yield {
+        "kind": "summary",
+        "path": str(path),
+        "entry_count": counts["entry"],
+        "tool_use_count": counts["tool_use"],
+        "tool_result_count": counts["tool_result"],
+        "error_count": counts["error"],
+        "tool_frequency": dict(tool_counts.most_common()),
+    }
+
+
+def analyze_corpus(paths: list[str], args: argparse.Namespace) -> dict:
+    """The ``--corpus`` report, with every session's summary unless ``--summary`` is given."""
+    totals: Counter[str] = Counter()
+    summaries = list(iter_corpus(paths, args, totals))
+    report = corpus_report(summaries, totals)
+    if not args.summary:
+        report["per_session"] = summaries
+    return report
+
+
+def stream_corpus(paths: list[str], args: argparse.Namespace) -> Iterator[dict]:
+    """NDJSON for ``--corpus``: a ``session`` record per log as it is done, then the ``summary``."""
+    totals: Counter[str] = Counter()
+    summaries = []
+    for summary in iter_corpus(paths, args, totals):
+        summaries.append(summary)
+        if not args.summary:
+            yield {"kind": "session", **summary}
+    yield {"kind": "summary", **corpus_report(summaries, totals)}
+
+
+# -----------------------------------------------------------------------------
+# Checkpoints
+# -----------------------------------------------------------------------------
+
+
+class Checkpoints:
+    """Saved aggregate state of views over append-only logs, in the shared index.
+
+    Each state is stored with the byte offset and line count it covers and a
+    hash of the bytes just before that offset, like find-logs' search cache,
+    so a later run can tell the log was only appended to and parse just the
+    new lines.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS parse_checkpoints_v1 (
+            path TEXT NOT NULL,
+            view TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            lines INTEGER NOT NULL,
+            tail_hash TEXT NOT NULL,
+            state TEXT NOT NULL,
+            PRIMARY KEY (path, view)
+        );
+    """
+
+    def __init__(self, conn: sqlite3.Connection | None = None):
+        self.conn = conn or connect_index()
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def load(self, path: str, view: str) -> tuple[int, int, str, str] | None:
+        return self.conn.execute(
+            "SELECT offset, lines, tail_hash, state FROM parse_checkpoints_v1 WHERE path = ? AND view = ?",
+            (path, view),
+        ).fetchone()
+
+    def save(self, path: str, view: str, offset: int, lines: int, tail_hash: str, state: str) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO parse_checkpoints_v1 (path, view, offset, lines, tail_hash, state) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, view, offset, lines, tail_hash, state),
+            )
+
+
+def aggregate(path: Path, view_cls, since: str | None = None, until: str | None = None, checkpoint: bool = True):
+    """Feed every entry of ``path`` to a new ``view_cls`` and return it.
+
+    Unless a time window is given (or the log is compressed), the view
+    resumes from its checkpoint when the log has only been appended to, and
+    a new checkpoint is saved at the last complete line. A partially written
+    last line is still parsed for this result, exactly as a full parse would,
+    but the checkpoint stops before it.
+    """
+    if not checkpoint or since is not None or until is not None or is_compressed(path):
+        view = view_cls()
+        for line_num, entry, _ in iter_entries(path, since, until):
+            view.add(line_num, entry)
+        return view
+
+    store = Checkpoints()
+    try:
+        key = str(path.resolve())
+        row = store.load(key, view_cls.KEY)
+        offset = lines = 0
+        state = None
+        with open_log(path) as f:
+            if row is not None:
+                size = f.seek(0, os.SEEK_END)
+                if size >= row[0] and tail_hash(f, row[0]) == row[2]:
+                    offset, lines, state = row[0], row[1], json.loads(row[3])
+            view = view_cls(state)
+            f.seek(offset)
+            saved = None
+            decode = _decode
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    saved = (offset, lines, json.dumps(view.state()))
+                lines += 1
+                offset += len(raw)
+                try:
+                    entry, _ = decode(raw)
+                except ValueError:
+                    continue
+                view.add(lines, entry)
+            if saved is None:
+                saved = (offset, lines, json.dumps(view.state()))
+            if row is None or saved[0] != row[0] or state is None:
+                store.save(key, view_cls.KEY, saved[0], saved[1], tail_hash(f, saved[0]), saved[2])
+        return view
+    finally:
+        store.close()
+
+
+# -----------------------------------------------------------------------------
+# Timings
+# -----------------------------------------------------------------------------
+
+# Tool uses awaiting their result; beyond this the oldest are dropped and counted as unmatched.
+_MAX_PENDING_TOOL_USES = 10_000
+
+
+def _epoch_ms(timestamp: Any) -> float | None:
+    if not isinstance(timestamp, str):
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp() * 1000
+    except ValueError:
+        return None
+
+
+def _percentile(ordered: list[int], pct: float) -> int | None:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _new_tool() -> dict:
+    return {"durations": [], "calls": 0, "errors": 0, "output_bytes": 0, "max_output": 0}
+
+
+class TimingsView:
+    """``--timings`` aggregates: pairs each tool_use with its tool_result (by id) and keeps per-tool stats.
+
+    A call's duration is the time between the entry that issued it and the
+    one carrying its result (skipped if either lacks a timestamp); its output
+    size is the result content as logged. Only per-tool durations are kept,
+    not the calls themselves. Uses still awaiting a result live in
+    ``pending``; results without a matching use count as ``orphan_results``.
+    """
+
+    KEY = "timings/1"
+
+    def __init__(self, state: dict | None = None):
+        state = state or {}
+        self.stats: Counter[str] = Counter(dict(state.get("stats", [])))
+        self.pending: dict[str, tuple[str, float | None]] = {
+            tool_id: (name, when) for tool_id, name, when in state.get("pending", [])
+        }
+        self.tools: dict[str, dict] = dict(state.get("tools", []))
+
+    def add(self, line_num: int, entry: dict | None) -> None:
+        if not entry or not entry.get("blocks"):
+            return
+        when = _epoch_ms(entry["timestamp"])
+        pending = self.pending
+        for block in entry["blocks"]:
+            if block["type"] == "tool_use":
+                pending[block["id"]] = (block["name"], when)
+                if len(pending) > _MAX_PENDING_TOOL_USES:
+                    name, _ = pending.pop(next(iter(pending)))
+                    self.stats[f"unmatched:{name}"] += 1
+            elif block["type"] == "tool_result":
+                call = pending.pop(block["tool_use_id"], None)
+                if call is None:
+                    self.stats["orphan_results"] += 1
+                    continue
+                name, started = call
+                tool = self.tools.get(name)
+                if tool is None:
+                    tool = self.tools[name] = _new_tool()
+                tool["calls"] += 1
+                tool["errors"] += bool(block["is_error"])
+                size = content_bytes(block)
+                tool["output_bytes"] += size
+                tool["max_output"] = max(tool["max_output"], size)
+                if started is not None and when is not None:
+                    tool["durations"].append(max(0, round(when - started)))
+
+    def state(self) -> dict:
+        """JSON-able state (pairs rather than objects, so non-string keys survive)."""
+        return {
+            "stats": list(self.stats.items()),
+            "pending": [[tool_id, name, when] for tool_id, (name, when) in self.pending.items()],
+            "tools": list(self.tools.items()),
+        }
+
+    def result(self, path: Path, args: argparse.Namespace) -> dict:
+        """Per-tool stats, slowest total wall time first; uses still pending count as unmatched."""
+        stats = Counter(self.stats)
+        for name, _ in self.pending.values():
+            stats[f"unmatched:{name}"] += 1
+        unmatched = {key.split(":", 1)[1]: n for key, n in stats.items() if key.startswith("unmatched:")}
+        tools = dict(self.tools)
+        for name in unmatched:
+            tools.setdefault(name, _new_tool())
+
+        records = []
+        for name, tool in tools.items():
+            if args.filter and args.filter.lower() not in name.lower():
+                continue
+            durations = sorted(tool["durations"])
+            calls = tool["calls"]
+            records.append({
+                "name": name,
+                "calls": calls,
+                "unmatched": unmatched.get(name, 0),
+                "total_ms": sum(durations),
+                "p50_ms": _percentile(durations, 50),
+                "p95_ms": _percentile(durations, 95),
+                "max_ms": durations[-1] if durations else None,
+                "output_bytes": tool["output_bytes"],
+                "max_output_bytes": tool["max_output"],
+                "error_rate": round(tool["errors"] / calls, 4) if calls else None,
+            })
+        records.sort(key=lambda r: (-r["total_ms"], -r["calls"], r["name"]))
+        return {
+            "path": str(path),
+            "calls": sum(tool["calls"] for tool in tools.values()),
+            "unmatched_uses": sum(unmatched.values()),
+            "orphan_results": stats["orphan_results"],
+            "tools": records[: args.limit or None],
+        }
+
+
+def tool_timings(path: Path, args: argparse.Namespace) -> dict:
+    """The ``--timings`` view, resumed from its checkpoint when the log has only grown."""
+    view = aggregate(path, TimingsView, args.since, args.until, not args.no_checkpoint)
+    return view.result(path, args)
+
+
+# -----------------------------------------------------------------------------
+# Usage
+# -----------------------------------------------------------------------------
+
+
+def _token_totals(tokens: list[int]) -> dict:
+    """Named token counts, plus the share of the prompt served from cache."""
+    input_tokens, output_tokens, cache_read, cache_write = tokens
+    prompt = input_tokens + cache_read + cache_write
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_read_tokens": cache_read,
+        "cache_write_tokens": cache_write,
+        "cache_hit_ratio": round(cache_read / prompt, 4) if prompt else None,
+    }
+
+
+def iter_usage(path: Path, since: str | None = None, until: str | None = None) -> Iterator[dict]:
+    """Token accounting in one pass: ``call``, ``turn`` and finally ``summary`` records.
+
+    A call is one model request. Its response is logged as several
+    assistant entries that share a message id and repeat the same usage, so
+    each id is counted once. Every call record carries its prompt size
+    (input + cache read + cache write tokens), the growth since the previous
+    call and the session's cumulative totals, which together give the
+    prompt-growth and token curves. A turn runs from one user prompt (not a
+    tool result or injected meta message) to the next and covers its whole
+    tool loop; calls logged before the first prompt (e.g. a ``--since`` window
+    opening mid-turn) make up turn 0.
+    """
+    totals = [0, 0, 0, 0]
+    turn_totals = [0, 0, 0, 0]
+    turn = turns = turn_calls = turn_tools = calls = tool_uses = peak_prompt = 0
+    turn_line = turn_start = None
+    first_prompt = prev_prompt = None
+    call: dict | None = None
+
+    def finish_call() -> dict:
+        nonlocal calls, first_prompt, prev_prompt, peak_prompt, turn_calls, turn_tools, tool_uses
+        tokens = call["tokens"]
+        prompt = tokens[0] + tokens[2] + tokens[3]
+        for i, count in enumerate(tokens):
+            totals[i] += count
+            turn_totals[i] += count
+        calls += 1
+        turn_calls += 1
+        turn_tools += len(call["tools"])
+        tool_uses += len(call["tools"])
+        peak_prompt = max(peak_prompt, prompt)
+        record = {
+            "kind": "call",
+            "call": calls,
+            "turn": turn,
+            "line": call["line"],
+            "timestamp": call["timestamp"],
+            "message_id": call["id"],
+            "tools": call["tools"],
+            **_token_totals(tokens),
+            "prompt_tokens": prompt,
+            "prompt_growth": None if prev_prompt is None else prompt - prev_prompt,
+            "cumulative": dict(zip(("input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens"), totals)),
+        }
+        if first_prompt is None:
+            first_prompt = prompt
+        prev_prompt = prompt
+        return record
+
+    def finish_turn() -> dict:
+        nonlocal turns
+        turns += 1
+        return {
+            "kind": "turn",
+            "turn": turn,
+            "line": turn_line,
+            "timestamp": turn_start,
+            "calls": turn_calls,
+            "tool_uses": turn_tools,
+            **_token_totals(turn_totals),
+        }
+
+    for line, (entry_type, message_id, tokens, tools, has_result, has_text, is_meta), timestamp in iter_entries(
+        path, since, until, _decode_usage
+    ):
+        if entry_type == "assistant":
+            if call is not None and message_id is not None and message_id == call["id"]:
+                call["tools"].extend(tools)
+                continue
+            if call is not None:
+                yield finish_call()
+                call = None
+            if tokens is not None:
+                call = {"id": message_id, "line": line, "timestamp": timestamp, "tokens": tokens, "tools": list(tools)}
+        elif entry_type == "user" and has_text and not has_result and not is_meta:
+            if call is not None:
+                yield finish_call()
+                call = None
+            if turn_calls:
+                yield finish_turn()
+            turn += 1
+            turn_line, turn_start = line, timestamp
+            turn_totals[:] = [0, 0, 0, 0]
+            turn_calls = turn_tools = 0
+    if call is not None:
+        yield finish_call()
+    if turn_calls:
+        yield finish_turn()
+
+    yield {
+        "kind": "summary",
+        "path": str(path),
+        "turns": turns,
+        "calls": calls,
         "tool_uses": tool_uses,
-        "errors": errors,
-        "text_blocks": text_blocks,
+        **_token_totals(totals),
+        "peak_prompt_tokens": peak_prompt,
+        "mean_prompt_growth": round((prev_prompt - first_prompt) / (calls - 1)) if calls > 1 else None,
+    }
+
+
+def usage_report(path: Path, args: argparse.Namespace) -> dict:
+    """The ``--usage`` view as one document; ``--summary`` leaves out the per-turn and per-call lists."""
+    lists: dict[str, list[dict]] = {"turn": [], "call": []}
+    for record in iter_usage(path, args.since, args.until):
+        kind = record.pop("kind")
+        if kind == "summary":
+            summary = record
+        elif not args.summary:
+            lists[kind].append(record)
+    if args.summary:
+        return summary
+    return {**summary, "turns": lists["turn"], "calls": lists["call"]}
+
+
+# -----------------------------------------------------------------------------
+# Conversation tree
+# -----------------------------------------------------------------------------
+
+
+class ConversationTree:
+    """The ``uuid`` / ``parentUuid`` DAG of a session, held in flat arrays indexed by node id.
+
+    Ids are handed out as uuids are first seen (as an entry or as a parent
+    reference), so parents logged after their children still link up. Per
+    node only a parent id, line, byte offset, sidechain flag and tool/error
+    counts are kept; children are derived as a CSR layout (``child_start``
+    into ``children``) on demand.
+    """
+
+    __slots__ = (
+        "path", "ids", "uuids", "parent", "line", "offset", "present", "sidechain", "tools", "errors",
+        "_child_start", "_children",
+    )
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.ids: dict[str, int] = {}
+        self.uuids: list[str] = []
+        self.parent = array("i")
+        self.line = array("q")
+        self.offset = array("q")
+        self.present = bytearray()
+        self.sidechain = bytearray()
+        self.tools = array("i")
+        self.errors = array("i")
+        self._child_start: array | None = None
+        self._children: array | None = None
+
+    def _id(self, uuid: str) -> int:
+        node = self.ids.get(uuid)
+        if node is None:
+            node = self.ids[uuid] = len(self.uuids)
+            self.uuids.append(uuid)
+            self.parent.append(-1)
+            self.line.append(0)
+            self.offset.append(-1)
+            self.present.append(0)
+            self.sidechain.append(0)
+            self.tools.append(0)
+            self.errors.append(0)
+        return node
+
+    @classmethod
+    def build(cls, path: Path) -> ConversationTree:
+        """Read ``path`` once, decoding only the threading fields and content block types of each entry."""
+        tree = cls(path)
+        decode = _decode_node
+        offset = 0
+        with open_log(path) as f:
+            for line_num, raw in enumerate(f, 1):
+                start, offset = offset, offset + len(raw)
+                try:
+                    uuid, parent_uuid, sidechain, tools, errors = decode(raw)
+                except ValueError:
+                    continue
+                if not isinstance(uuid, str):
+                    continue
+                node = tree._id(uuid)
+                if tree.present[node]:
+                    continue  # A re-logged entry: the first copy wins.
+                tree.present[node] = 1
+                tree.line[node] = line_num
+                tree.offset[node] = start
+                tree.sidechain[node] = sidechain
+                tree.tools[node] = tools
+                tree.errors[node] = errors
+                if isinstance(parent_uuid, str):
+                    tree.parent[node] = tree._id(parent_uuid)
+        return tree
+
+    def _csr(self) -> tuple[array, array]:
+        if self._children is None:
+            n = len(self.uuids)
+            start = array("i", bytes(4 * (n + 1)))
+            for p in self.parent:
+                if p >= 0:
+                    start[p + 1] += 1
+            for i in range(n):
+                start[i + 1] += start[i]
+            fill = array("i", start[:n])
+            children = array("i", bytes(4 * start[n]))
+            for node, p in enumerate(self.parent):
+                if p >= 0:
+                    children[fill[p]] = node
+                    fill[p] += 1
+            self._child_start, self._children = start, children
+        return self._child_start, self._children
+
+    def children(self, node: int) -> array:
+        start, children = self._csr()
+        return children[start[node]:start[node + 1]]
+
+    def roots(self) -> list[int]:
+        """Logged nodes without a logged parent (a dangling parentUuid points outside this log)."""
+        present, parent = self.present, self.parent
+        return [n for n in range(len(self.uuids)) if present[n] and (parent[n] < 0 or not present[parent[n]])]
+
+    def cycles(self, reached: bytearray) -> list[list[int]]:
+        """``parentUuid`` cycles among logged nodes that aren't ``reached`` from a root.
+
+        Such nodes have no root above them, so following parents from any of
+        them ends in a cycle (only a corrupted or hand-edited log has one).
+        """
+        present, parent = self.present, self.parent
+        done = bytearray(reached)
+        cycles = []
+        for n in range(len(self.uuids)):
+            if not present[n] or done[n]:
+                continue
+            path: dict[int, int] = {}
+            node = n
+            while node >= 0 and present[node] and not done[node] and node not in path:
+                path[node] = len(path)
+                node = parent[node]
+            if node in path:
+                cycles.append(list(path)[path[node]:])
+            for m in path:
+                done[m] = 1
+        return cycles
+
+    def preorder(self, roots: Iterable[int]) -> Iterator[tuple[int, int]]:
+        """(node, depth) in depth-first order below ``roots``; children visited in log order.
+
+        Each node is yielded once, so a ``parentUuid`` cycle below ``roots`` ends the walk instead of looping.
+        """
+        start, children = self._csr()
+        line = self.line
+        seen = bytearray(len(self.uuids))
+        stack = [(root, 0) for root in sorted(roots, key=line.__getitem__, reverse=True)]
+        while stack:
+            node, depth = stack.pop()
+            if seen[node]:
+                continue
+            seen[node] = 1
+            yield node, depth
+            kids = sorted(children[start[node]:start[node + 1]], key=line.__getitem__, reverse=True)
+            stack.extend((kid, depth + 1) for kid in kids)
+
+    def report(self, limit: int | None = None) -> Iterator[dict]:
+        """Yield ``cycle``, ``branch`` and ``sidechain`` records, then a ``summary``.
+
+        Branch points are logged nodes with more than one child; a sidechain
+        subtree is rooted at a sidechain node whose parent isn't one. Tool and
+        error counts are summed bottom-up in a single reverse pre-order pass.
+        A ``parentUuid`` cycle is reported as a defect, and its part of the
+        log is walked from the cycle's first-logged node as if that had no parent.
+        """
+        roots = self.roots()
+        order = list(self.preorder(roots))
+        reached = bytearray(len(self.uuids))
+        for node, _ in order:
+            reached[node] = 1
+        cycles = sorted(self.cycles(reached), key=lambda cycle: min(self.line[n] for n in cycle))
+        cut = {min(cycle, key=self.line.__getitem__) for cycle in cycles}
+        order.extend(self.preorder(cut))
+        subtree_nodes = array("i", [1]) * len(self.uuids)
+        subtree_tools = array("i", self.tools)
+        subtree_errors = array("i", self.errors)
+        for node, _ in reversed(order):
+            p = self.parent[node]
+            if p >= 0 and self.present[p] and node not in cut:
+                subtree_nodes[p] += subtree_nodes[node]
+                subtree_tools[p] += subtree_tools[node]
+                subtree_errors[p] += subtree_errors[node]
+
+        def subtree(node: int) -> dict:
+            return {
+                "uuid": self.uuids[node],
+                "line": self.line[node],
+                "nodes": subtree_nodes[node],
+                "tool_uses": subtree_tools[node],
+                "errors": subtree_errors[node],
+            }
+
+        for i, cycle in enumerate(cycles):
+            if limit is None or i < limit:
+                lines = sorted(self.line[node] for node in cycle)
+                yield {"kind": "cycle", "line": lines[0], "lines": lines, "uuids": [self.uuids[n] for n in cycle]}
+
+        branches = sidechains = 0
+        for node, _ in order:
+            kids = self.children(node)
+            if len(kids) > 1:
+                branches += 1
+                if limit is None or branches <= limit:
+                    yield {
+                        "kind": "branch",
+                        **subtree(node),
+                        "children": [subtree(kid) for kid in sorted(kids, key=self.line.__getitem__)],
+                    }
+            p = self.parent[node]
+            if self.sidechain[node] and (p < 0 or not self.sidechain[p]):
+                sidechains += 1
+                if limit is None or sidechains <= limit:
+                    yield {"kind": "sidechain", "parent_uuid": self.uuids[p] if p >= 0 else None, **subtree(node)}
+
+        yield {
+            "kind": "summary",
+            "path": str(self.path),
+            "nodes": sum(self.present),
+            "roots": len(roots),
+            "dangling_parents": sum(1 for n in roots if self.parent[n] >= 0),
+            "cycle_count": len(cycles),
+            "max_depth": max((depth for _, depth in order), default=0),
+            "branch_count": branches,
+            "sidechain_count": sidechains,
+            "sidechain_nodes": sum(1 for node, _ in order if self.sidechain[node]),
+        }
+
+    def subtree_lines(self, uuid: str) -> Iterator[bytes]:
+        """Raw log lines of the subtree rooted at ``uuid``, in log order.
+
+        Plain logs are read by seeking to each node's recorded offset, so only
+        the subtree's lines are read; compressed logs are streamed once.
+        """
+        node = self.ids.get(uuid)
+        if node is None or not self.present[node]:
+            raise KeyError(uuid)
+        members = sorted((self.line[n], self.offset[n]) for n, _ in self.preorder([node]))
+        with open_log(self.path) as f:
+            if not is_compressed(self.path):
+                for _, offset in members:
+                    f.seek(offset)
+                    yield f.readline()
+                return
+            wanted = iter(members)
+            target = next(wanted, None)
+            for line_num, raw in enumerate(f, 1):
+                if target is None:
+                    return
+                if line_num == target[0]:
+                    yield raw
+                    target = next(wanted, None)
+
+
+def tree_report(path: Path, args: argparse.Namespace) -> dict:
+    """The ``--tree`` view as one document (``--limit`` caps the branch and sidechain lists)."""
+    lists: dict[str, list[dict]] = {"cycle": [], "branch": [], "sidechain": []}
+    for record in ConversationTree.build(path).report(args.limit or None):
+        kind = record.pop("kind")
+        if kind == "summary":
+            summary = record
+        else:
+            lists[kind].append(record)
+    return {**summary, "cycles": lists["cycle"], "branch_points": lists["branch"], "sidechains": lists["sidechain"]}
+
+
+# -----------------------------------------------------------------------------
+# Corpus
+# -----------------------------------------------------------------------------
+
+# Cached summaries are written in batches of this many sessions, so an interrupted run keeps most of its work.
+_CORPUS_COMMIT_EVERY = 100
+
+
+class SummaryCache:
+    """Per-session corpus summaries in the shared index, valid while a log's (size, mtime) is unchanged."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS corpus_sessions_v1 (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            summary TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, conn: sqlite3.Connection | None = None):
+        self.conn = conn or connect_index()
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get(self, path: str, size: int, mtime_ns: int) -> dict | None:
+        row = self.conn.execute(
+            "SELECT summary FROM corpus_sessions_v1 WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (path, size, mtime_ns),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_many(self, rows: list[tuple[str, int, int, dict]]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO corpus_sessions_v1 (path, size, mtime_ns, summary) VALUES (?, ?, ?, ?)",
+                [(path, size, mtime_ns, json.dumps(summary)) for path, size, mtime_ns, summary in rows],
+            )
+
+
+def corpus_paths(source: str) -> list[str]:
+    """Session logs named by ``source``: a directory (searched recursively), a glob, or ``-``.
+
+    ``-`` reads stdin: the JSON or NDJSON output of ``find-logs.py`` (records
+    with ``path`` or ``log_path``), or plain paths one per line. Anything that
+    isn't a session log (e.g. run metadata files) is ignored.
+    """
+    if source == "-":
+        text = sys.stdin.read()
+        try:
+            items = json.loads(text)
+            items = items if isinstance(items, list) else [items]
+        except ValueError:
+            items = []
+            for line in text.splitlines():
+                line = line.strip()
+                if line.startswith("{"):
+                    items.append(json.loads(line))
+                elif line:
+                    items.append(line)
+        candidates = [
+            item if isinstance(item, str) else item.get("path") or item.get("log_path")
+            for item in items
+            if isinstance(item, (str, dict))
+        ]
+    elif os.path.isdir(source):
+        candidates = [os.path.join(root, name) for root, _, names in os.walk(source) for name in names]
+    else:
+        candidates = glob.glob(os.path.expanduser(source), recursive=True)
+    paths = {
+        os.path.abspath(p) for p in candidates if p and session_id_of(os.path.basename(p)) is not None and os.path.isfile(p)
+    }
+    return sorted(paths)
+
+
+def session_stats(path: str, since: str | None = None, until: str | None = None) -> dict:
+    """One pass over a log for the corpus report: counts, time span and per-tool uses and errors."""
+    counts: Counter[str] = Counter()
+    tool_counts: Counter[str] = Counter()
+    tool_errors: Counter[str] = Counter()
+    names: dict[str, str] = {}
+    first = last = None
+    for kind, record in iter_session(Path(path), since, until):
+        counts[kind] += 1
+        if kind == "entry":
+            timestamp = record.get("timestamp")
+            if isinstance(timestamp, str):
+                first = timestamp if first is None or timestamp < first else first
+                last = timestamp if last is None or timestamp > last else last
+        elif kind == "tool_use":
+            tool_counts[record["name"]] += 1
+            names[record["id"]] = record["name"]
+            if len(names) > _MAX_PENDING_TOOL_USES:
+                names.pop(next(iter(names)))
+        elif kind == "tool_result":
+            name = names.pop(record["tool_use_id"], None)
+            if record["is_error"]:
+                tool_errors[name or "unknown"] += 1
+    return {
+        "session_id": session_id_of(os.path.basename(path)),
+        "path": path,
+        "started": first,
+        "ended": last,
+        "entries": counts["entry"],
+        "tool_uses": counts["tool_use"],
+        "tool_results": counts["tool_result"],
+        "errors": counts["error"],
+        "tool_frequency": dict(tool_counts.most_common()),
+        "tool_errors": dict(tool_errors.most_common()),
+    }
+
+
+def _corpus_worker(path: str, since: str | None, until: str | None) -> dict:
+    try:
+        return session_stats(path, since, until)
+    except (OSError, EOFError) as e:
+        return {"session_id": session_id_of(os.path.basename(path)), "path": path, "error": str(e)}
+
+
+def iter_corpus(paths: list[str], args: argparse.Namespace, totals: Counter | None = None) -> Iterator[dict]:
+    """Yield a summary per session, in ``paths`` order, analyzing uncached logs across ``args.jobs`` processes.
+
+    Unwindowed summaries are cached by (size, mtime), so a re-run only
+    parses sessions that are new or have changed. ``totals`` counts
+    ``analyzed`` / ``cached`` / ``failed`` sessions.
+    """
+    totals = Counter() if totals is None else totals
+    windowed = args.since is not None or args.until is not None
+    cache = SummaryCache()
+    try:
+        results: list[dict | None] = []
+        todo: list[tuple[int, str, int, int]] = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if args.since is not None and format_timestamp(datetime.fromtimestamp(st.st_mtime, timezone.utc)) < args.since:
+                continue  # Last written before the window opens.
+            summary = None if windowed else cache.get(path, st.st_size, st.st_mtime_ns)
+            if summary is not None:
+                totals["cached"] += 1
+            else:
+                todo.append((len(results), path, st.st_size, st.st_mtime_ns))
+            results.append(summary)
+
+        todo_paths = [path for _, path, _, _ in todo]
+        pool = ProcessPoolExecutor(max_workers=args.jobs) if args.jobs > 1 and len(todo) > 1 else None
+        try:
+            if pool is None:
+                analyzed = map(_corpus_worker, todo_paths, repeat(args.since), repeat(args.until))
+            else:
+                chunksize = max(1, min(16, len(todo) // (args.jobs * 4)))
+                analyzed = pool.map(
+                    _corpus_worker, todo_paths, repeat(args.since), repeat(args.until), chunksize=chunksize
+                )
+            done = 0
+            fresh: list[tuple[str, int, int, dict]] = []
+            for (slot, path, size, mtime_ns), summary in zip(todo, analyzed):
+                results[slot] = summary
+                if "error" in summary:
+                    totals["failed"] += 1
+                else:
+                    totals["analyzed"] += 1
+                    if not windowed:
+                        fresh.append((path, size, mtime_ns, summary))
+                    if len(fresh) >= _CORPUS_COMMIT_EVERY:
+                        cache.put_many(fresh)
+                        fresh = []
+                # Hand back, in order, every summary that is ready so far.
+                while done < len(results) and results[done] is not None:
+                    yield results[done]
+                    done += 1
+            if fresh:
+                cache.put_many(fresh)
+            yield from results[done:]
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+    finally:
+        cache.close()
+
+
+def corpus_report(summaries: Iterable[dict], totals: Counter) -> dict:
+    """Aggregate per-session summaries into corpus-wide tool frequency and error rates."""
+    counts: Counter[str] = Counter()
+    tool_counts: Counter[str] = Counter()
+    tool_errors: Counter[str] = Counter()
+    for summary in summaries:
+        if "error" in summary:
+            continue
+        counts["sessions"] += 1
+        counts["sessions_with_errors"] += summary["errors"] > 0
+        for key in ("entries", "tool_uses", "tool_results", "errors"):
+            counts[key] += summary[key]
+        tool_counts.update(summary["tool_frequency"])
+        tool_errors.update(summary["tool_errors"])
+    return {
+        "sessions": counts["sessions"],
+        "analyzed": totals["analyzed"],
+        "cached": totals["cached"],
+        "failed": totals["failed"],
+        "sessions_with_errors": counts["sessions_with_errors"],
+        "entries": counts["entries"],
+        "tool_uses": counts["tool_uses"],
+        "errors": counts["errors"],
+        "error_rate": round(counts["errors"] / counts["tool_results"], 4) if counts["tool_results"] else None,
+        "tool_frequency": dict(tool_counts.most_common()),
+        "tool_error_rates": {
+            name: round(tool_errors[name] / n, 4) for name, n in tool_counts.most_common() if tool_errors[name]
+        },
+    }
+
+
+# -----------------------------------------------------------------------------
+# Error clusters
+# -----------------------------------------------------------------------------
+
+# Distinct error signatures held at once; past this the rarer half is dropped.
+_MAX_CLUSTERS = 10_000
+# Example occurrences kept per cluster (from different sessions when there are several).
+_CLUSTER_EXAMPLES = 3
+
+# Applied in order: the volatile parts of an error preview, replaced by placeholders.
+_SIGNATURE_RULES = (
+    (re.compile(r"\x1b\[[0-9;]*[A-Za-z]"), ""),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.IGNORECASE), "<uuid>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?"), "<time>"),
+    (re.compile(r"\b\d{1,2}:\d{2}:\d{2}(?:\.\d+)?"), "<time>"),
+    (re.compile(r"(?<![<\w.~/])(?:~|\.{1,2}|[\w.@+-]+)?(?:/[\w.@+-]+)+/?"), "<path>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b(?=[a-f]*\d)[0-9a-f]{7,}\b", re.IGNORECASE), "<hex>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def error_signature(preview: str) -> str:
+    """``preview`` with paths, numbers, uuids, hashes and timestamps replaced by placeholders."""
+    for regex, placeholder in _SIGNATURE_RULES:
+        preview = regex.sub(placeholder, preview)
+    return preview.strip()
+
+
+class ErrorClusters:
+    """Errors grouped by normalized signature, with counts, first/last seen and example sessions.
+
+    At most ``limit`` signatures are held; past that the less frequent half is
+    dropped (their errors are counted in ``dropped``), so a corpus of any size
+    is clustered in bounded memory. Per-session clusters ``merge`` into one.
+    """
+
+    def __init__(self, limit: int = _MAX_CLUSTERS):
+        self.limit = limit
+        self.clusters: dict[str, dict] = {}
+        self.errors = 0
+        self.dropped = 0
+
+    def add(self, preview: str, session_id: str | None, line: int, timestamp: Any, tool: str) -> None:
+        self.errors += 1
+        pattern = error_signature(preview)
+        key = hashlib.sha1(pattern.encode("utf-8", "surrogatepass")).hexdigest()[:12]
+        timestamp = timestamp if isinstance(timestamp, str) else None
+        cluster = self.clusters.get(key)
+        if cluster is None:
+            self.clusters[key] = {
+                "signature": key,
+                "pattern": pattern,
+                "count": 1,
+                "sessions": 1,
+                "first_seen": timestamp,
+                "last_seen": timestamp,
+                "tools": {tool: 1},
+                "examples": [{"session_id": session_id, "line": line, "timestamp": timestamp, "preview": preview}],
+            }
+            self._prune()
+            return
+        cluster["count"] += 1
+        cluster["tools"][tool] = cluster["tools"].get(tool, 0) + 1
+        self._seen(cluster, timestamp, timestamp)
+
+    def merge(self, other: ErrorClusters | dict) -> None:
+        """Fold in the clusters of another session (an ``ErrorClusters`` or its ``state``)."""
+        state = other.state() if isinstance(other, ErrorClusters) else other
+        self.errors += state["errors"]
+        self.dropped += state["dropped"]
+        for theirs in state["clusters"]:
+            cluster = self.clusters.get(theirs["signature"])
+            if cluster is None:
+                self.clusters[theirs["signature"]] = theirs
+                continue
+            cluster["count"] += theirs["count"]
+            cluster["sessions"] += theirs["sessions"]
+            for tool, n in theirs["tools"].items():
+                cluster["tools"][tool] = cluster["tools"].get(tool, 0) + n
+            self._seen(cluster, theirs["first_seen"], theirs["last_seen"])
+            sessions = {example["session_id"] for example in cluster["examples"]}
+            for example in theirs["examples"]:
+                if len(cluster["examples"]) < _CLUSTER_EXAMPLES and example["session_id"] not in sessions:
+                    cluster["examples"].append(example)
+                    sessions.add(example["session_id"])
+        self._prune()
+
+    @staticmethod
+    def _seen(cluster: dict, first: str | None, last: str | None) -> None:
+        if first is not None and (cluster["first_seen"] is None or first < cluster["first_seen"]):
+            cluster["first_seen"] = first
+        if last is not None and (cluster["last_seen"] is None or last > cluster["last_seen"]):
+            cluster["last_seen"] = last
+
+    def _prune(self) -> None:
+        if len(self.clusters) <= self.limit:
+            return
+        ranked = sorted(self.clusters.values(), key=lambda c: c["count"], reverse=True)
+        keep = ranked[: self.limit // 2]
+        self.dropped += sum(c["count"] for c in ranked[len(keep):])
+        self.clusters = {c["signature"]: c for c in keep}
+
+    def state(self) -> dict:
+        return {"errors": self.errors, "dropped": self.dropped, "clusters": list(self.clusters.values())}
+
+    def ranked(self, limit: int | None = None) -> list[dict]:
+        """Clusters by count, most frequent first, with their tools sorted the same way."""
+        ranked = sorted(self.clusters.values(), key=lambda c: (-c["count"], c["first_seen"] or ""))
+        return [
+            {**c, "tools": dict(sorted(c["tools"].items(), key=lambda item: -item[1]))} for c in ranked[:limit]
+        ]
+
+
+def cluster_session(path: str, since: str | None = None, until: str | None = None) -> ErrorClusters:
+    """Cluster the errors of one log in a single pass, naming each by the tool that produced it."""
+    clusters = ErrorClusters()
+    session_id = session_id_of(os.path.basename(path))
+    names: dict[str, str] = {}
+    for line_num, entry, timestamp in iter_entries(Path(path), since, until):
+        for kind, record in iter_entry_records(line_num, entry):
+            if kind == "tool_use":
+                names[record["id"]] = record["name"]
+                if len(names) > _MAX_PENDING_TOOL_USES:
+                    names.pop(next(iter(names)))
+            elif kind == "tool_result":
+                name = names.pop(record["tool_use_id"], None)
+                if record["is_error"]:
+                    clusters.add(record["preview"], session_id, line_num, timestamp, name or "unknown")
+    return clusters
+
+
+def _cluster_worker(path: str, since: str | None, until: str | None) -> dict:
+    try:
+        return cluster_session(path, since, until).state()
+    except (OSError, EOFError) as e:
+        return {"path": path, "error": str(e)}
+
+
+def error_clusters(paths: list[str], args: argparse.Namespace) -> dict:
+    """The ``--clusters`` report: errors of every log in ``paths`` grouped by signature, most frequent first.
+
+    Logs are clustered on their own (across ``args.jobs`` processes) and the
+    per-session clusters merged as they arrive, in one pass over the corpus.
+    """
+    todo = []
+    for path in paths:
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            continue
+        if args.since is not None and format_timestamp(datetime.fromtimestamp(mtime, timezone.utc)) < args.since:
+            continue  # Last written before the window opens.
+        todo.append(path)
+
+    clusters = ErrorClusters()
+    counts: Counter[str] = Counter()
+    pool = ProcessPoolExecutor(max_workers=args.jobs) if args.jobs > 1 and len(todo) > 1 else None
+    try:
+        if pool is None:
+            results = map(_cluster_worker, todo, repeat(args.since), repeat(args.until))
+        else:
+            chunksize = max(1, min(16, len(todo) // (args.jobs * 4)))
+            results = pool.map(_cluster_worker, todo, repeat(args.since), repeat(args.until), chunksize=chunksize)
+        for state in results:
+            if "error" in state:
+                counts["failed"] += 1
+                continue
+            counts["sessions"] += 1
+            counts["sessions_with_errors"] += state["errors"] > 0
+            clusters.merge(state)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return {
+        "sessions": counts["sessions"],
+        "failed": counts["failed"],
+        "sessions_with_errors": counts["sessions_with_errors"],
+        "errors": clusters.errors,
+        "cluster_count": len(clusters.clusters),
+        "dropped_errors": clusters.dropped,
+        "clusters": clusters.ranked(args.limit or None),
+    }
+
+
+# -----------------------------------------------------------------------------
+# Export
+# -----------------------------------------------------------------------------
+
+# Rows buffered per table before they are written out as one Parquet row group / Arrow record batch...
+EXPORT_ROW_GROUP = 64 * 1024
+# ...or sooner, once its string columns hold this many characters (tool inputs can be large).
+_EXPORT_GROUP_CHARS = 16 * 1024 * 1024
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise OSError("pyarrow not installed. Run: pip install pyarrow") from None
+    return pyarrow
+
+
+def _export_schemas(pa) -> dict:
+    ts = pa.timestamp("ms", tz="UTC")
+    return {
+        "entries": pa.schema([
+            ("session_id", pa.string()), ("line", pa.int64()), ("timestamp", ts), ("type", pa.string()),
+            ("text_blocks", pa.int32()), ("tool_uses", pa.int32()), ("tool_results", pa.int32()),
+        ]),
+        "tool_uses": pa.schema([
+            ("session_id", pa.string()), ("line", pa.int64()), ("timestamp", ts),
+            ("id", pa.string()), ("name", pa.string()), ("input", pa.string()),
+        ]),
+        "tool_results": pa.schema([
+            ("session_id", pa.string()), ("line", pa.int64()), ("timestamp", ts), ("tool_use_id", pa.string()),
+            ("is_error", pa.bool_()), ("output_bytes", pa.int64()), ("preview", pa.string()),
+        ]),
+        "errors": pa.schema([
+            ("session_id", pa.string()), ("line", pa.int64()), ("timestamp", ts),
+            ("tool_use_id", pa.string()), ("preview", pa.string()),
+        ]),
+    }
+
+
+class _TableWriter:
+    """Buffers rows for one table and writes them out a row group at a time."""
+
+    def __init__(self, pa, path: Path, schema, fmt: str, row_group: int):
+        self.pa = pa
+        self.path = path
+        self.tmp = path.with_name(path.name + ".tmp")
+        self.schema = schema
+        self.row_group = row_group
+        self.rows: list[tuple] = []
+        self.chars = 0
+        self.count = 0
+        if fmt == "arrow":
+            self.writer = pa.ipc.new_file(str(self.tmp), schema)
+        else:
+            self.writer = pa.parquet.ParquetWriter(str(self.tmp), schema, compression="zstd")
+
+    def append(self, row: tuple) -> None:
+        self.rows.append(row)
+        self.chars += sum(len(value) for value in row if type(value) is str)
+        if len(self.rows) >= self.row_group or self.chars >= _EXPORT_GROUP_CHARS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        columns = list(zip(*self.rows))
+        arrays = [self.pa.array(column, type=field.type) for column, field in zip(columns, self.schema)]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+        self.count += len(self.rows)
+        self.rows = []
+        self.chars = 0
+
+    def close(self, commit: bool = True) -> None:
+        if commit:
+            self.flush()
+        self.writer.close()
+        if commit:
+            os.replace(self.tmp, self.path)
+        else:
+            os.unlink(self.tmp)
+
+
+def export_sessions(
+    paths: list[str],
+    out_dir: Path,
+    fmt: str = "parquet",
+    since: str | None = None,
+    until: str | None = None,
+    row_group: int = EXPORT_ROW_GROUP,
+) -> dict:
+    """Write entries, tool uses, tool results and errors of ``paths`` to one columnar file per table.
+
+    Logs are streamed and rows flushed every ``row_group`` rows, so memory is
+    bounded by the row group size rather than the corpus. Each file is
+    written under a ``.tmp`` name and renamed into place once complete.
+    """
+    pa = require_pyarrow()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    suffix = ".arrow" if fmt == "arrow" else ".parquet"
+    tables = {
+        name: _TableWriter(pa, out_dir / f"{name}{suffix}", schema, fmt, row_group)
+        for name, schema in _export_schemas(pa).items()
+    }
+    entries, tool_uses, tool_results, errors = tables.values()
+    failed = []
+    committed = False
+    try:
+        for path in paths:
+            session_id = session_id_of(os.path.basename(path))
+            try:
+                for line, entry, timestamp in iter_entries(Path(path), since, until):
+                    if not entry:
+                        continue
+                    when = _epoch_ms(timestamp)
+                    when = None if when is None else int(when)
+                    blocks = entry.get("blocks", [])
+                    kinds = Counter(block["type"] for block in blocks)
+                    entries.append(
+                        (session_id, line, when, entry["type"], kinds["text"], kinds["tool_use"], kinds["tool_result"])
+                    )
+                    for block in blocks:
+                        if block["type"] == "tool_use":
+                            tool_uses.append(
+                                (session_id, line, when, block["id"], block["name"], json.dumps(block["input"]))
+                            )
+                        elif block["type"] == "tool_result":
+                            is_error = bool(block["is_error"])
+                            tool_results.append((
+                                session_id, line, when, block["tool_use_id"], is_error,
+                                content_bytes(block), block["content_preview"],
+                            ))
+                            if is_error:
+                                errors.append((session_id, line, when, block["tool_use_id"], block["content_preview"]))
+            except (OSError, EOFError) as e:
+                failed.append({"path": path, "error": str(e)})
+        committed = True
+    finally:
+        for table in tables.values():
+            table.close(commit=committed)
+    return {
+        "dir": str(out_dir),
+        "format": fmt,
+        "sessions": len(paths) - len(failed),
+        "rows": {name: table.count for name, table in tables.items()},
+        "failed": failed,
     }
 
 
+# -----------------------------------------------------------------------------
+# Follow
+# -----------------------------------------------------------------------------
+
+# inotify(7) event bits
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+# How long to block between checks for truncation when no events arrive.
+_FOLLOW_IDLE_TIMEOUT = 1.0
+# Bytes read per step, so a large append (or --from-start on a big log) is parsed in bounded memory.
+_FOLLOW_READ_BYTES = 1 << 20
+
+
+class _Inotify:
+    """Minimal ctypes binding to block until a file is written (Linux only)."""
+
+    def __init__(self, path: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+
+    def wait(self, timeout: float) -> None:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if ready:
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Poller:
+    """Fallback when inotify is unavailable: sleep between size checks."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+
+    def wait(self, timeout: float) -> None:
+        time.sleep(min(self.interval, timeout))
+
+    def close(self) -> None:
+        pass
+
+
+def _make_watcher(path: Path, poll_interval: float):
+    if sys.platform.startswith("linux"):
+        try:
+            return _Inotify(path)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return _Poller(poll_interval)
+
+
+def follow_session(
+    path: Path,
+    kinds: set[str],
+    pattern: str | None = None,
+    name_filter: str | None = None,
+    from_start: bool = False,
+    poll_interval: float = 0.5,
+) -> Iterator[dict]:
+    """Yield records for lines appended to ``path``, forever.
+
+    Keeps a byte offset into the file and only reads what was appended since
+    the last wake-up, in chunks of ``_FOLLOW_READ_BYTES``; a partially written
+    last line is buffered until its newline arrives. ``kinds`` selects record kinds (``tool_use``, ``error``,
+    ``tool_result``, ``text``); ``pattern`` additionally emits ``match``
+    records for lines matching the regex.
+    """
+    regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+    watcher = _make_watcher(path, poll_interval)
+    try:
+        with open(path, "rb") as f:
+            line_num = 0
+            if not from_start:
+                # Skip existing complete lines, but keep a trailing partial line for parsing.
+                offset = 0
+                while chunk := f.read(_FOLLOW_READ_BYTES):
+                    line_num += chunk.count(b"\n")
+                    last_newline = chunk.rfind(b"\n")
+                    if last_newline >= 0:
+                        offset = f.tell() - len(chunk) + last_newline + 1
+                f.seek(offset)
+            pending = b""
+            while True:
+                data = f.read(_FOLLOW_READ_BYTES)
+                if not data:
+                    if os.fstat(f.fileno()).st_size < f.tell():
+                        # Truncated or rewritten in place: start over.
+                        f.seek(0)
+                        line_num, pending = 0, b""
+                        continue
+                    watcher.wait(_FOLLOW_IDLE_TIMEOUT)
+                    continue
+                *lines, pending = (pending + data).split(b"\n")
+                for raw in lines:
+                    line_num += 1
+                    line = raw.decode("utf-8", errors="replace")
+                    if regex is not None and regex.search(line):
+                        yield {"kind": "match", "line": line_num, "preview": line.strip()[:200]}
+                    try:
+                        entry, _ = decode_entry(raw)
+                    except ValueError:
+                        continue
+                    for kind, record in iter_entry_records(line_num, entry):
+                        if kind not in kinds:
+                            continue
+                        if kind == "tool_use" and name_filter and name_filter.lower() not in record["name"].lower():
+                            continue
+                        yield {"kind": kind, **record}
+    finally:
+        watcher.close()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Parse Claude session log")
-    parser.add_argument("path", type=Path, help="Path to .jsonl log file")
+    parser.add_argument(
+        "path", type=Path, help="Path to .jsonl (or .jsonl.gz / .jsonl.zst) log file; with --corpus a directory, glob or -"
+    )
     parser.add_argument("--summary", action="store_true", help="Show summary only")
     parser.add_argument("--tools", action="store_true", help="List tool uses")
     parser.add_argument("--errors", action="store_true", help="Show errors only")
     parser.add_argument("--text", action="store_true", help="Show text blocks")
+    parser.add_argument("--timings", action="store_true", help="Per-tool latency, output size and error rate")
     parser.add_argument("--filter", type=str, help="Filter tools by name (with --tools)")
     parser.add_argument("--limit", type=int, help="Limit number of results")
+    parser.add_argument("--ndjson", action="store_true", help="Stream one JSON object per line")
+    parser.add_argument("--since", type=parse_time_arg, help="Only entries logged at/after this time (ISO or 10m/2h/1d)")
+    parser.add_argument("--until", type=parse_time_arg, help="Only entries logged at/before this time")
+    parser.add_argument("--follow", action="store_true", help="Stream newly appended entries (NDJSON) until interrupted")
+    parser.add_argument("--pattern", type=str, help="Regex; with --follow, also emit matching lines")
+    parser.add_argument("--from-start", action="store_true", help="With --follow, replay the existing log first")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Polling fallback interval in seconds")
+    parser.add_argument("--usage", action="store_true", help="Token usage per call, turn and session")
+    parser.add_argument("--tree", action="store_true", help="Conversation tree: branch points and sidechain subtrees")
+    parser.add_argument("--subtree", metavar="UUID", help="Print the raw log lines of the subtree rooted at UUID")
+    parser.add_argument(
+        "--no-checkpoint", action="store_true", help="Parse --summary/--timings from scratch, without checkpoints"
+    )
+    parser.add_argument("--corpus", action="store_true", help="Summarize every session log under PATH")
+    parser.add_argument("--clusters", action="store_true", help="Group errors by normalized signature")
+    parser.add_argument("--jobs", type=parse_jobs_arg, default="0", help="Worker processes for --corpus (0 = all cores)")
+    parser.add_argument("--export", type=Path, metavar="DIR", help="Write entries/tool uses/results/errors tables to DIR")
+    parser.add_argument("--format", choices=("parquet", "arrow"), default="parquet", help="File format for --export")
+    parser.add_argument("--row-group", type=int, default=EXPORT_ROW_GROUP, help="Rows per row group for --export")
 
     args = parser.parse_args()
 
-    if not args.path.exists():
+    if args.export is not None:
+        modes = args.tools or args.errors or args.text or args.timings or args.usage or args.tree or args.subtree
+        modes = modes or args.clusters
+        if args.follow or modes or args.summary or args.ndjson:
+            print("--export only combines with --corpus and --since/--until", file=sys.stderr)
+            sys.exit(1)
+        try:
+            require_pyarrow()
+        except OSError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+
+    if args.corpus:
+        if args.follow or args.tools or args.errors or args.text or args.timings or args.usage or args.tree or args.subtree:
+            print(
+                "--corpus only combines with --summary, --clusters, --ndjson, --export and --since/--until",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        try:
+            paths = corpus_paths(str(args.path))
+        except ValueError as e:
+            print(f"Invalid session list on stdin: {e}", file=sys.stderr)
+            sys.exit(1)
+    elif not args.path.exists():
         print(f"File not found: {args.path}", file=sys.stderr)
         sys.exit(1)
 
-    analysis = analyze_session(args.path)
+    if args.path.suffix == ".zst":
+        try:
+            require_zstandard()
+        except OSError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
 
-    if args.summary:
-        print(json.dumps({
-            "path": analysis["path"],
-            "entries": analysis["entry_count"],
-            "tool_uses": analysis["tool_use_count"],
-            "errors": analysis["error_count"],
-            "tool_frequency": analysis["tool_frequency"],
-        }, indent=2))
-    elif args.tools:
-        tools = analysis["tool_uses"]
-        if args.filter:
-            tools = [t for t in tools if args.filter.lower() in t["name"].lower()]
-        if args.limit:
-            tools = tools[:args.limit]
-        print(json.dumps(tools, indent=2))
-    elif args.errors:
-        errors = analysis["errors"]
-        if args.limit:
-            errors = errors[:args.limit]
-        print(json.dumps(errors, indent=2))
-    elif args.text:
-        texts = analysis["text_blocks"]
-        if args.limit:
-            texts = texts[:args.limit]
-        print(json.dumps(texts, indent=2))
-    else:
-        print(json.dumps(analysis, indent=2))
+    if args.follow and (args.timings or args.usage or args.tree or args.subtree or args.clusters):
+        print("--timings, --usage, --tree, --subtree and --clusters cannot be combined with --follow", file=sys.stderr)
+        sys.exit(1)
+
+    if args.follow and is_compressed(args.path):
+        print(f"Cannot follow a compressed log: {args.path}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.follow:
+        kinds = {"tool_use"} if args.tools else {"error"} if args.errors else {"text"} if args.text else {
+            "tool_use",
+            "error",
+        }
+        records = follow_session(args.path, kinds, args.pattern, args.filter, args.from_start, args.poll_interval)
+        records = islice(records, args.limit or None)
+    elif args.ndjson and args.usage:
+        records = iter_usage(args.path, args.since, args.until)
+        if args.summary:
+            records = (record for record in records if record["kind"] == "summary")
+    elif args.ndjson and args.tree:
+        records = ConversationTree.build(args.path).report(args.limit or None)
+    elif args.ndjson and args.clusters:
+        report = error_clusters(paths if args.corpus else [str(args.path)], args)
+        records = [*({"kind": "cluster", **c} for c in report.pop("clusters")), {"kind": "summary", **report}]
+    elif args.ndjson:
+        records = stream_corpus(paths, args) if args.corpus else stream_session(args.path, args)
+
+    try:
+        if args.subtree:
+            try:
+                lines = ConversationTree.build(args.path).subtree_lines(args.subtree)
+                first = next(lines)
+            except KeyError:
+                print(f"No entry with uuid {args.subtree} in {args.path}", file=sys.stderr)
+                sys.exit(1)
+            sys.stdout.buffer.write(first)
+            for raw in lines:
+                sys.stdout.buffer.write(raw)
+            sys.stdout.flush()
+        elif args.ndjson or args.follow:
+            for record in records:
+                print(json.dumps(record), flush=True)
+        elif args.export is not None:
+            paths = paths if args.corpus else [str(args.path)]
+            result = export_sessions(paths, args.export, args.format, args.since, args.until, args.row_group)
+            print(json.dumps(result, indent=2))
+        elif args.clusters:
+            print(json.dumps(error_clusters(paths if args.corpus else [str(args.path)], args), indent=2))
+        elif args.corpus:
+            print(json.dumps(analyze_corpus(paths, args), indent=2))
+        elif args.usage:
+            print(json.dumps(usage_report(args.path, args), indent=2))
+        elif args.summary:
+            print(json.dumps(summarize_session(args.path, args.since, args.until, not args.no_checkpoint), indent=2))
+        elif args.timings:
+            print(json.dumps(tool_timings(args.path, args), indent=2))
+        elif args.tree:
+            print(json.dumps(tree_report(args.path, args), indent=2))
+        elif args.tools or args.errors or args.text:
+            print_json_array(select_records(args.path, args))
+        else:
+            print(json.dumps(analyze_session(args.path, args.since, args.until), indent=2))
+    except BrokenPipeError:
+        # The consumer (e.g. `head`) stopped reading; exit quietly without a traceback.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(0)
+    except KeyboardInterrupt:
+        if not (args.ndjson or args.follow):
+            raise
 
 
 if __name__ == "__main__":
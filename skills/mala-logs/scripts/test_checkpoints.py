@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Tests that parse-session.py checkpoints give the same answers as a full parse.
+
+Run from this directory:
+  python -m unittest test_checkpoints
+"""
+from __future__ import annotations
+
+import random
+import unittest
+from pathlib import Path
+
+from _testutil import LogsTestCase, load_script, run_main
+
+# Stdlib only
+
+STEPS = 60
+
+
+class CheckpointTest(LogsTestCase):
+    SESSIONS = 2
+
+    def setUp(self):
+        super().setUp()
+        self.sources = [path.read_bytes() for path in self.logs]
+        self.ps = load_script("parse_session", "parse-session.py")
+
+    def assert_matches_full_parse(self, log: Path, step: str) -> None:
+        for mode in ("--summary", "--timings"):
+            resumed = run_main(self.ps, str(log), mode)
+            self.assertEqual(resumed, run_main(self.ps, str(log), mode, "--no-checkpoint"), f"{mode} after {step}")
+
+    def test_random_appends_rewrites_truncations_and_deletes(self):
+        rng = random.Random(0)
+        log = self.tmp / "session.jsonl"
+        source = self.sources[0]
+        log.write_bytes(source[: rng.randrange(len(source))])
+        for _ in range(STEPS):
+            data = log.read_bytes() if log.exists() else b""
+            step = rng.choice(("append", "append", "append", "rewrite", "truncate", "delete"))
+            if step == "append":
+                # Whole lines or a partial one, as a live session writes them.
+                start = len(data) if source.startswith(data) else 0
+                data += source[start : start + rng.randrange(1, 16 * 1024)]
+            elif step == "rewrite":
+                source = rng.choice(self.sources)
+                data = source[: rng.randrange(len(source))]
+            elif step == "truncate":
+                data = data[: rng.randrange(len(data) + 1)]
+            else:
+                log.unlink(missing_ok=True)
+                source = rng.choice(self.sources)
+                data = source[: rng.randrange(len(source))]
+            log.write_bytes(data)
+            self.assert_matches_full_parse(log, step)
+
+
+if __name__ == "__main__":
+    unittest.main()
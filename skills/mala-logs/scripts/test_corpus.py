@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Tests for parse-session.py --corpus on generated logs.
+
+Run from this directory:
+  python -m unittest test_corpus
+"""
+from __future__ import annotations
+
+import json
+import os
+import unittest
+from unittest import mock
+
+from _testutil import LogsTestCase, load_script, run_main
+
+# Stdlib only
+
+
+class CorpusJobsTest(LogsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ps = load_script("parse_session", "parse-session.py")
+        self.corpus = str(self.tmp / "data" / "claude")
+
+    def run_corpus(self, *argv: str, index: str) -> tuple[dict, list[int]]:
+        """``--corpus`` JSON output and the ``max_workers`` of every process pool it started."""
+        pools = []
+        real_pool = self.ps.ProcessPoolExecutor
+
+        def pool(max_workers):
+            pools.append(max_workers)
+            return real_pool(max_workers=max_workers)
+
+        with (
+            mock.patch.dict(os.environ, {"MALA_LOG_INDEX": str(self.tmp / index)}),
+            mock.patch.object(self.ps, "ProcessPoolExecutor", pool),
+            mock.patch("os.cpu_count", return_value=4),
+        ):
+            return json.loads(run_main(self.ps, self.corpus, "--corpus", *argv)), pools
+
+    def test_corpus_uses_all_cores_by_default(self):
+        report, pools = self.run_corpus(index="default.sqlite")
+        self.assertEqual(pools, [4])
+        self.assertEqual(report["sessions"], 4)
+        serial, pools = self.run_corpus("--jobs", "1", index="serial.sqlite")
+        self.assertEqual(pools, [])
+        self.assertEqual(report, serial)
+
+    def test_clusters_match_serial_run(self):
+        report, pools = self.run_corpus("--clusters", index="default.sqlite")
+        self.assertEqual(pools, [4])
+        self.assertGreater(report["cluster_count"], 0)
+        serial, _ = self.run_corpus("--clusters", "--jobs", "1", index="serial.sqlite")
+        self.assertEqual(report, serial)
+
+
+if __name__ == "__main__":
+    unittest.main()
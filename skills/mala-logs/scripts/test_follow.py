@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Tests for parse-session.py --follow on generated logs.
+
+Run from this directory:
+  python -m unittest test_follow
+"""
+from __future__ import annotations
+
+import tracemalloc
+import unittest
+from itertools import islice
+from unittest import mock
+
+from _testutil import LogsTestCase, load_script
+
+# Stdlib only
+
+KINDS = {"tool_use", "error"}
+# Small enough that the log takes many reads, and that a few chunks in flight are well under a whole log.
+READ_BYTES = 64 * 1024
+
+
+class FollowTest(LogsTestCase):
+    SIZE = "8MB"
+    SESSIONS = 1
+
+    def setUp(self):
+        super().setUp()
+        self.ps = load_script("parse_session", "parse-session.py")
+        self.log = self.logs[0]
+        self.expected = [
+            {"kind": kind, **record} for kind, record in self.ps.iter_session(self.log) if kind in KINDS
+        ]
+
+    def test_from_start_matches_full_parse_in_bounded_memory(self):
+        size = self.log.stat().st_size
+        records = self.ps.follow_session(self.log, KINDS, from_start=True, poll_interval=0.05)
+        patch = mock.patch.object(self.ps, "_FOLLOW_READ_BYTES", READ_BYTES)
+        patch.start()
+        self.addCleanup(patch.stop)
+        tracemalloc.start()
+        try:
+            count = 0
+            for record, expected in zip(islice(records, len(self.expected)), self.expected):
+                self.assertEqual(record, expected)
+                count += 1
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            records.close()
+        self.assertEqual(count, len(self.expected))
+        # Read in chunks; reading the whole log at once (and splitting it) would peak at over twice its size.
+        self.assertLess(peak, size // 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
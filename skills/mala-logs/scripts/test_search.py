@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Tests for find-logs.py search on generated logs.
+
+Run from this directory:
+  python -m unittest test_search
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import unittest
+from pathlib import Path
+
+from _testutil import LogsTestCase, load_script
+
+# Stdlib only
+
+PATTERNS = ("exit code [1-9]", "timed out|ModuleNotFound|not found", "\"name\":\"(Bash|Read)\"", "^\\{")
+
+
+class SearchJobsTest(LogsTestCase):
+    def setUp(self):
+        super().setUp()
+        # Loaded from its file, as bench.py does: pool workers must not need to import this module.
+        self.fl = load_script("find_logs", "find-logs.py")
+
+    def search(self, pattern: str, jobs: int) -> list[dict]:
+        index = self.fl.LogIndex(self.tmp / f"search-{jobs}.sqlite")
+        try:
+            return self.fl.search_logs(pattern, Path(self.info["repo"]), recent=0, index=index, jobs=jobs)
+        finally:
+            index.close()
+
+    def test_process_pool_matches_serial_scan(self):
+        for pattern in PATTERNS:
+            with self.subTest(pattern=pattern):
+                parallel = self.search(pattern, jobs=2)
+                self.assertTrue(parallel)
+                self.assertEqual(parallel, self.search(pattern, jobs=1))
+
+    def test_bench_runs_with_jobs(self):
+        bench = load_script("bench", "bench.py")
+        with contextlib.redirect_stderr(io.StringIO()):
+            results = bench.run_scale(self.info, repeat=1, jobs=2)
+        self.assertIn("search_logs/cold", results)
+
+
+if __name__ == "__main__":
+    unittest.main()